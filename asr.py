@@ -0,0 +1,181 @@
+"""
+Speech recognition backends.
+
+Every backend has a name, load() (slow setup, safe to call twice) and
+recognize(audio) -> text. recognize raises sr.UnknownValueError when the
+audio held no words and anything else when the backend itself failed.
+
+  google   speech_recognition's free Google endpoint (network)
+  whisper  faster-whisper on the CPU, int8; optional:
+           pip install faster-whisper (the model downloads on first use)
+  replay   transcripts read line by line from a file, for tests and demos
+
+RecognizerChain tries backends in the configured order. Each one sits
+behind a CircuitBreaker, which records its latency and skips it while it
+keeps failing (Google while offline); once the breaker's cooldown is
+over, the next utterance tries it again as a trial. "No words" is an
+answer, not a failure, so it ends the chain.
+"""
+import threading
+
+import speech_recognition as sr
+
+from circuit_breaker import CircuitBreaker
+
+try:
+    import numpy
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+WHISPER_MODEL = "base.en"
+WHISPER_RATE = 16000
+
+
+class GoogleBackend:
+    name = "google"
+
+    def __init__(self, language="en-in"):
+        self.language = language
+        self.recognizer = sr.Recognizer()
+
+    def load(self):
+        pass
+
+    def recognize(self, audio):
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+class WhisperBackend:
+    name = "whisper"
+
+    def __init__(self, model_size=WHISPER_MODEL, language="en"):
+        self.model_size = model_size
+        self.language = language
+        self.model = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        with self.lock:
+            if self.model is None:
+                self.model = WhisperModel(self.model_size, device="cpu", compute_type="int8")
+
+    def recognize(self, audio):
+        self.load()
+        raw = audio.get_raw_data(convert_rate=WHISPER_RATE, convert_width=2)
+        samples = numpy.frombuffer(raw, dtype=numpy.int16).astype(numpy.float32) / 32768.0
+        segments, _ = self.model.transcribe(samples, language=self.language, beam_size=1,
+                                            without_timestamps=True, condition_on_previous_text=False)
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class ReplayBackend:
+    """Ignores the audio; returns the next line of the file (blank line = nothing understood)."""
+    name = "replay"
+
+    def __init__(self, path):
+        self.path = path
+        self.lines = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        with self.lock:
+            if self.lines is None:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.lines = [line.strip() for line in f]
+
+    def recognize(self, audio):
+        self.load()
+        with self.lock:
+            if not self.lines:
+                raise sr.RequestError(f"replay file {self.path} is used up")
+            text = self.lines.pop(0)
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+def make_backend(name, language="en-in", whisper_model=WHISPER_MODEL, replay_file=None):
+    """Backend for a config name, or None (with a message) if it can't run here."""
+    if name == GoogleBackend.name:
+        return GoogleBackend(language)
+    if name == WhisperBackend.name:
+        if WhisperModel is None:
+            print("[ASR] whisper backend needs faster-whisper (pip install faster-whisper); skipping it")
+            return None
+        return WhisperBackend(whisper_model, language.split("-")[0])
+    if name == ReplayBackend.name:
+        if not replay_file:
+            print("[ASR] replay backend needs a transcript file; skipping it")
+            return None
+        return ReplayBackend(replay_file)
+    print(f"[ASR] unknown backend {name!r}; skipping it")
+    return None
+
+
+class RecognizerChain:
+    def __init__(self, backends):
+        self.backends = list(backends)
+        self.breakers = {b.name: CircuitBreaker(f"ASR {b.name}") for b in self.backends}
+
+    @classmethod
+    def from_names(cls, names, **kwargs):
+        """Backends in the given order; falls back to Google if none of them can run."""
+        backends = [b for b in (make_backend(n.strip().lower(), **kwargs) for n in names if n.strip()) if b]
+        return cls(backends or [GoogleBackend(kwargs.get("language", "en-in"))])
+
+    def warm_up(self):
+        """Load models ahead of the first command."""
+        for backend in self.backends:
+            try:
+                backend.load()
+            except Exception as e:
+                print(f"[ASR {backend.name} failed to load: {e}]")
+
+    def order(self):
+        """
+        Backends to try, preferred first: closed breakers, and open ones whose
+        cooldown is over (moved to half-open, so this utterance is their trial).
+        """
+        usable = [b for b in self.backends
+                  if self.breakers[b.name].allow_request() or self.breakers[b.name].ready_for_probe()]
+        return usable or self.backends
+
+    def recognize(self, audio):
+        """
+        (text, backend name). Raises sr.UnknownValueError if the audio held
+        no words, sr.RequestError if every backend failed.
+        """
+        last_error = None
+        backends = self.order()
+        try:
+            while backends:
+                backend = backends.pop(0)
+                try:
+                    text = self.breakers[backend.name].call(lambda: _heard(backend, audio))
+                except Exception as e:
+                    print(f"[ASR {backend.name} failed: {e}] Trying the next backend...")
+                    last_error = e
+                    continue
+                if text is None:
+                    raise sr.UnknownValueError()
+                return text, backend.name
+        finally:
+            # A trial granted to a backend this utterance never reached waits for the next one
+            for backend in backends:
+                self.breakers[backend.name].release_probe()
+        raise sr.RequestError(f"every speech backend failed; last error: {last_error}")
+
+    def describe(self):
+        return ". ".join(breaker.describe() for breaker in self.breakers.values())
+
+
+def _heard(backend, audio):
+    """Backend text, or None when it understood nothing (not a backend failure)."""
+    try:
+        return backend.recognize(audio)
+    except sr.UnknownValueError:
+        return None
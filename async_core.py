@@ -0,0 +1,74 @@
+"""
+Asyncio plumbing for the backend's core loop.
+
+Command handlers are coroutines on one event loop. Anything that blocks
+(network libraries, SQLite, OS/window calls) is awaited through a bounded
+thread pool instead of running on the loop, so independent I/O in one turn
+can overlap (e.g. a Wikipedia fetch while "Searching Wikipedia" is spoken).
+The microphone gets its own single-thread executor so only one thread ever
+reads it. Periodic jobs (reminders, provider probes) are tasks scheduled on
+the loop rather than sleeping threads.
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+IO_WORKERS = int(os.getenv("NEURA_IO_WORKERS", "8"))
+
+io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="neura-io")
+mic_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="neura-mic")
+
+_tasks = set()  # strong references, so running background tasks aren't collected
+
+
+async def run_in(pool, fn, *args, **kwargs):
+    """Await fn(*args, **kwargs) on the given executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
+
+async def to_io(fn, *args, **kwargs):
+    """Await a blocking call on the shared I/O pool."""
+    return await run_in(io_pool, fn, *args, **kwargs)
+
+
+def _report(task):
+    _tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"[Task {task.get_name()} error]: {task.exception()}")
+
+
+def spawn(coro, name=None):
+    """Start a background task whose failure is logged instead of lost."""
+    task = asyncio.get_running_loop().create_task(coro, name=name)
+    _tasks.add(task)
+    task.add_done_callback(_report)
+    return task
+
+
+async def every(interval, job, name=None):
+    """Run the coroutine function job now and then every `interval` seconds until cancelled."""
+    name = name or job.__name__
+    while True:
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[{name} error]: {e}")
+        await asyncio.sleep(interval)
+
+
+def schedule(interval, job, name=None):
+    return spawn(every(interval, job, name), name=name or job.__name__)
+
+
+async def shutdown():
+    """Cancel background tasks and release the executors."""
+    tasks = [t for t in _tasks if not t.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    io_pool.shutdown(wait=False, cancel_futures=True)
+    mic_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,71 @@
+"""
+ASR backend benchmark: recognition time per command, per backend.
+
+Runs every given backend over the same recorded commands (16-bit WAV)
+and prints each transcript with its time, then mean and worst time per
+backend. Model load time is reported on its own; a session loads the
+model once at startup (RecognizerChain.warm_up).
+
+    python benchmarks/bench_asr.py whisper,google open_notepad.wav weather.wav
+    NEURA_ASR_MODEL=tiny.en python benchmarks/bench_asr.py whisper *.wav
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import speech_recognition as sr
+
+import asr
+
+ROUNDS = 3
+
+
+def load_audio(path):
+    with sr.AudioFile(path) as source:
+        return sr.Recognizer().record(source)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        return
+    names, paths = sys.argv[1].split(","), sys.argv[2:]
+    clips = [(os.path.basename(p), load_audio(p)) for p in paths]
+    model = os.getenv("NEURA_ASR_MODEL", asr.WHISPER_MODEL)
+
+    summary = []
+    for name in names:
+        backend = asr.make_backend(name, whisper_model=model)
+        if backend is None:
+            continue
+        start = time.perf_counter()
+        try:
+            backend.load()
+        except Exception as e:
+            print(f"{name}: failed to load: {e}")
+            continue
+        print(f"\n{name}: loaded in {time.perf_counter() - start:.2f} s")
+        times = []
+        for clip, audio in clips:
+            for _ in range(ROUNDS):
+                start = time.perf_counter()
+                try:
+                    text = backend.recognize(audio)
+                except sr.UnknownValueError:
+                    text = "(nothing understood)"
+                except Exception as e:
+                    text = f"(failed: {e})"
+                times.append(time.perf_counter() - start)
+            print(f"  {clip:<24}{times[-1] * 1000:>8.0f} ms  {text}")
+        summary.append((name, statistics.mean(times), max(times)))
+
+    print()
+    for name, mean, worst in summary:
+        print(f"{name:<10} mean {mean * 1000:7.0f} ms   worst {worst * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Chat bridge benchmark: per-message cost as the bridge grows.
+
+Compares the old whole-file JSON bridge (read + rewrite on every message,
+json.load on every frame) with the append-only JSONL bridge and its
+offset-tailing reader, then measures how long a record sent over the
+push transport takes to become visible to the render loop's poll().
+
+    python benchmarks/bench_chat_bridge.py [max_messages]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chat_bridge
+
+CHECKPOINTS = [1_000, 5_000, 10_000, 100_000]
+LEGACY_LIMIT = 5_000  # the old format is quadratic; stop before it takes minutes
+SAMPLE = 200          # messages timed at each checkpoint
+
+
+def legacy_send(path, record):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        data = []
+    data.append(record)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def legacy_fetch(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fill_legacy(path, n):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([chat_bridge.make_record("user", f"message {i}") for i in range(n)], f, indent=2)
+
+
+def fill_jsonl(path, n):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps(chat_bridge.make_record("user", f"message {i}")) + "\n")
+
+
+def time_jsonl(path, n):
+    fill_jsonl(path, n)
+    reader = chat_bridge.BridgeReader(path)
+    reader.poll()  # catch up to the existing history once
+    start = time.perf_counter()
+    for i in range(SAMPLE):
+        chat_bridge.append_record(chat_bridge.make_record("neura", f"reply {i}"), path)
+        assert len(reader.poll()) == 1
+    return (time.perf_counter() - start) / SAMPLE
+
+
+def time_legacy(path, n):
+    fill_legacy(path, n)
+    sample = max(1, SAMPLE // 10)
+    start = time.perf_counter()
+    for i in range(sample):
+        legacy_send(path, chat_bridge.make_record("neura", f"reply {i}"))
+        legacy_fetch(path)
+    return (time.perf_counter() - start) / sample
+
+
+def time_push(count=SAMPLE):
+    server = chat_bridge.PushServer()
+    client = chat_bridge.PushClient(server.listener.address, server.authkey)
+    delays = []
+    try:
+        for i in range(count):
+            sent = time.perf_counter()
+            client.send(chat_bridge.make_record("neura", f"reply {i}"))
+            while not server.poll():
+                pass
+            delays.append(time.perf_counter() - sent)
+    finally:
+        client.conn.close()
+        server.close()
+    delays.sort()
+    return delays[len(delays) // 2], delays[int(len(delays) * 0.99)]
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else CHECKPOINTS[-1]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bridge")
+        print(f"{'history':>10} | {'jsonl append+poll':>18} | {'legacy rewrite+load':>20}")
+        for n in [c for c in CHECKPOINTS if c <= limit]:
+            new_cost = time_jsonl(path + ".jsonl", n)
+            legacy = "skipped"
+            if n <= LEGACY_LIMIT:
+                legacy = f"{time_legacy(path + '.json', n) * 1e3:.3f} ms"
+            print(f"{n:>10} | {new_cost * 1e3:>15.3f} ms | {legacy:>20}")
+
+    p50, p99 = time_push()
+    print(f"\npush transport send -> poll: p50 {p50 * 1e3:.3f} ms, p99 {p99 * 1e3:.3f} ms "
+          f"(one frame at 60 fps is 16.7 ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Context window benchmark: prompt build time and payload size vs history length.
+
+"full" is the old behaviour (every llm_history message in every request);
+"window" fetches at most CONTEXT_FETCH_LIMIT messages from the store and
+trims them to the Groq token budget.
+
+    python benchmarks/bench_context_window.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_context
+from memory_store import MemoryStore
+
+HISTORY_LENGTHS = [100, 1_000, 10_000, 50_000]
+REPEAT = 20
+PROMPT = "what is the capital of australia"
+PINNED = [("user", llm_context.preferences_note({"weather_city": "delhi"})), ("bot", "Noted.")]
+
+
+def to_pairs(rows):
+    return [("user" if m["role"] == "user" else "bot", m["content"]) for m in rows]
+
+
+def to_messages(pairs):
+    messages = [{"role": "user" if r == "user" else "assistant", "content": c} for r, c in pairs]
+    messages.append({"role": "user", "content": PROMPT})
+    return messages
+
+
+def measure(build):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        messages = build()
+    elapsed = (time.perf_counter() - start) / REPEAT
+    return elapsed, len(json.dumps(messages).encode("utf-8"))
+
+
+def main():
+    budget = llm_context.budget_for("groq")
+    print(f"groq budget {budget} tokens, fetch limit {llm_context.CONTEXT_FETCH_LIMIT}")
+    print(f"{'history':>8} | {'full build':>11} {'payload':>10} | {'window build':>12} {'payload':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(os.path.join(tmp, "memory.db"), flush_interval=60)
+        filled = 0
+        for n in HISTORY_LENGTHS:
+            for i in range(filled, n):
+                role = "user" if i % 2 == 0 else "assistant"
+                store.add_llm_message(role, f"message {i}: " + "some conversational text " * 6)
+            filled = n
+            store.flush()
+
+            full_t, full_b = measure(lambda: to_messages(to_pairs(store.llm_history())))
+            win_t, win_b = measure(lambda: to_messages(llm_context.select_recent(
+                to_pairs(store.llm_history(llm_context.CONTEXT_FETCH_LIMIT)),
+                budget, pinned=PINNED, reserve=llm_context.count_tokens(PROMPT))))
+            print(f"{n:>8} | {full_t * 1e3:>8.2f} ms {full_b / 1024:>7.0f} KB | "
+                  f"{win_t * 1e3:>9.2f} ms {win_b / 1024:>7.0f} KB")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
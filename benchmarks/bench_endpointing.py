@@ -0,0 +1,185 @@
+"""
+Endpointing benchmark: time from the end of speech to the start of recognition.
+
+Each fixture WAV is played through a source paced like a real microphone
+(one chunk per chunk duration) and then continues with room noise. The
+clock starts when the chunk holding the last speech sample has been
+delivered, and stops when the audio is handed over for recognition.
+
+  sr.listen  speech_recognition's Recognizer.listen (pause_threshold 0.8 s),
+             as takeCommand used it
+  listener   listener.Listener: capture thread, ring buffer, vad.Endpointer
+
+"captured" is the length of the returned audio. If it is shorter than the
+speech, the endpointer cut the command off at a pause.
+
+With no arguments, synthetic fixtures (harmonic "words" with pauses, over
+noise) are written to a temporary directory. To use real recordings, pass
+them as PATH:SPEECH_END_SECONDS (16-bit mono WAV with >= 1.5 s of room
+noise before the speech):
+
+    python benchmarks/bench_endpointing.py
+    python benchmarks/bench_endpointing.py open_notepad.wav:2.41 weather.wav:3.05
+"""
+import array
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import speech_recognition as sr
+
+import vad
+from listener import Listener
+
+CHUNK = 368   # ~23 ms at 16 kHz, the frame length sr.Microphone gives at 44.1 kHz
+RATE = 16000
+LEAD_IN = 1.5
+
+# name: (noise level, [(word seconds, pause after)])
+FIXTURES = {
+    "open_notepad": (120, [(0.35, 0.12), (0.45, 0)]),
+    "weather_pause": (120, [(0.3, 0.1), (0.25, 0.1), (0.4, 0.35), (0.3, 0.1), (0.45, 0)]),
+    "noisy_room": (500, [(0.3, 0.15), (0.35, 0.1), (0.5, 0)]),
+}
+
+
+def synthesize(path, noise, words, rng):
+    """Noise, then harmonic bursts with soft onsets and decaying tails; returns speech end (s)."""
+    samples = [rng.gauss(0, noise) for _ in range(int(LEAD_IN * RATE))]
+    for seconds, pause in words:
+        n = int(seconds * RATE)
+        f0 = rng.uniform(110, 180)
+        for i in range(n):
+            t = i / RATE
+            envelope = min(1.0, t / 0.03) * min(1.0, (n - i) / (0.08 * RATE))
+            voice = sum(math.sin(2 * math.pi * f0 * k * t) / k for k in range(1, 6))
+            samples.append(4000 * envelope * voice + rng.gauss(0, noise))
+        samples.extend(rng.gauss(0, noise) for _ in range(int(pause * RATE)))
+    speech_end = len(samples) / RATE
+    samples.extend(rng.gauss(0, noise) for _ in range(int(0.5 * RATE)))
+    pcm = array.array("h", (max(-32768, min(32767, int(s))) for s in samples))
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(pcm.tobytes())
+    return speech_end
+
+
+class PacedWavStream:
+    """Plays a WAV at real-time pace, followed by its last half second of room noise, repeated."""
+
+    def __init__(self, path, speech_end):
+        with wave.open(path, "rb") as w:
+            self.rate = w.getframerate()
+            self.data = w.readframes(w.getnframes())
+        self.data += self.data[-int(0.5 * self.rate) * 2:] * 20
+        self.end_byte = int(speech_end * self.rate) * 2
+        self.pos = 0
+        self.next_read = None
+        self.end_delivered_at = None
+
+    def read(self, size):
+        now = time.monotonic()
+        if self.next_read is None or self.next_read < now:
+            self.next_read = now
+        time.sleep(max(0.0, self.next_read - now))
+        self.next_read += size / float(self.rate)
+        nbytes = size * 2
+        chunk = self.data[self.pos:self.pos + nbytes]
+        if self.pos < self.end_byte <= self.pos + nbytes:
+            self.end_delivered_at = time.monotonic()
+        self.pos += nbytes
+        return chunk
+
+
+class PacedSource(sr.AudioSource):
+    def __init__(self, stream):
+        self.shared = stream
+        self.stream = None
+        self.SAMPLE_RATE = stream.rate
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = CHUNK
+
+    def __enter__(self):
+        self.stream = self.shared
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+
+
+def run_sr_listen(path, speech_end):
+    stream = PacedWavStream(path, speech_end)
+    r = sr.Recognizer()
+    with PacedSource(stream) as source:
+        r.adjust_for_ambient_noise(source, duration=1.0)
+        audio = r.listen(source, timeout=4)
+    return time.monotonic() - stream.end_delivered_at, len(audio.frame_data) / 2 / RATE
+
+
+def run_listener(path, speech_end, tmp):
+    stream = PacedWavStream(path, speech_end)
+    listener = Listener(calibration_file=os.path.join(tmp, "calibration.json"),
+                        make_source=lambda: PacedSource(stream))
+    listener.open()
+    audio = listener.listen(timeout=4)
+    latency = time.monotonic() - stream.end_delivered_at
+    listener.close()
+    os.remove(os.path.join(tmp, "calibration.json"))
+    return latency, len(audio.frame_data) / 2 / RATE
+
+
+def feed_cost(path):
+    """Mean Endpointer.feed time per frame over the whole file."""
+    with wave.open(path, "rb") as w:
+        data = w.readframes(w.getnframes())
+    frames = [data[i:i + CHUNK * 2] for i in range(0, len(data) - CHUNK * 2, CHUNK * 2)]
+    endpointer = vad.Endpointer(RATE, 2, CHUNK)
+    start = time.perf_counter()
+    for _ in range(20):
+        for seq, frame in enumerate(frames):
+            endpointer.feed(seq, frame)
+    return (time.perf_counter() - start) / (20 * len(frames))
+
+
+def main():
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = []
+        if len(sys.argv) > 1:
+            for arg in sys.argv[1:]:
+                path, end = arg.rsplit(":", 1)
+                fixtures.append((os.path.basename(path), path, float(end), None))
+        else:
+            for name, (noise, words) in FIXTURES.items():
+                path = os.path.join(tmp, name + ".wav")
+                speech = sum(seconds + pause for seconds, pause in words)
+                fixtures.append((name, path, synthesize(path, noise, words, rng), speech))
+
+        print(f"{'fixture':<16}{'speech':>8}{'sr.listen':>12}{'captured':>10}{'listener':>11}{'captured':>10}")
+        old_all, new_all, costs = [], [], []
+        for name, path, end, speech in fixtures:
+            old, old_len = run_sr_listen(path, end)
+            new, new_len = run_listener(path, end, tmp)
+            old_all.append(old)
+            new_all.append(new)
+            costs.append(feed_cost(path))
+            speech_text = f"{speech:.2f}s" if speech else "?"
+            print(f"{name:<16}{speech_text:>8}{old * 1000:>10.0f}ms{old_len:>9.2f}s{new * 1000:>9.0f}ms{new_len:>9.2f}s")
+
+    print(f"\nend of speech -> recognition: sr.listen {statistics.mean(old_all) * 1000:.0f} ms, "
+          f"listener {statistics.mean(new_all) * 1000:.0f} ms "
+          f"({(statistics.mean(old_all) - statistics.mean(new_all)) * 1000:.0f} ms sooner)")
+    print(f"VAD cost: {statistics.mean(costs) * 1e6:.1f} us per {CHUNK * 1000 / RATE:.0f} ms frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Gemini session benchmark: client-side work per turn before the request is sent.
+
+"rebuild" is the old path: fetch history from the store, trim it to the
+budget, convert it and start a fresh ChatSession every turn. "session" is
+GeminiSession: contents built once, then one pair appended per turn.
+Nothing is sent to the network; a real GenerativeModel is only constructed.
+
+    python benchmarks/bench_gemini_session.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import google.generativeai as genai
+from google.generativeai.types import content_types
+
+import llm_context
+from gemini_session import GeminiSession
+from memory_store import MemoryStore
+
+HISTORY = 5_000
+TURNS = 200
+PINNED = [("user", llm_context.preferences_note({"weather_city": "delhi"})), ("bot", "Noted.")]
+
+
+def to_pairs(rows):
+    return [("user" if m["role"] == "user" else "bot", m["content"]) for m in rows]
+
+
+def main():
+    model = genai.GenerativeModel("gemini-2.0-flash")
+    budget = llm_context.budget_for("gemini")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(os.path.join(tmp, "memory.db"), flush_interval=60)
+        for i in range(HISTORY):
+            role = "user" if i % 2 == 0 else "assistant"
+            store.add_llm_message(role, f"message {i}: " + "some conversational text " * 6)
+        store.flush()
+
+        def load():
+            return to_pairs(store.llm_history(llm_context.CONTEXT_FETCH_LIMIT))
+
+        def rebuild_turn(i):
+            prompt = f"question {i}"
+            window = llm_context.select_recent(load(), budget, pinned=PINNED,
+                                               reserve=llm_context.count_tokens(prompt))
+            history = [{"role": "user" if r == "user" else "model", "parts": [c]} for r, c in window]
+            chat = model.start_chat(history=history)
+            content_types.to_contents(chat.history + [content_types.to_content(prompt)])
+            store.add_llm_message("user", prompt)
+            store.add_llm_message("assistant", f"answer {i}")
+
+        session = GeminiSession(model, load, lambda: PINNED, budget)
+
+        def session_turn(i):
+            prompt = f"question {i}"
+            content_types.to_contents(session.request(prompt))
+            store.add_llm_message("user", prompt)
+            store.add_llm_message("assistant", f"answer {i}")
+            session.commit(prompt, f"answer {i}")
+
+        first = time.perf_counter()
+        session.history_pairs()
+        first = time.perf_counter() - first
+
+        for name, turn in (("rebuild", rebuild_turn), ("session", session_turn)):
+            start = time.perf_counter()
+            for i in range(TURNS):
+                turn(i)
+            per_turn = (time.perf_counter() - start) / TURNS
+            print(f"{name:>8}: {per_turn * 1000:7.3f} ms/turn")
+        print(f"session initial build: {first * 1000:.3f} ms, "
+              f"{len(session.contents)} turns kept, ~{session.tokens} tokens")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Hedged request benchmark against local stand-in providers.
+
+The stand-in "Gemini" usually answers in ~40 ms, is slow (600 ms) on 10%
+of calls and times out (error after 800 ms) on 5%. The stand-in "Groq"
+answers in ~80 ms. Compares the old sequential fallback with hedged_call.
+Times are scaled down ~10x from real network latencies.
+
+The streamed table does the same for streamed replies (the default
+path), with those latencies as the time to the first piece: the old
+fallback to the next provider only on failure against hedged_stream,
+measured to the first piece of text.
+
+    python benchmarks/bench_hedging.py [requests]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hedging
+
+HEDGE_DELAY = 0.15
+
+
+def make_primary(rng):
+    roll = rng.random()
+
+    def call():
+        if roll < 0.05:
+            time.sleep(0.8)
+            raise TimeoutError("stand-in Gemini timed out")
+        time.sleep(0.6 if roll < 0.15 else rng.uniform(0.03, 0.05))
+        return "primary reply"
+    return call
+
+
+def make_secondary(rng):
+    delay = rng.uniform(0.07, 0.09)
+
+    def call():
+        time.sleep(delay)
+        return "secondary reply"
+    return call
+
+
+def sequential(primary, secondary):
+    try:
+        return primary()
+    except Exception:
+        return secondary()
+
+
+def as_stream(call, tracker=None):
+    """A stand-in stream whose first piece takes as long as call does (timed like provider_stream)."""
+    def open_stream():
+        start = time.perf_counter()
+        first = call()
+        if tracker is not None:
+            tracker.record(time.perf_counter() - start)
+        yield first
+        yield " and the rest"
+    return open_stream
+
+
+def sequential_stream(primary, secondary):
+    try:
+        return next(iter(primary()))
+    except Exception:
+        return next(iter(secondary()))
+
+
+def hedged_first_piece(primary, secondary, delay):
+    pieces = hedging.hedged_stream(("Gemini", primary), ("Groq", secondary), delay)
+    try:
+        return next(pieces)
+    finally:
+        pieces.close()
+
+
+def percentiles(samples):
+    data = sorted(samples)
+    pick = lambda p: data[min(len(data) - 1, int(p / 100 * len(data)))] * 1e3
+    return pick(50), pick(95), pick(99), data[-1] * 1e3
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    results = {}
+    hedge_used = 0
+    for mode in ("sequential", "hedged"):
+        rng = random.Random(7)  # same latency draws for both modes
+        tracker = hedging.LatencyTracker()
+        latencies = []
+        for _ in range(count):
+            primary, secondary = make_primary(rng), make_secondary(rng)
+            start = time.perf_counter()
+            if mode == "sequential":
+                reply = sequential(primary, secondary)
+            else:
+                reply, winner = hedging.hedged_call(
+                    ("Gemini", primary), ("Groq", secondary),
+                    delay=hedging.hedge_delay(tracker, HEDGE_DELAY),
+                    trackers={"Gemini": tracker},
+                )
+                hedge_used += winner == "Groq"
+            assert reply
+            latencies.append(time.perf_counter() - start)
+        results[mode] = percentiles(latencies)
+
+    print(f"{count} requests, hedge delay {HEDGE_DELAY * 1e3:.0f} ms (or Gemini p95 if lower)")
+    print(f"{'mode':>10} | {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for mode, (p50, p95, p99, worst) in results.items():
+        print(f"{mode:>10} | {p50:>5.0f} ms {p95:>5.0f} ms {p99:>5.0f} ms {worst:>5.0f} ms")
+    print(f"hedged replies served by the secondary: {hedge_used}/{count}")
+
+    streamed = {}
+    for mode in ("sequential", "hedged"):
+        rng = random.Random(7)
+        tracker = hedging.LatencyTracker()
+        latencies = []
+        for _ in range(count):
+            primary, secondary = make_primary(rng), make_secondary(rng)
+            start = time.perf_counter()
+            if mode == "sequential":
+                first = sequential_stream(as_stream(primary), as_stream(secondary))
+            else:
+                first = hedged_first_piece(as_stream(primary, tracker), as_stream(secondary),
+                                           hedging.hedge_delay(tracker, HEDGE_DELAY))
+            assert first
+            latencies.append(time.perf_counter() - start)
+        streamed[mode] = percentiles(latencies)
+
+    print("\nstreamed, time to first piece")
+    print(f"{'mode':>10} | {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for mode, (p50, p95, p99, worst) in streamed.items():
+        print(f"{mode:>10} | {p50:>5.0f} ms {p95:>5.0f} ms {p99:>5.0f} ms {worst:>5.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
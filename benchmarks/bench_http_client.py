@@ -0,0 +1,80 @@
+"""
+HTTP client benchmark against a local stand-in weather server.
+
+Counts TCP connections the server accepts and times each request for the
+old pattern (a fresh requests.get per call) and for the pooled session in
+http_client. The server answers with a small JSON body over HTTP/1.1
+keep-alive and adds a fixed delay per new connection to stand in for the
+TCP/TLS handshake of a real remote host.
+
+    python benchmarks/bench_http_client.py [requests]
+"""
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+import http_client
+
+HANDSHAKE_DELAY = 0.02  # seconds per new connection
+BODY = json.dumps({"cod": 200, "weather": [{"description": "clear sky"}],
+                   "main": {"temp": 30.1, "feels_like": 33.0, "humidity": 60},
+                   "wind": {"speed": 3.2}, "sys": {"country": "IN"}}).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        with Handler.lock:
+            Handler.connections += 1
+        time.sleep(HANDSHAKE_DELAY)
+        # Like a real server: don't let Nagle hold the body behind the headers
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().setup()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, fetch, url, count):
+    Handler.connections = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        assert fetch(url)["cod"] == 200
+    elapsed = time.perf_counter() - start
+    print(f"{label:>18}: {elapsed / count * 1e3:6.2f} ms/request, {Handler.connections} connections")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/data/2.5/weather?q=delhi"
+    try:
+        print(f"{count} requests, {HANDSHAKE_DELAY * 1e3:.0f} ms simulated handshake per connection")
+        run("requests.get", lambda u: requests.get(u, timeout=5).json(), url, count)
+        run("pooled session", http_client.get_json, url, count)
+    finally:
+        http_client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+HUD audio benchmark: render-loop FPS and CPU with audio on and off the render thread.
+
+A fake render loop runs like frontend.main: capped at 60 fps
+(clock.tick(60)) with DRAW_MS of CPU-bound drawing per frame. A writer
+thread publishes noise into a mic_capture ring at the real chunk rate,
+like CaptureService would.
+
+  blocking  each frame reads the next chunk (waiting for it), then runs
+            struct.unpack and a Python RMS loop: the old frontend.main
+  meter     hud_audio.LevelMeter analyses chunks on its own thread; the
+            frame only reads meter.amplitude
+
+"audio CPU/frame" is the render thread's CPU spent on the audio step.
+"meter thread" is the CPU of the analysis thread per second. pygame isn't
+needed.
+
+    python benchmarks/bench_hud_audio.py
+"""
+import math
+import os
+import random
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hud_audio
+import mic_capture
+
+RATE = mic_capture.RATE
+CHUNK = mic_capture.CHUNK
+FPS_CAP = 60
+DRAW_MS = 4.0
+SECONDS = 5.0
+
+
+class PacedWriter:
+    def __init__(self, ring):
+        self.ring = ring
+        rng = random.Random(9)
+        self.noise = [struct.pack(f"{CHUNK}h", *(rng.randint(-3000, 3000) for _ in range(CHUNK))) for _ in range(8)]
+        self.cpu = 0.0  # this thread's CPU so far
+        self.closed = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        next_at = time.monotonic()
+        i = 0
+        while not self.closed.is_set():
+            next_at += CHUNK / float(RATE)
+            time.sleep(max(0.0, next_at - time.monotonic()))
+            self.ring.publish(self.noise[i % len(self.noise)])
+            i += 1
+            self.cpu = time.thread_time()
+
+
+def draw():
+    end = time.thread_time() + DRAW_MS / 1000.0
+    while time.thread_time() < end:
+        pass
+
+
+def blocking_amplitude(reader):
+    data = reader.read()
+    samples = struct.unpack(str(CHUNK) + 'h', data)
+    sum_squares = 0.0
+    for s in samples:
+        sum_squares += s * s
+    rms = math.sqrt(sum_squares / CHUNK)
+    return min(rms / 3000.0, 1.0)
+
+
+def render_loop(get_amplitude):
+    frame_budget = 1.0 / FPS_CAP
+    frames, audio_cpu = 0, 0.0
+    start = time.perf_counter()
+    last = start
+    while time.perf_counter() - start < SECONDS:
+        # clock.tick(60): sleep off what is left of the frame
+        elapsed = time.perf_counter() - last
+        if elapsed < frame_budget:
+            time.sleep(frame_budget - elapsed)
+        last = time.perf_counter()
+        cpu = time.thread_time()
+        get_amplitude()
+        audio_cpu += time.thread_time() - cpu
+        draw()
+        frames += 1
+    return frames / (time.perf_counter() - start), audio_cpu / frames
+
+
+def main():
+    ring = mic_capture.MicRing.create(RATE, 2, CHUNK)
+    writer = PacedWriter(ring)
+    try:
+        reader = mic_capture.RingReader(ring)
+        old_fps, old_cpu = render_loop(lambda: blocking_amplitude(reader))
+
+        meter = hud_audio.LevelMeter(mic_capture.RingReader(ring), CHUNK, RATE)
+        process_cpu, render_cpu, writer_cpu = time.process_time(), time.thread_time(), writer.cpu
+        new_fps, new_cpu = render_loop(lambda: meter.amplitude)
+        meter_cpu = ((time.process_time() - process_cpu) - (time.thread_time() - render_cpu)
+                     - (writer.cpu - writer_cpu))
+        meter.close()
+    finally:
+        writer.closed.set()
+        writer.thread.join()
+        ring.close()
+
+    print(f"render loop capped at {FPS_CAP} fps, {DRAW_MS:.0f} ms drawing per frame, {SECONDS:.0f} s each\n")
+    print(f"{'':<10}{'fps':>8}{'audio CPU/frame':>18}")
+    print(f"{'blocking':<10}{old_fps:>8.1f}{old_cpu * 1e6:>15.0f} us")
+    print(f"{'meter':<10}{new_fps:>8.1f}{new_cpu * 1e6:>15.1f} us")
+    print(f"\nmeter thread: {meter_cpu / SECONDS * 1000:.1f} ms CPU per second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Intent dispatch benchmark: the old elif chains vs the compiled matcher.
+
+Runs every query in fixtures/intent_queries.tsv through both and reports
+accuracy against the expected intent and the time per dispatch. The
+"chain" below reproduces the conditions of the old __main__ loop followed
+by the old ask_neura chain. A second table shows how the cost of a query
+that matches nothing (the LLM fallback) grows with the number of commands.
+
+    python benchmarks/bench_intent_dispatch.py
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import intents
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "intent_queries.tsv")
+REPEAT = 200
+
+
+def load_fixture():
+    cases = []
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                query, expected = line.rstrip("\n").split("\t")
+                cases.append((query, expected))
+    return cases
+
+
+def chain_dispatch(query):
+    q = query
+    if 'good bye' in q or 'goodbye' in q or 'exit' in q or 'bye' in q or "quit" in q or "good night" in q:
+        return "exit"
+    elif 'wikipedia' in q:
+        return "wikipedia"
+    elif 'about' in q:
+        return "about"
+    elif 'who is' in q:
+        return "who_is"
+    elif 'search' in q or 'find' in q:
+        return "search"
+    elif 'weather' in q:
+        return "weather"
+    elif 'open' in q:
+        return "open"
+    elif "pause music" in q or "pause song" in q:
+        return "media_pause"
+    elif "resume music" in q or "play music" in q:
+        return "media_resume"
+    elif "next song" in q or "next track" in q:
+        return "media_next"
+    elif "previous song" in q or "previous track" in q:
+        return "media_previous"
+    elif "what is playing" in q or "what's playing" in q:
+        return "media_status"
+    elif 'song' in q:
+        return "song"
+    elif 'music' in q:
+        return "music"
+    elif 'time' in q:
+        return "time"
+    elif 'close' in q:
+        return "close"
+    elif "allow screen access" in q:
+        return "allow_screen"
+    elif "stop screen access" in q or "disable screen access" in q:
+        return "stop_screen"
+    elif 'camera' in q:
+        return "camera"
+    elif 'picture' in q:
+        return "picture"
+    elif 'pictures' in q:
+        return "pictures"
+    elif 'volume up' in q:
+        return "volume_up"
+    elif 'volume down' in q:
+        return "volume_down"
+    elif 'mute volume' in q or 'mute' in q:
+        return "mute"
+    elif 'unmute volume' in q or 'unmute' in q:
+        return "unmute"
+    elif 'volume' in q:
+        return "volume"
+    elif 'brightness up' in q or 'increase brightness' in q:
+        return "brightness_up"
+    elif 'brightness down' in q or 'decrease brightness' in q:
+        return "brightness_down"
+    elif 'brightness' in q:
+        return "brightness"
+    elif 'take a note' in q or 'write a note' in q:
+        return "take_note"
+    elif 'note' in q:
+        return "read_note"
+    elif 'reminder' in q:
+        return "reminder"
+    elif 'joke' in q or 'jokes' in q:
+        return "joke"
+    elif 'provider status' in q or 'ai status' in q:
+        return "provider_status"
+    elif 'clear memory' in q or 'reset memory' in q:
+        return "clear_memory"
+    # ask_neura
+    if any(phrase in q for phrase in ["how are you", "how do you do"]):
+        return "talk:how_are_you"
+    elif any(greet in q.split() for greet in ["hello", "hi"]):
+        return "talk:greeting"
+    elif "who are you" in q:
+        return "talk:who_are_you"
+    elif "what can you do" in q:
+        return "talk:capabilities"
+    elif "your name" in q:
+        return "talk:name"
+    elif "rohit adak" in q:
+        return "talk:creator"
+    elif "thank you" in q or "thanks" in q:
+        return "talk:thanks"
+    elif "what did i ask" in q:
+        return "talk:recall"
+    elif "time" in q:
+        return "talk:time"
+    elif re.search(r"\bi like\b", q) or re.search(r"\bi prefer\b", q):
+        return "talk:preference"
+    return "chat"
+
+
+def matcher_dispatch(query):
+    match = intents.COMMANDS.match(query)
+    if match:
+        return match.name
+    match = intents.CONVERSATION.match(query)
+    return "talk:" + match.name if match else "chat"
+
+
+def evaluate(name, dispatch, cases):
+    wrong = [(q, expected, dispatch(q)) for q, expected in cases if dispatch(q) != expected]
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for q, _ in cases:
+            dispatch(q)
+    per_query = (time.perf_counter() - start) / (REPEAT * len(cases))
+    accuracy = 1 - len(wrong) / len(cases)
+    print(f"{name:>8}: accuracy {accuracy * 100:5.1f}% ({len(cases) - len(wrong)}/{len(cases)}), "
+          f"{per_query * 1e6:6.2f} us/query")
+    for q, expected, got in wrong:
+        print(f"          {q!r}: expected {expected}, got {got}")
+
+
+def per_query(dispatch, queries):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for q in queries:
+            dispatch(q)
+    return (time.perf_counter() - start) / (REPEAT * len(queries))
+
+
+def scaling(cases):
+    """Fallback queries against N synthetic two-word commands."""
+    queries = [q for q, expected in cases if expected == "chat"]
+    print(f"\nqueries with no command ({len(queries)}), us/query:")
+    print(f"{'commands':>9} | {'chain':>7} | {'matcher':>7}")
+    for n in (35, 100, 300, 1000):
+        phrases = [f"command{i} now" for i in range(n)]
+        registry = intents.IntentMatcher([intents.Intent(f"c{i}", [p]) for i, p in enumerate(phrases)])
+
+        def chain(q):
+            for p in phrases:
+                if p in q:
+                    return p
+            return "chat"
+
+        print(f"{n:>9} | {per_query(chain, queries) * 1e6:7.2f} | "
+              f"{per_query(registry.match, queries) * 1e6:7.2f}")
+
+
+def main():
+    cases = load_fixture()
+    evaluate("chain", chain_dispatch, cases)
+    evaluate("matcher", matcher_dispatch, cases)
+    scaling(cases)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Listener benchmark: time from "start listening" to recorded phrase, per turn.
+
+"per-turn" is the old takeCommand: a new Recognizer, the microphone
+opened, adjust_for_ambient_noise (one second) and listen, every turn.
+"listener" is listener.Listener: opened and calibrated once, then only
+listen. The microphone is simulated by a real-time source that delivers
+room noise paced at the real chunk rate; each turn the "user" starts
+speaking SPEECH_DELAY after they can be heard (after calibration on the
+old path, since the old loop printed "Listening..." first). Opening a real device
+(PortAudio stream setup, tens of ms on Windows) is not simulated, so the
+real saving is slightly larger than measured here.
+
+    python benchmarks/bench_listener.py
+"""
+import array
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import speech_recognition as sr
+
+from listener import Listener
+
+TURNS = 5
+RATE = 16000
+CHUNK = 1024
+SPEECH_DELAY = 0.3   # seconds from turn start until the user speaks
+SPEECH_SECONDS = 0.6
+NOISE_LEVEL = 300
+SPEECH_LEVEL = 6000
+
+
+class SimulatedStream:
+    """Room noise forever; speak() schedules a loud burst. Paced like a real device."""
+
+    def __init__(self):
+        self.rng = random.Random(7)
+        self.lock = threading.Lock()
+        self.speech_at = None
+        self.next_read = None
+
+    def speak(self, delay):
+        with self.lock:
+            self.speech_at = time.monotonic() + delay
+
+    def read(self, size):
+        now = time.monotonic()
+        if self.next_read is None or self.next_read < now:
+            self.next_read = now
+        time.sleep(max(0.0, self.next_read - now))
+        self.next_read += size / RATE
+        with self.lock:
+            talking = self.speech_at is not None and self.speech_at <= time.monotonic() < self.speech_at + SPEECH_SECONDS
+        level = SPEECH_LEVEL if talking else NOISE_LEVEL
+        return array.array("h", (self.rng.randint(-level, level) for _ in range(size))).tobytes()
+
+
+class SimulatedMic(sr.AudioSource):
+    def __init__(self, stream):
+        self.shared = stream
+        self.stream = None
+        self.SAMPLE_RATE = RATE
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = CHUNK
+
+    def __enter__(self):
+        self.stream = self.shared
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+
+
+def per_turn(stream):
+    """The old takeCommand body, minus recognition."""
+    r = sr.Recognizer()
+    stream.speak(SPEECH_DELAY + 1.0)  # the user starts talking as they did before: after the prompt
+    with SimulatedMic(stream) as source:
+        r.adjust_for_ambient_noise(source)
+        return r.listen(source, timeout=4)
+
+
+def report(name, times):
+    print(f"{name:<10} mean {statistics.mean(times):6.2f} s   min {min(times):6.2f} s   max {max(times):6.2f} s")
+
+
+def main():
+    stream = SimulatedStream()
+
+    old = []
+    for _ in range(TURNS):
+        start = time.perf_counter()
+        per_turn(stream)
+        old.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        listener = Listener(calibration_file=os.path.join(tmp, "calibration.json"),
+                            make_source=lambda: SimulatedMic(stream))
+        start = time.perf_counter()
+        listener.open()
+        first_open = time.perf_counter() - start
+        new = []
+        for _ in range(TURNS):
+            time.sleep(0.5)  # "speaking the answer": the capture thread keeps reading
+            stream.speak(SPEECH_DELAY)
+            start = time.perf_counter()
+            listener.listen(timeout=4)
+            new.append(time.perf_counter() - start)
+        time.sleep(2.0)  # between commands the endpointer pulls the threshold back to the room
+        threshold = listener.endpointer.threshold
+        listener.close()
+
+        cached = Listener(calibration_file=os.path.join(tmp, "calibration.json"),
+                          make_source=lambda: SimulatedMic(stream))
+        start = time.perf_counter()
+        cached.open()
+        cached_open = time.perf_counter() - start
+        cached.close()
+
+    print(f"{TURNS} turns, user speaks {SPEECH_DELAY}s after they can, {SPEECH_SECONDS}s phrase\n")
+    print("start of turn -> phrase recorded")
+    report("per-turn", old)
+    report("listener", new)
+    print(f"\nsaved per turn: {statistics.mean(old) - statistics.mean(new):.2f} s")
+    print(f"first open: {first_open:.2f} s (calibrating), from cached calibration: {cached_open * 1000:.1f} ms")
+    print(f"threshold 2 s after the last turn: {threshold:.0f} (noise rms ~{NOISE_LEVEL / 3 ** 0.5:.0f}, speech ~{SPEECH_LEVEL / 3 ** 0.5:.0f})")
+
+
+if __name__ == "__main__":
+    main()
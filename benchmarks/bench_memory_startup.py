@@ -0,0 +1,73 @@
+"""
+Memory startup benchmark: time until the greeting can use memory.
+
+Measures opening the store and reading what analyze_memory_on_start
+needs (preferences, history length, last interaction) as history grows.
+The legacy column is json.load of the equivalent neura_memory.json.
+
+    python benchmarks/bench_memory_startup.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_store import MemoryStore
+
+HISTORY_LENGTHS = [1_000, 10_000, 100_000, 300_000]
+LEGACY_LIMIT = 100_000
+
+
+def interaction(i):
+    return {"timestamp": f"2026-01-01 10:{i % 60:02d}:00", "user": f"question number {i}",
+            "neura": "an answer that is a sentence or two long, like most replies are"}
+
+
+def grow(store, start, end):
+    with store.lock, store.conn:
+        store.conn.executemany(
+            "INSERT INTO interaction_history(timestamp, user, neura) VALUES (?, ?, ?)",
+            [tuple(interaction(i).values()) for i in range(start, end)]
+        )
+        store.conn.execute("DELETE FROM meta WHERE key = 'summary'")
+
+
+def main():
+    print(f"{'history':>8} | {'sqlite open+summary':>20} | {'legacy json.load':>17}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "memory.db")
+        store = MemoryStore(db, flush_interval=60)
+        store.set_preference("weather_city", "delhi")
+        filled = 0
+        for n in HISTORY_LENGTHS:
+            grow(store, filled, n)
+            filled = n
+            store.close()
+            # the first open after growing rebuilds the header, as after an upgrade
+            MemoryStore(db, flush_interval=60).close()
+
+            start = time.perf_counter()
+            store = MemoryStore(db, flush_interval=60)
+            _ = store.preferences, store.interaction_count(), store.last_interaction()
+            opened = time.perf_counter() - start
+
+            legacy = "skipped"
+            if n <= LEGACY_LIMIT:
+                path = os.path.join(tmp, "memory.json")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump({"preferences": {"weather_city": "delhi"},
+                               "interaction_history": [interaction(i) for i in range(n)],
+                               "activity_log": [], "llm_history": []}, f, indent=4)
+                start = time.perf_counter()
+                with open(path, "r", encoding="utf-8") as f:
+                    json.load(f)
+                legacy = f"{(time.perf_counter() - start) * 1e3:.2f} ms"
+            print(f"{n:>8} | {opened * 1e3:>17.2f} ms | {legacy:>17}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Memory write benchmark: disk commits per assistant turn.
+
+One LLM fallback turn through ask_neura records two llm_history messages,
+one interaction and one activity. With write-behind they share a single
+commit at the end of the turn.
+
+    python benchmarks/bench_memory_writes.py [turns]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_store import MemoryStore
+
+
+def run_turn(store, i):
+    store.add_llm_message("user", f"question {i}")
+    store.add_llm_message("assistant", f"answer {i}")
+    store.add_interaction(f"question {i}", f"answer {i}")
+    store.add_activity(f"Handled query: question {i}")
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        # Long interval so only the end-of-turn flush commits
+        store = MemoryStore(os.path.join(tmp, "memory.db"), flush_interval=60)
+        start = time.perf_counter()
+        for i in range(turns):
+            run_turn(store, i)
+            store.flush()
+        elapsed = time.perf_counter() - start
+        print(f"write-behind: {store.flushes / turns:.2f} commits/turn, "
+              f"{elapsed / turns * 1e3:.3f} ms/turn over {turns} turns "
+              f"(write-through was 4 commits/turn)")
+        assert store.interaction_count() == turns
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Microphone sharing benchmark: CPU for two capture paths vs one shared capture.
+
+Both setups run two processes, like the HUD and the backend:
+
+  two paths  each process opens the device and reads every chunk itself
+  shared     the "frontend" process runs CaptureService (its thread is the
+             only reader of the device) and the HUD subscribes to the ring;
+             the "backend" process subscribes with RingSource
+
+Every consumer does the same work per chunk (an RMS), so the difference
+comes from the capture path. CPU is time.process_time() summed over both
+processes (each side is its own interpreter, as under the HUD), counted
+from opening the capture, and reported per second of audio.
+
+Without PyAudio or an input device, the device read is simulated: a paced
+read that copies the chunk out of a buffer. That covers the copies and
+the ring, but not the driver and PortAudio work a second real stream
+costs. Use --device on a machine with a microphone for that.
+
+    python benchmarks/bench_mic_share.py [--device] [seconds]
+"""
+import audioop
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mic_capture
+
+RATE = mic_capture.RATE
+CHUNK = mic_capture.CHUNK
+
+
+class SimulatedDevice:
+    """Paced like a real input stream; each read copies one chunk out of a noise buffer."""
+
+    def __init__(self):
+        rng = random.Random(5)
+        self.noise = bytes(rng.getrandbits(8) for _ in range(RATE * 2))
+        self.pos = 0
+        self.next_read = time.monotonic()
+
+    def read(self, frames, exception_on_overflow=True):
+        delay = self.next_read - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.next_read += frames / float(RATE)
+        nbytes = frames * 2
+        if self.pos + nbytes > len(self.noise):
+            self.pos = 0
+        data = self.noise[self.pos:self.pos + nbytes]
+        self.pos += nbytes
+        return data
+
+
+def open_device(real):
+    if real:
+        import pyaudio
+        pa = pyaudio.PyAudio()
+        return pa.open(format=pyaudio.paInt16, channels=1, rate=RATE, input=True, frames_per_buffer=CHUNK)
+    return SimulatedDevice()
+
+
+def consume(read, seconds):
+    chunks = int(seconds * RATE / CHUNK)
+    for _ in range(chunks):
+        audioop.rms(read(), 2)
+
+
+class SimulatedService(mic_capture.CaptureService):
+    def __init__(self):
+        self.chunk = CHUNK
+        self.stream = SimulatedDevice()
+        self.ring = mic_capture.MicRing.create(RATE, 2, CHUNK)
+        self.closed = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.closed.set()
+        self.thread.join(timeout=1.0)
+        self.ring.close()
+
+
+def role_own(real, seconds):
+    """Two-paths setup: this process reads the device itself."""
+    start = time.process_time()
+    device = open_device(real)
+    consume(lambda: device.read(CHUNK, exception_on_overflow=False), seconds)
+    return time.process_time() - start
+
+
+def role_frontend(real, seconds):
+    """Shared setup, frontend side: CaptureService plus the HUD subscriber."""
+    start = time.process_time()
+    service = mic_capture.CaptureService(rate=RATE, chunk=CHUNK) if real else SimulatedService()
+    print(service.ring.name, flush=True)
+    reader = service.subscribe()
+    consume(reader.read, seconds)
+    cpu = time.process_time() - start
+    time.sleep(0.5)  # the backend may still be reading its last chunks
+    service.close()
+    return cpu
+
+
+def role_backend(real, seconds):
+    """Shared setup, backend side: records from the ring."""
+    start = time.process_time()
+    with mic_capture.RingSource(os.environ[mic_capture.RING_ENV]) as source:
+        consume(lambda: source.stream.read(source.CHUNK), seconds)
+    return time.process_time() - start
+
+
+ROLES = {"own": role_own, "frontend": role_frontend, "backend": role_backend}
+
+
+def start(role, real, seconds, env=None):
+    """A separate interpreter per side, started the way the HUD starts the backend."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--role", role, str(seconds)] + (["--device"] if real else [])
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, env=env)
+
+
+def cpu_of(proc):
+    out, _ = proc.communicate(timeout=120)
+    return float(out.split()[-1])
+
+
+def main():
+    real = "--device" in sys.argv
+    args = [a for a in sys.argv[1:] if a != "--device"]
+    if args[:1] == ["--role"]:
+        print(ROLES[args[1]](real, float(args[2])))
+        return
+    seconds = float(args[0]) if args else 5.0
+
+    procs = [start("own", real, seconds), start("own", real, seconds)]
+    two = sum(cpu_of(p) for p in procs)
+
+    frontend = start("frontend", real, seconds)
+    env = dict(os.environ, **{mic_capture.RING_ENV: frontend.stdout.readline().strip()})
+    backend = start("backend", real, seconds, env)
+    shared = cpu_of(backend) + cpu_of(frontend)
+
+    source = "device" if real else "simulated device"
+    print(f"{seconds:.0f} s of audio at {RATE} Hz, {CHUNK}-sample chunks, {source}\n")
+    print(f"two capture paths   {two / seconds * 1000:7.1f} ms CPU per second of audio")
+    print(f"one shared capture  {shared / seconds * 1000:7.1f} ms CPU per second of audio")
+
+
+if __name__ == "__main__":
+    main()
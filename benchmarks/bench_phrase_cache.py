@@ -0,0 +1,76 @@
+"""
+Phrase cache benchmark: time to first audio, live synthesis vs recording.
+
+Needs Windows with pyttsx3 (SAPI5) and speakers/headphones: every phrase
+is really spoken. "live" is engine.say + runAndWait, timed to the first
+started-word callback (the first word starting to play). "cached" is the
+pre-rendered WAV, timed until winsound has started playback. The
+recordings go to a temporary directory.
+
+    python benchmarks/bench_phrase_cache.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import phrase_cache
+
+PHRASES = ["Let me think...", "Sure sir!", "Hello Sir!", "Volume increased",
+           "I am Neura. Please tell, how may I help you?"]
+REPEAT = 3
+
+
+def main():
+    try:
+        import pyttsx3
+    except ImportError:
+        sys.exit("pyttsx3 is not installed")
+    if phrase_cache.winsound is None:
+        sys.exit("winsound is not available (Windows only)")
+
+    engine = pyttsx3.init('sapi5')
+    voices = engine.getProperty('voices')
+    engine.setProperty('voice', voices[1].id if len(voices) > 1 else voices[0].id)
+    engine.setProperty('rate', 180)
+
+    first_word = []
+    engine.connect('started-word', lambda name, location, length: first_word.append(time.perf_counter()))
+
+    cache = phrase_cache.PhraseCache(tempfile.mkdtemp(prefix="neura_tts_"))
+    cache.set_voice(engine.getProperty('voice'), engine.getProperty('rate'))
+    for text in PHRASES:
+        cache.render(engine, text)
+
+    never = threading.Event()
+    print(f"{'phrase':<46} | {'live':>8} | {'cached':>8}")
+    live_all, cached_all = [], []
+    for text in PHRASES:
+        live, cached = [], []
+        for _ in range(REPEAT):
+            first_word.clear()
+            start = time.perf_counter()
+            engine.say(text)
+            engine.runAndWait()
+            live.append(first_word[0] - start)
+
+            path = cache.lookup(text)
+            start = time.perf_counter()
+            phrase_cache.winsound.PlaySound(
+                path, phrase_cache.winsound.SND_FILENAME | phrase_cache.winsound.SND_ASYNC)
+            cached.append(time.perf_counter() - start)
+            never.wait(phrase_cache.wav_duration(path))
+        live_all += live
+        cached_all += cached
+        print(f"{text[:46]:<46} | {statistics.median(live) * 1000:6.1f}ms | "
+              f"{statistics.median(cached) * 1000:6.1f}ms")
+    print(f"{'median':<46} | {statistics.median(live_all) * 1000:6.1f}ms | "
+          f"{statistics.median(cached_all) * 1000:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Spectrum analyzer micro-benchmark: cost per audio chunk against the 60 fps frame budget.
+
+  naive     the straightforward version: new arrays for the windowed
+            chunk, the FFT and the power spectrum, and a Python loop
+            over bands taking slice means
+  analyzer  hud_audio.SpectrumAnalyzer.process: preallocated buffers,
+            rfft/abs/square/dot into them, one pass for all bands
+
+Both produce BANDS band energies from the same 1024-sample chunk. Peak
+bytes allocated during a call are counted with tracemalloc, which NumPy
+reports its array buffers to; "without FFT" leaves out the FFT call,
+whose internal scratch space NumPy allocates even with out=.
+
+    python benchmarks/bench_spectrum.py
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import hud_audio
+
+RATE = 44100
+CHUNK = 1024
+CALLS = 20_000
+FRAME_BUDGET_US = 1e6 / 60
+
+
+def naive_analyzer():
+    window = np.hanning(CHUNK)
+    freqs = np.fft.rfftfreq(CHUNK, 1.0 / RATE)
+    edges = np.geomspace(hud_audio.FMIN, hud_audio.FMAX, hud_audio.BANDS + 1)
+    slices = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        inside = np.flatnonzero((freqs >= lo) & (freqs < hi))
+        if inside.size == 0:
+            inside = np.array([np.argmin(np.abs(freqs - np.sqrt(lo * hi)))])
+        slices.append(slice(int(inside[0]), int(inside[-1]) + 1))
+
+    def process(samples):
+        power = np.abs(np.fft.rfft(samples * window)) ** 2
+        return [float(power[s].mean()) for s in slices]
+    return process
+
+
+def allocated_per_call(fn, calls=1000):
+    fn()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    for _ in range(calls):
+        fn()
+    total = tracemalloc.get_traced_memory()[1] - before  # peak growth within the loop
+    tracemalloc.stop()
+    return total
+
+
+def main():
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, 2000, CHUNK).astype(np.float32)
+
+    naive = naive_analyzer()
+    analyzer = hud_audio.SpectrumAnalyzer(CHUNK, RATE)
+
+    rows = []
+    for name, fn in (("naive", lambda: naive(samples)), ("analyzer", lambda: analyzer.process(samples))):
+        per_call = min(timeit.repeat(fn, number=CALLS, repeat=3)) / CALLS * 1e6
+        rows.append((name, per_call, allocated_per_call(fn)))
+
+    rfft = np.fft.rfft
+    np.fft.rfft = lambda a, out=None: out  # skip the transform, keep everything else
+    try:
+        without_fft = allocated_per_call(lambda: analyzer.process(samples))
+    finally:
+        np.fft.rfft = rfft
+
+    print(f"{CHUNK}-sample chunks at {RATE} Hz, {hud_audio.BANDS} bands, {CALLS} calls x 3\n")
+    print(f"{'':<10}{'us/chunk':>10}{'% of 60fps frame':>18}{'peak alloc':>13}")
+    for name, per_call, alloc in rows:
+        print(f"{name:<10}{per_call:>10.1f}{per_call / FRAME_BUDGET_US * 100:>17.2f}%{alloc:>11d} B")
+    print(f"analyzer peak alloc without FFT: {without_fft} B")
+    chunks_per_frame = RATE / CHUNK / 60
+    print(f"\n{chunks_per_frame:.2f} chunks arrive per frame; the analyzer uses "
+          f"{rows[1][1] * chunks_per_frame / FRAME_BUDGET_US * 100:.2f}% of each frame on the audio thread")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Streaming TTS benchmark: time-to-first-audio with a mocked streaming provider.
+
+The fake provider emits a reply word by word with a fixed delay per token;
+the fake TTS has a fixed start-up cost plus a per-character speaking time.
+"batch" waits for the whole reply before speaking (the old ask_neura path);
+"stream" speaks sentence by sentence through speech_stream.
+
+    python benchmarks/bench_stream_tts.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import speech_stream
+
+REPLY = ("Canberra is the capital of Australia. It was chosen as a compromise between "
+         "Sydney and Melbourne. The city was purpose built and became the capital in 1913. "
+         "Parliament House sits on Capital Hill. Canberra is also home to many national institutions.")
+TOKEN_DELAY = 0.02        # seconds between streamed tokens
+TTS_SETUP = 0.08          # engine start per utterance
+TTS_PER_CHAR = 0.0005     # speaking time, scaled down so the run stays short
+
+
+def provider():
+    for word in REPLY.split(" "):
+        time.sleep(TOKEN_DELAY)
+        yield word + " "
+
+
+def make_tts(started):
+    def say(text):
+        time.sleep(TTS_SETUP)
+        if not started:
+            started.append(time.perf_counter())
+        time.sleep(TTS_PER_CHAR * len(text))
+    return say
+
+
+def run_batch():
+    started = []
+    t0 = time.perf_counter()
+    text = "".join(provider())
+    make_tts(started)(text)
+    return started[0] - t0, time.perf_counter() - t0
+
+
+def run_stream():
+    started = []
+    t0 = time.perf_counter()
+    speech_stream.stream_to_speech(provider(), make_tts(started))
+    return started[0] - t0, time.perf_counter() - t0
+
+
+def main():
+    tokens = len(REPLY.split(" "))
+    print(f"{tokens} tokens at {TOKEN_DELAY * 1e3:.0f} ms, TTS setup {TTS_SETUP * 1e3:.0f} ms")
+    for name, run in (("batch", run_batch), ("stream", run_stream)):
+        first, total = run()
+        print(f"{name:>6}: first audio {first * 1e3:7.1f} ms, done {total * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
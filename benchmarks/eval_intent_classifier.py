@@ -0,0 +1,86 @@
+"""
+Offline evaluation and timing for the local intent classifier.
+
+  - held-out: queries in fixtures/intent_nearmiss.tsv, none of them in
+    the training file. Reports commands recovered (LLM calls avoided),
+    commands sent to the wrong handler, and LLM questions wrongly routed
+    to a command (the costly mistake).
+  - leave-one-out: each training phrase classified by a model trained
+    on all the others.
+  - timing: training time and per-query prediction time.
+
+    python benchmarks/eval_intent_classifier.py
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from intent_classifier import IntentClassifier, NONE_LABEL
+
+PHRASES = os.path.join(ROOT, "intent_phrases.tsv")
+HELD_OUT = os.path.join(ROOT, "benchmarks", "fixtures", "intent_nearmiss.tsv")
+REPEAT = 200
+
+
+def load(path):
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                a, b = line.rstrip("\n").split("\t")
+                rows.append((a, b))
+    return rows
+
+
+def report(name, results):
+    """results: (query, expected, predicted or None)"""
+    commands = [r for r in results if r[1] != NONE_LABEL]
+    questions = [r for r in results if r[1] == NONE_LABEL]
+    recovered = sum(1 for _, e, p in commands if p == e)
+    misrouted = [(q, e, p) for q, e, p in commands if p is not None and p != e]
+    false_routes = [(q, p) for q, _, p in questions if p is not None]
+    print(f"{name}: {recovered}/{len(commands)} commands recovered, "
+          f"{len(misrouted)} sent to the wrong command, "
+          f"{len(false_routes)}/{len(questions)} LLM questions wrongly routed")
+    for q, e, p in misrouted:
+        print(f"    {q!r}: expected {e}, got {p}")
+    for q, p in false_routes:
+        print(f"    {q!r}: expected none, got {p}")
+
+
+def main():
+    examples = [(label, phrase) for label, phrase in load(PHRASES)]
+
+    start = time.perf_counter()
+    clf = IntentClassifier(examples)
+    train = time.perf_counter() - start
+    print(f"trained on {len(examples)} phrases, {len(clf.labels)} intents in {train * 1000:.1f} ms")
+
+    held_out = [(q, e) for q, e in load(HELD_OUT)]
+    results = []
+    for q, e in held_out:
+        p = clf.predict(q)
+        results.append((q, e, p.name if p else None))
+    report("held-out", results)
+
+    loo = []
+    for i, (label, phrase) in enumerate(examples):
+        model = IntentClassifier(examples[:i] + examples[i + 1:])
+        p = model.predict(phrase)
+        loo.append((phrase, label, p.name if p else None))
+    report("leave-one-out", loo)
+
+    queries = [q for q, _ in held_out]
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for q in queries:
+            clf.predict(q)
+    per_query = (time.perf_counter() - start) / (REPEAT * len(queries))
+    print(f"predict: {per_query * 1e6:.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Chat bridge between the backend (neura.py) and the HUD (frontend.py).
+
+Two transports share the same record format:
+  * push: the frontend listens on a local pipe/socket and the backend sends
+    framed messages to it. The render loop drains a queue without blocking.
+  * file: an append-only JSON Lines file, one message per line, tailed by
+    byte offset. Used when the backend runs on its own, or for debugging
+    with NEURA_BRIDGE_TRANSPORT=file.
+"""
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+CHAT_BRIDGE_FILE = "chat_bridge.jsonl"
+ROTATED_SUFFIX = ".prev"
+
+# Set by the frontend on the backend's environment
+TRANSPORT_ENV = "NEURA_BRIDGE_TRANSPORT"
+ADDRESS_ENV = "NEURA_BRIDGE_ADDRESS"
+AUTHKEY_ENV = "NEURA_BRIDGE_AUTHKEY"
+
+
+def make_record(role, message):
+    return {
+        "time": datetime.datetime.now().strftime("%H:%M:%S"),
+        "role": role,
+        "message": message
+    }
+
+
+def start_session(path=CHAT_BRIDGE_FILE):
+    """
+    Rotate the previous session's bridge away and start a new one.
+    The first line is a session header so readers can tell a fresh file
+    from the one they were tailing, even if it has grown to the same size.
+    """
+    if os.path.exists(path):
+        os.replace(path, path + ROTATED_SUFFIX)
+    header = {"session": f"{time.time():.6f}-{os.getpid()}"}
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(header) + "\n")
+
+
+def append_record(record, path=CHAT_BRIDGE_FILE):
+    """Append one record as a single line; cost does not depend on history size."""
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+class BridgeReader:
+    """
+    Tails the bridge file from a saved byte offset.
+    Detects truncation (file shorter than our offset) and rotation (a
+    different first line) and starts again from the beginning.
+    """
+
+    def __init__(self, path=CHAT_BRIDGE_FILE):
+        self.path = path
+        self.offset = 0
+        self.stamp = None
+        self.header = None
+
+    def child_env(self):
+        """Environment variables that make a backend process write to this file."""
+        return {TRANSPORT_ENV: "file"}
+
+    def close(self):
+        pass
+
+    def poll(self):
+        """Return the list of records appended since the previous poll."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []
+
+        # Cheap per-frame check: nothing is opened unless the file changed
+        stamp = (st.st_size, st.st_mtime_ns)
+        if stamp == self.stamp:
+            return []
+        self.stamp = stamp
+        size = st.st_size
+
+        with open(self.path, "rb") as f:
+            header = f.readline()
+            if header != self.header or size < self.offset:
+                self.header = header
+                self.offset = 0
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+
+        # Only consume complete lines; a half-written record is picked up next poll
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return []
+        self.offset += end + 1
+
+        records = []
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print("Chat bridge skipped bad record:", e)
+                continue
+            if "session" not in record:
+                records.append(record)
+        return records
+
+
+class FileWriter:
+    """Backend side of the file transport."""
+
+    def __init__(self, path=CHAT_BRIDGE_FILE):
+        self.path = path
+
+    def start_session(self):
+        start_session(self.path)
+
+    def send(self, record):
+        append_record(record, self.path)
+
+
+# -------------------- PUSH TRANSPORT --------------------
+class PushServer:
+    """
+    Frontend side of the push transport.
+    A background thread accepts the backend's connection and moves every
+    received record onto a queue; poll() only drains that queue.
+    """
+
+    def __init__(self):
+        self.authkey = os.urandom(16)
+        # Default family: a named pipe on Windows, a Unix socket elsewhere
+        self.listener = Listener(authkey=self.authkey)
+        self.inbox = queue.SimpleQueue()
+        self.closed = False
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def child_env(self):
+        """Environment variables that point a backend process at this server."""
+        return {
+            TRANSPORT_ENV: "push",
+            ADDRESS_ENV: self.listener.address,
+            AUTHKEY_ENV: self.authkey.hex(),
+        }
+
+    def _serve(self):
+        # Keep accepting so a restarted backend can reconnect
+        while not self.closed:
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                if not self.closed:
+                    print("Chat bridge accept error:", e)
+                return
+            with conn:
+                while True:
+                    try:
+                        self.inbox.put(conn.recv())
+                    except (EOFError, OSError):
+                        break
+                    except Exception as e:
+                        # A bad message (e.g. one that won't unpickle): drop this
+                        # connection and keep accepting; the client reconnects
+                        print("Chat bridge receive error:", e)
+                        break
+
+    def poll(self):
+        """Return every record received since the previous poll, without waiting."""
+        records = []
+        while True:
+            try:
+                records.append(self.inbox.get_nowait())
+            except queue.Empty:
+                return records
+
+    def close(self):
+        self.closed = True
+        self.listener.close()
+
+
+class PushClient:
+    """Backend side of the push transport; connects lazily on first send."""
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self.conn = None
+
+    def start_session(self):
+        # Each backend process is a new connection, nothing to rotate
+        pass
+
+    def send(self, record):
+        # One retry on a fresh connection: the server drops a connection that sent a bad message
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = Client(self.address, authkey=self.authkey)
+            try:
+                self.conn.send(record)
+                return
+            except OSError:
+                self.conn = None
+                if attempt:
+                    raise
+
+
+def open_writer():
+    """Pick the backend's transport from the environment set by the frontend."""
+    address = os.getenv(ADDRESS_ENV)
+    if os.getenv(TRANSPORT_ENV, "push") == "push" and address:
+        return PushClient(address, bytes.fromhex(os.getenv(AUTHKEY_ENV, "")))
+    return FileWriter()
+
+
+def open_reader():
+    """Pick the frontend's transport; file only when asked for explicitly."""
+    if os.getenv(TRANSPORT_ENV, "push") == "file":
+        return BridgeReader()
+    return PushServer()
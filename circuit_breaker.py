@@ -0,0 +1,117 @@
+"""
+Per-provider circuit breaker and health stats.
+
+CLOSED: calls go through; outcomes are tracked over a rolling window.
+OPEN: the error rate crossed the threshold, so the provider is skipped.
+HALF_OPEN: the cooldown is over and one background probe is in flight;
+a successful probe closes the breaker, a failed one opens it again.
+"""
+import collections
+import threading
+import time
+
+from hedging import LatencyTracker
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    def __init__(self, name, window=20, min_calls=4, error_threshold=0.5, cooldown=30.0):
+        self.name = name
+        self.window = collections.deque(maxlen=window)  # True = success
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.latency = LatencyTracker(window)
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.total_calls = 0
+        self.total_failures = 0
+        self.lock = threading.Lock()
+
+    def _set_state(self, state):
+        if state != self.state:
+            print(f"[Breaker {self.name}: {self.state} -> {state}]")
+            self.state = state
+            if state == OPEN:
+                self.opened_at = time.monotonic()
+
+    def error_rate(self):
+        if not self.window:
+            return 0.0
+        return 1.0 - sum(self.window) / len(self.window)
+
+    def allow_request(self):
+        """Whether user traffic should be sent to this provider right now."""
+        with self.lock:
+            return self.state == CLOSED
+
+    def ready_for_probe(self):
+        """Move OPEN -> HALF_OPEN once the cooldown is over; True if the caller should probe."""
+        with self.lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self._set_state(HALF_OPEN)
+                return True
+            return False
+
+    def release_probe(self):
+        """HALF_OPEN -> OPEN without a verdict: the trial was granted but never made."""
+        with self.lock:
+            if self.state == HALF_OPEN:
+                self.state = OPEN  # opened_at is kept, so it is still due for a trial
+
+    def record_success(self, seconds):
+        self.latency.record(seconds)
+        with self.lock:
+            self.total_calls += 1
+            self.window.append(True)
+            if self.state == HALF_OPEN:
+                # Start the closed state with a clean slate
+                self.window.clear()
+                self._set_state(CLOSED)
+
+    def record_failure(self, seconds):
+        with self.lock:
+            self.total_calls += 1
+            self.total_failures += 1
+            self.window.append(False)
+            if self.state == HALF_OPEN:
+                self._set_state(OPEN)
+            elif (self.state == CLOSED and len(self.window) >= self.min_calls
+                  and self.error_rate() >= self.error_threshold):
+                self._set_state(OPEN)
+
+    def call(self, fn):
+        """Run fn, recording its latency and outcome."""
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception:
+            self.record_failure(time.perf_counter() - start)
+            raise
+        self.record_success(time.perf_counter() - start)
+        return result
+
+    def stats(self):
+        with self.lock:
+            state, error_rate = self.state, self.error_rate()
+            calls, failures = self.total_calls, self.total_failures
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+        return {
+            "name": self.name,
+            "state": state,
+            "error_rate": error_rate,
+            "calls": calls,
+            "failures": failures,
+            "p50": p50,
+            "p95": p95,
+        }
+
+    def describe(self):
+        s = self.stats()
+        latency = "no data" if s["p50"] is None else f"p50 {s['p50']:.2f}s, p95 {s['p95']:.2f}s"
+        return (f"{s['name']} is {s['state']}, error rate {s['error_rate'] * 100:.0f} percent "
+                f"over recent calls, {s['calls']} calls in total, latency {latency}")
@@ -1,21 +1,20 @@
 import pygame
 import random
 import math
-import pyaudio
-import struct
 import cv2
 import os
 import sys
 import subprocess
 import psutil
 from collections import deque
-import json
+import chat_bridge
+import mic_capture
+import hud_audio
 
 # ------------- GLOBALS THAT WILL BE UPDATED -------------
 CHAT_MESSAGES = deque(maxlen=25)
 CHAT_SCROLL_OFFSET = 0
-CHAT_BRIDGE_FILE = "chat_bridge.json"
-LAST_CHAT_LEN = 0
+CHAT_READER = None  # chat bridge transport, opened in main()
 
 WIDTH, HEIGHT = 500, 500
 CENTER_X, CENTER_Y = WIDTH // 2, HEIGHT // 2
@@ -33,11 +32,10 @@ ROT_X_SPEED = 0.18
 NUM_DOTS = 2000          # number of dots
 GOLD = (160, 80, 255)
 
-# Audio config (still used to react the HUD)
-CHUNK = 1024
-FORMAT = pyaudio.paInt16
-CHANNELS = 1
-RATE = 44100
+# Audio config (still used to react the HUD); the backend records from the same capture
+CHUNK = mic_capture.CHUNK
+RATE = mic_capture.RATE
+MIC_INDEX = int(os.getenv("NEURA_MIC_INDEX", "1"))
 
 CPU_GRAPH = []
 RAM_GRAPH = []
@@ -74,9 +72,9 @@ ULTRA_BOLD = False  # toggle with 'U'
 
 # --------- SPEAKING EFFECT (PULSES) ---------
 VOICE_PULSES = []          # list of start times (ms)
-VOICE_THRESHOLD = 0.15     # amplitude threshold to trigger a pulse
+VOICE_THRESHOLD = 0.3      # voice-band level (hud_audio) that triggers a pulse
 VOICE_PULSE_LIFE = 1200.0  # ms each pulse lives
-last_amplitude = 0.0       # for edge detection
+last_voice = 0.0           # for edge detection
 
 
 def recalc_layout(width, height):
@@ -221,7 +219,7 @@ def wrap_text(font, text, max_width):
 
 
 # -------------------- ADVANCED JARVIS HUD --------------------
-def draw_sidd_hud(surface, t, amplitude):
+def draw_sidd_hud(surface, t, amplitude, bands):
     global ULTRA_BOLD, VOICE_PULSES
 
     center = (CENTER_X, CENTER_Y)
@@ -326,7 +324,9 @@ def draw_sidd_hud(surface, t, amplitude):
     num_arcs = 5
     for i in range(num_arcs):
         ang_off = ts * (0.9 + 0.2 * i)
-        span = (math.pi / 7) + amp_visual * (math.pi / 10)
+        # each arc follows its own slice of the spectrum, low to high
+        band_level = float(bands[i * len(bands) // num_arcs])
+        span = (math.pi / 7) + band_level * (math.pi / 10)
         start_ang = ang_off + i * (2 * math.pi / num_arcs)
         end_ang = start_ang + span
         pygame.draw.arc(surface, inner_color, arc_rect, start_ang, end_ang, arc_ring_w)
@@ -407,7 +407,7 @@ def draw_sidd_hud(surface, t, amplitude):
 
 
 # -------------------- ANALYTICS PANELS OUTSIDE SPHERE --------------------
-def draw_analytics(surface, t, amplitude, fps):
+def draw_analytics(surface, t, amplitude, fps, bands):
     global current_theme, ULTRA_BOLD
 
     # --- Colors ---
@@ -468,6 +468,15 @@ def draw_analytics(surface, t, amplitude, fps):
     label = font_tiny.render("VOICE LEVEL", True, text_color)
     surface.blit(label, (bar_x, bar_y - 16))
 
+    # spectrum columns above the bar, low to high frequency
+    spec_x = bar_x + 110
+    col_w = (bar_x + bar_w - spec_x) / len(bands)
+    for i, level in enumerate(bands):
+        col_h = int(14 * float(level))
+        if col_h > 0:
+            col_color = mix_color((80, 200, 120), (255, 80, 80), float(level))
+            pygame.draw.rect(surface, col_color, (int(spec_x + i * col_w), bar_y - 2 - col_h, max(1, int(col_w) - 2), col_h))
+
         # ---------- BOTTOM-RIGHT SYSTEM PERFORMANCE GRAPH ----------
         # ---------- TASK MANAGER STYLE PERFORMANCE PANEL ----------
     panel_w, panel_h = 300, 240
@@ -567,22 +576,17 @@ def draw_analytics(surface, t, amplitude, fps):
 
 
 def fetch_chat_from_backend():
-    global LAST_CHAT_LEN, CHAT_SCROLL_OFFSET
+    global CHAT_SCROLL_OFFSET
 
-    if not os.path.exists(CHAT_BRIDGE_FILE):
+    if CHAT_READER is None:
         return
 
     try:
-        with open(CHAT_BRIDGE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        if len(data) > LAST_CHAT_LEN:
-            new_msgs = data[LAST_CHAT_LEN:]
-            for msg in new_msgs:
-                prefix = "You" if msg["role"] == "user" else "Neura"
-                CHAT_MESSAGES.append(f"{prefix}: {msg['message']}")
-                CHAT_SCROLL_OFFSET = 0
-            LAST_CHAT_LEN = len(data)
+        # Only the records received since the last frame are returned
+        for msg in CHAT_READER.poll():
+            prefix = "You" if msg["role"] == "user" else "Neura"
+            CHAT_MESSAGES.append(f"{prefix}: {msg['message']}")
+            CHAT_SCROLL_OFFSET = 0
 
     except Exception as e:
         print("Frontend chat read error:", e)
@@ -640,7 +644,20 @@ def draw_chat_panel(surface):
 def main():
     pygame.init()
 
-    global SPHERE_RADIUS, current_theme, ULTRA_BOLD, last_amplitude, VOICE_PULSES, CHAT_SCROLL_OFFSET
+    global SPHERE_RADIUS, current_theme, ULTRA_BOLD, last_voice, VOICE_PULSES, CHAT_SCROLL_OFFSET, CHAT_READER
+
+    # ---- CHAT BRIDGE (push channel, or the JSONL file for debugging) ----
+    CHAT_READER = chat_bridge.open_reader()
+
+    # ---- MICROPHONE: captured once, shared with the backend through a ring ----
+    mic = None
+    level_meter = None
+    spectrum = hud_audio.SpectrumAnalyzer(CHUNK, RATE)
+    try:
+        mic = mic_capture.CaptureService(device_index=MIC_INDEX, rate=RATE, chunk=CHUNK)
+        level_meter = hud_audio.LevelMeter(mic.subscribe(), CHUNK, RATE, spectrum=spectrum)
+    except Exception as e:
+        print("Could not open the microphone:", e)
 
     # ---- START SIDD AI BACKEND (AI.py) ----
     ai_process = None
@@ -649,7 +666,11 @@ def main():
         script_dir = os.path.dirname(os.path.abspath(__file__))
         ai_script = os.path.join(script_dir, "neura.py")
 
-        ai_process = subprocess.Popen([sys.executable, ai_script])
+        ai_env = os.environ.copy()
+        ai_env.update(CHAT_READER.child_env())
+        if mic is not None:
+            ai_env.update(mic.child_env())
+        ai_process = subprocess.Popen([sys.executable, ai_script], env=ai_env)
         print("AI backend started:", ai_script)
     except Exception as e:
         print("Could not start AI backend:", e)
@@ -666,16 +687,6 @@ def main():
 
     dots = [Dot() for _ in range(NUM_DOTS)]
 
-    # ---- Audio setup ----
-    pa = pyaudio.PyAudio()
-    stream = pa.open(
-        format=FORMAT,
-        channels=CHANNELS,
-        rate=RATE,
-        input=True,
-        frames_per_buffer=CHUNK
-    )
-
     # ---- CAMERA SETUP ----
     cam = cv2.VideoCapture(0)
     cam.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
@@ -741,23 +752,16 @@ def main():
                     elif event.key == pygame.K_u:
                         ULTRA_BOLD = not ULTRA_BOLD
 
-            # ---- Read audio chunk & compute amplitude ----
-            data = stream.read(CHUNK, exception_on_overflow=False)
-            samples = struct.unpack(str(CHUNK) + 'h', data)
+            # ---- Latest smoothed amplitude (measured on the audio thread) ----
+            amplitude = level_meter.amplitude if level_meter else 0.0
 
-            # RMS (root mean square) for volume
-            sum_squares = 0.0
-            for s in samples:
-                sum_squares += s * s
-            rms = math.sqrt(sum_squares / CHUNK)
+            bands = spectrum.levels
 
-            # Normalize RMS to [0,1] (tune 3000 for sensitivity)
-            amplitude = min(rms / 3000.0, 1.0)
-
-            # ----- SPEAKING PULSE TRIGGER (on rising edge over threshold) -----
-            if amplitude > VOICE_THRESHOLD and last_amplitude <= VOICE_THRESHOLD:
+            # ----- SPEAKING PULSE TRIGGER (voice bands rising over threshold) -----
+            voice = spectrum.voice
+            if voice > VOICE_THRESHOLD and last_voice <= VOICE_THRESHOLD:
                 VOICE_PULSES.append(t)
-            last_amplitude = amplitude
+            last_voice = voice
 
             # sphere radius fixed
             SPHERE_RADIUS = SPHERE_RADIUS_BASE
@@ -810,22 +814,22 @@ def main():
                     draw_dot(screen, sx, sy, radius, color)
 
             # Jarvis HUD always on top, inside sphere
-            draw_sidd_hud(screen, t, amplitude)
+            draw_sidd_hud(screen, t, amplitude, bands)
 
             # Working analytics around the sphere
             fps = clock.get_fps()
             # Draw chat first, then analytics so analytics appear above
-            draw_analytics(screen, t, amplitude, fps)
+            draw_analytics(screen, t, amplitude, fps, bands)
             draw_chat_panel(screen)
 
             pygame.display.flip()
     finally:
         # clean up audio
-        stream.stop_stream()
-        stream.close()
-        pa.terminate()
+        if level_meter is not None:
+            level_meter.close()
         pygame.quit()
         cam.release()
+        CHAT_READER.close()
 
         # ---- STOP SIDD AI BACKEND ----
         if ai_process is not None and ai_process.poll() is None:
@@ -836,6 +840,10 @@ def main():
             except Exception as e:
                 print("Error terminating AI backend:", e)
 
+        # The backend records from the ring until it exits
+        if mic is not None:
+            mic.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,96 @@
+"""
+Long-lived Gemini conversation state.
+
+The history is built once (from the memory store, trimmed to the Gemini
+token budget) as ready-made Content objects, then extended by one
+user/model pair per turn and trimmed from the front when it outgrows the
+budget. It is rebuilt only after reset() (e.g. "clear memory") or when
+the pinned preferences change.
+
+Requests go through model.generate_content with the session's contents
+rather than a genai ChatSession: a ChatSession appends whatever Gemini
+returns to its own history, and with hedged requests that reply may be
+one the user never heard (Groq answered first), or arrive during the
+next turn. Here the turn that was actually used is committed explicitly.
+"""
+import threading
+
+import google.generativeai as genai
+
+import llm_context
+
+
+def to_content(role, text):
+    return genai.protos.Content(
+        role="user" if role == "user" else "model",
+        parts=[genai.protos.Part(text=text)],
+    )
+
+
+class GeminiSession:
+    def __init__(self, model, load_pairs, pinned, budget):
+        """
+        load_pairs: callable -> recent (role, content) history, oldest first
+        pinned: callable -> (role, content) items that always lead the history
+        budget: token budget for pinned items plus history
+        """
+        self.model = model
+        self.load_pairs = load_pairs
+        self.pinned = pinned
+        self.budget = budget
+        self.lock = threading.Lock()
+        self.pinned_pairs = None
+        self.pinned_contents = []
+        self.pairs = None      # (role, content) turns after the pinned items
+        self.contents = []     # Content objects for self.pairs
+        self.tokens = 0
+
+    def _ensure(self):
+        pinned = self.pinned()
+        if self.pairs is not None and pinned == self.pinned_pairs:
+            return
+        window = llm_context.select_recent(self.load_pairs(), self.budget, pinned=pinned)
+        self.pinned_pairs = pinned
+        self.pinned_contents = [to_content(role, text) for role, text in pinned]
+        self.pairs = window[len(pinned):]
+        self.contents = [to_content(role, text) for role, text in self.pairs]
+        self.tokens = sum(llm_context.count_tokens(text) for _, text in window)
+
+    def history_pairs(self):
+        """Copy of the session's turns (without pinned items), oldest first."""
+        with self.lock:
+            self._ensure()
+            return list(self.pairs)
+
+    def request(self, text):
+        """Contents for one generate_content call: pinned + history + this message."""
+        with self.lock:
+            self._ensure()
+            return self.pinned_contents + self.contents + [to_content("user", text)]
+
+    def send(self, text, stream=False):
+        return self.model.generate_content(self.request(text), stream=stream)
+
+    def commit(self, prompt, reply):
+        """Record the turn the user actually got, whichever provider produced it."""
+        with self.lock:
+            if self.pairs is None:
+                return  # built from the store (which has this turn) on next use
+            for role, text in (("user", prompt), ("bot", reply)):
+                self.pairs.append((role, text))
+                self.contents.append(to_content(role, text))
+                self.tokens += llm_context.count_tokens(text)
+            # Drop the oldest user/model pairs once over budget
+            while self.tokens > self.budget and len(self.pairs) > 2:
+                for _ in range(2):
+                    _, text = self.pairs.pop(0)
+                    self.contents.pop(0)
+                    self.tokens -= llm_context.count_tokens(text)
+
+    def reset(self):
+        with self.lock:
+            self.pairs = None
+            self.contents = []
+            self.pinned_contents = []
+            self.pinned_pairs = None
+            self.tokens = 0
@@ -0,0 +1,193 @@
+"""
+Hedged requests across two LLM providers.
+
+The primary provider is called first. If it has not answered within the
+hedge delay (fixed, or its recent p95 latency) the secondary is started
+too, and whichever returns a valid reply first wins. A primary that fails
+outright starts the secondary immediately.
+
+hedged_stream does the same for streamed replies, up to the first piece:
+whichever stream produces text first is the one the caller reads.
+"""
+import collections
+import concurrent.futures
+import queue
+import threading
+import time
+
+HEDGE_MIN_SAMPLES = 20  # use the p95 only once we have this many latencies
+
+_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-hedge")
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider."""
+
+    def __init__(self, window=100):
+        self.samples = collections.deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, pct):
+        with self.lock:
+            data = sorted(self.samples)
+        if not data:
+            return None
+        index = min(len(data) - 1, int(round(pct / 100.0 * (len(data) - 1))))
+        return data[index]
+
+    def __len__(self):
+        return len(self.samples)
+
+
+def hedge_delay(tracker, max_delay):
+    """
+    The primary's p95 once enough samples exist, capped at the configured
+    delay so a primary with a heavy tail can't push the hedge out.
+    """
+    if tracker is not None and len(tracker) >= HEDGE_MIN_SAMPLES:
+        return min(max_delay, tracker.percentile(95))
+    return max_delay
+
+
+def _timed(name, fn, trackers):
+    start = time.perf_counter()
+    result = fn()
+    tracker = trackers.get(name)
+    if tracker is not None:
+        tracker.record(time.perf_counter() - start)
+    return result
+
+
+def hedged_call(primary, secondary, delay, validate=bool, trackers=None):
+    """
+    primary / secondary: (name, zero-argument callable) pairs
+    delay: seconds to wait for the primary before starting the secondary
+    validate: predicate a result must pass to be accepted
+    Returns (result, provider_name). Raises the last error if neither succeeds.
+
+    The losing call cannot be interrupted mid-request; its result is
+    simply discarded when it arrives.
+    """
+    trackers = trackers or {}
+    pending = {}
+    errors = []
+
+    def launch(name, fn):
+        pending[_executor.submit(_timed, name, fn, trackers)] = name
+
+    launch(*primary)
+    hedged = False
+    deadline = time.perf_counter() + delay
+
+    while pending:
+        timeout = None if hedged else max(0.0, deadline - time.perf_counter())
+        done, _ = concurrent.futures.wait(
+            pending, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+
+        for future in done:
+            name = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[{name} failed: {e}]")
+                errors.append(e)
+                continue
+            if validate(result):
+                for other in pending:
+                    other.cancel()
+                return result, name
+            errors.append(ValueError(f"{name} response invalid"))
+
+        # Timed out waiting, or the primary already failed: start the backup
+        if not hedged and (not done or not pending):
+            hedged = True
+            print(f"[Hedging: starting {secondary[0]}]")
+            launch(*secondary)
+
+    raise errors[-1] if errors else RuntimeError("no provider answered")
+
+
+_END = object()
+
+
+def hedged_stream(primary, secondary, delay):
+    """
+    primary / secondary: (name, zero-argument callable returning an iterator of text)
+    delay: seconds to wait for the primary's first piece before starting the secondary
+    Yields the pieces of whichever stream produces first. Raises the last
+    error if neither produces anything; an error from the winning stream
+    after it has produced is raised to the caller as it happens.
+
+    The losing stream is abandoned: its reader stops at its next piece.
+    """
+    events = queue.Queue()
+    abandoned = set()
+
+    def pump(name, open_stream):
+        stream = None
+        try:
+            stream = iter(open_stream())
+            for piece in stream:
+                if name in abandoned:
+                    break
+                events.put((name, piece, None))
+            else:
+                events.put((name, _END, None))
+        except Exception as e:
+            events.put((name, None, e))
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+    def launch(name, open_stream):
+        running.add(name)
+        _executor.submit(pump, name, open_stream)
+
+    running = set()
+    errors = []
+    winner = None
+    hedged = False
+    deadline = time.perf_counter() + delay
+    launch(*primary)
+    try:
+        while running:
+            timeout = None if hedged or winner else max(0.0, deadline - time.perf_counter())
+            try:
+                name, piece, error = events.get(timeout=timeout)
+            except queue.Empty:  # nothing from the primary within the delay
+                hedged = True
+                print(f"[Hedging: starting {secondary[0]}]")
+                launch(*secondary)
+                continue
+            if winner is not None and name != winner:
+                continue  # the loser's leftovers
+            if error is not None or piece is _END:
+                running.discard(name)
+                if winner is not None:
+                    if error is not None:
+                        raise error
+                    return
+                if error is not None:
+                    print(f"[{name} failed: {error}]")
+                    errors.append(error)
+                else:
+                    errors.append(ValueError(f"{name} stream was empty"))
+                # The primary failed before producing anything: start the backup now
+                if not hedged:
+                    hedged = True
+                    print(f"[Hedging: starting {secondary[0]}]")
+                    launch(*secondary)
+                continue
+            if winner is None:
+                winner = name
+                abandoned.update(running - {name})
+            yield piece
+    finally:
+        abandoned.update(running)
+    raise errors[-1] if errors else RuntimeError("no provider answered")
@@ -0,0 +1,41 @@
+"""
+Shared HTTP client for the backend's web lookups (weather, IP location).
+
+One pooled requests.Session keeps connections alive between calls, so
+repeat requests to the same host skip the TCP/TLS handshake. Timeouts
+and retry policy live here instead of at every call site.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT = 3.0  # seconds
+READ_TIMEOUT = 5.0
+POOL_SIZE = 4
+
+_session = None
+
+
+def session():
+    """The process-wide pooled session, created on first use."""
+    global _session
+    if _session is None:
+        s = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=1)
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        s.headers.update({"User-Agent": "Neura-Assistant"})
+        _session = s
+    return _session
+
+
+def get_json(url, params=None, timeout=None):
+    """GET url and decode the JSON body; raises requests exceptions on failure."""
+    response = session().get(url, params=params, timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT))
+    return response.json()
+
+
+def close():
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
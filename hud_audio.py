@@ -0,0 +1,127 @@
+"""
+Audio analysis for the HUD, off the render thread.
+
+The render loop used to block on stream.read(CHUNK) (~23 ms at 44.1 kHz)
+and then compute the RMS of 1024 samples in a Python loop, every frame.
+LevelMeter runs on its own thread instead: it waits for each chunk from
+the shared capture ring, computes the level on a NumPy view of the
+buffer, and keeps a smoothed amplitude. The render loop just reads
+meter.amplitude, which never waits.
+
+SpectrumAnalyzer runs on the same thread. It turns each chunk into
+BANDS log-spaced band levels (0..1) with one windowed real FFT and one
+matrix-vector product, writing into buffers allocated up front, so the
+per-chunk cost stays flat; the only transient allocation is the FFT's
+own scratch space inside NumPy. The HUD reads
+analyzer.levels (fixed size) for the arcs and the spectrum under the
+voice-level bar, and analyzer.voice (speech bands only) for the pulses.
+"""
+import math
+import threading
+
+import numpy as np
+
+FULL_SCALE_RMS = 3000.0   # RMS shown as a full-scale amplitude of 1.0
+ATTACK = 0.02             # seconds for the level to rise (by 1/e)...
+RELEASE = 0.15            # ...and to fall back
+
+BANDS = 16
+FMIN, FMAX = 80.0, 8000.0     # Hz, band edges are log-spaced in between
+VOICE_HZ = (300.0, 3400.0)    # bands whose centre falls here make up analyzer.voice
+FLOOR_DB, CEIL_DB = -70.0, -20.0   # band energy (dBFS) shown as level 0 and 1
+SPECTRUM_RELEASE = 0.25       # seconds for a band to fall back (rises instantly)
+
+
+class SpectrumAnalyzer:
+    def __init__(self, chunk, rate, bands=BANDS, fmin=FMIN, fmax=FMAX):
+        bins = chunk // 2 + 1
+        self.window = np.hanning(chunk).astype(np.float32)
+        self.windowed = np.empty(chunk, dtype=np.float32)
+        self.spectrum = np.empty(bins, dtype=np.complex64)
+        self.power = np.empty(bins, dtype=np.float32)
+        self.energy = np.empty(bands, dtype=np.float32)
+        self.levels = np.zeros(bands, dtype=np.float32)
+        self.voice = 0.0
+
+        # Each row averages the power of the FFT bins inside one band
+        freqs = np.fft.rfftfreq(chunk, 1.0 / rate)
+        edges = np.geomspace(fmin, fmax, bands + 1)
+        self.weights = np.zeros((bands, bins), dtype=np.float32)
+        for b in range(bands):
+            inside = np.flatnonzero((freqs >= edges[b]) & (freqs < edges[b + 1]))
+            if inside.size == 0:  # narrow low bands: use the nearest bin
+                inside = [int(np.argmin(np.abs(freqs - math.sqrt(edges[b] * edges[b + 1]))))]
+            self.weights[b, inside] = 1.0 / len(inside)
+        centres = np.sqrt(edges[:-1] * edges[1:])
+        voice = np.flatnonzero((centres >= VOICE_HZ[0]) & (centres <= VOICE_HZ[1]))
+        self.voice_weights = np.zeros(bands, dtype=np.float32)
+        self.voice_weights[voice] = 1.0 / len(voice)
+
+        # level = (10 log10(energy / full scale) - FLOOR_DB) / (CEIL_DB - FLOOR_DB), as a*log10(e) - b
+        full_scale = (32768.0 * self.window.sum() / 2) ** 2  # a full-scale sine's peak bin
+        self.scale = 10.0 / (CEIL_DB - FLOOR_DB)
+        self.offset = (10.0 * math.log10(full_scale) + FLOOR_DB) / (CEIL_DB - FLOOR_DB)
+        self.tiny = np.float32(full_scale * 1e-12)
+        self.release = math.exp(-chunk / float(rate) / SPECTRUM_RELEASE)
+
+    def process(self, samples):
+        """Update levels from one chunk (float32 array of 16-bit sample values)."""
+        np.multiply(samples, self.window, out=self.windowed)
+        np.fft.rfft(self.windowed, out=self.spectrum)
+        np.abs(self.spectrum, out=self.power)
+        np.square(self.power, out=self.power)
+        np.dot(self.weights, self.power, out=self.energy)
+        np.add(self.energy, self.tiny, out=self.energy)
+        np.log10(self.energy, out=self.energy)
+        np.multiply(self.energy, self.scale, out=self.energy)
+        np.subtract(self.energy, self.offset, out=self.energy)
+        np.maximum(self.energy, 0.0, out=self.energy)
+        np.minimum(self.energy, 1.0, out=self.energy)
+        # Peak meter: jump up, decay down
+        np.multiply(self.levels, self.release, out=self.levels)
+        np.maximum(self.levels, self.energy, out=self.levels)
+        self.voice = float(np.dot(self.voice_weights, self.levels))
+
+
+class LevelMeter:
+    def __init__(self, reader, chunk, rate, spectrum=None):
+        """
+        reader: a mic_capture.RingReader (anything with a blocking read())
+        spectrum: optional SpectrumAnalyzer, updated with every chunk
+        """
+        self.reader = reader
+        self.spectrum = spectrum
+        self.samples = np.empty(chunk, dtype=np.float32)
+        chunk_seconds = chunk / float(rate)
+        self.attack = math.exp(-chunk_seconds / ATTACK)
+        self.release = math.exp(-chunk_seconds / RELEASE)
+        self.amplitude = 0.0
+        self.closed = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="hud-audio", daemon=True)
+        self.thread.start()
+
+    def level(self, data):
+        """Instantaneous amplitude of one chunk of 16-bit samples, 0..1."""
+        np.copyto(self.samples, np.frombuffer(data, dtype=np.int16))
+        rms = math.sqrt(float(np.dot(self.samples, self.samples)) / self.samples.size)
+        return min(rms / FULL_SCALE_RMS, 1.0)
+
+    def _run(self):
+        while not self.closed.is_set():
+            try:
+                target = self.level(self.reader.read())
+            except OSError:
+                target = 0.0  # capture stopped: let the level fall
+                self.samples.fill(0.0)
+            except TypeError:
+                break  # the ring was closed under us (shutdown, in either order)
+            if self.closed.is_set():
+                break
+            if self.spectrum is not None:
+                self.spectrum.process(self.samples)
+            coeff = self.attack if target > self.amplitude else self.release
+            self.amplitude = target + (self.amplitude - target) * coeff
+
+    def close(self):
+        self.closed.set()
+        self.thread.join(timeout=1.0)
@@ -0,0 +1,184 @@
+"""
+Local intent classifier for near-miss phrasings of built-in commands.
+
+"crank up the sound" or "how hot is it in delhi" contain no command
+keyword, so the intent matcher misses them and they would cost an LLM
+round-trip. This classifier is trained at startup from a phrase file
+(intent<TAB>phrase) and runs before the LLM fallback.
+
+Features are TF-IDF weighted character n-grams taken within words
+(padded with spaces, so "sound" and "sounds" share most grams and typos
+still overlap). The model is linear: each intent is the normalised
+centroid of its training vectors, and a query is scored by cosine
+similarity against every centroid at once through an inverted index.
+Phrases labelled "none" are real LLM questions. They give the classifier
+somewhere to put "what is the capital of france", so it can say
+confidently that a query is not a command. It predicts only when the
+best intent clears both the score threshold and the margin over the
+runner-up.
+
+Opposite commands on one control ("increase the volume" / "decrease the
+volume", "screen is too dark" / "screen is too bright") share nearly all
+their grams, so the direction a query asks for is read from cue words
+instead (cues()) and added as extra features. Intents in POLARITY only
+fire when the query's cues agree with their direction, never when they
+conflict or the query gives a level number, and not when the runner-up
+is the opposite direction of the same control within OPPOSITE_MARGIN: a
+wrong device action is worse than asking the LLM.
+"""
+import collections
+import math
+import re
+
+NONE_LABEL = "none"
+NGRAM_SIZES = (2, 3, 4)
+THRESHOLD = 0.35   # minimum cosine similarity to the winning intent
+MARGIN = 0.08      # over the runner-up (including "none")
+OPPOSITE_MARGIN = 0.15  # over a runner-up that is the opposite direction of the same control
+
+_NON_WORD = re.compile(r"[^a-z0-9' ]+")
+
+UP, DOWN, ON, OFF = "up", "down", "on", "off"
+OPPOSITE = {UP: DOWN, DOWN: UP, ON: OFF, OFF: ON}
+CUE_WORDS = {
+    "up": UP, "increase": UP, "raise": UP, "higher": UP, "louder": UP, "boost": UP,
+    "more": UP, "brighter": UP, "brighten": UP, "max": UP, "maximum": UP,
+    "down": DOWN, "decrease": DOWN, "lower": DOWN, "reduce": DOWN, "quieter": DOWN,
+    "softer": DOWN, "soften": DOWN, "dim": DOWN, "dimmer": DOWN, "darker": DOWN,
+    "less": DOWN, "min": DOWN, "minimum": DOWN,
+    "on": ON, "restore": ON, "again": ON, "unmute": ON, "unpause": ON,
+    "resume": ON, "continue": ON, "keep": ON, "carry": ON,
+    "off": OFF, "silence": OFF, "silent": OFF, "kill": OFF, "mute": OFF, "stop": OFF,
+    "halt": OFF, "hold": OFF, "pause": OFF,
+}
+# "too loud" asks for the opposite of loud
+TOO_WORDS = {"loud": DOWN, "bright": DOWN, "high": DOWN, "quiet": UP, "soft": UP,
+             "low": UP, "dark": UP, "dim": UP, "faint": UP}
+CUE_PHRASES = {"can't hear": UP, "cannot hear": UP, "no sound": OFF}
+CUE_WEIGHT = 3     # counts of a cue feature, so it outweighs the shared n-grams
+
+# intent -> (control, direction); the opposite direction of a control is another intent
+POLARITY = {
+    "volume_up": ("volume", UP), "volume_down": ("volume", DOWN),
+    "brightness_up": ("brightness", UP), "brightness_down": ("brightness", DOWN),
+    "unmute": ("sound", ON), "mute": ("sound", OFF),
+    "media_resume": ("playback", ON), "media_pause": ("playback", OFF),
+}
+
+
+def normalize(text):
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def cues(text):
+    """Directions the query asks for (UP/DOWN/ON/OFF), from cue words and "too <adjective>"."""
+    text = normalize(text)
+    words = text.split()
+    found = {CUE_PHRASES[p] for p in CUE_PHRASES if p in text}
+    for i, word in enumerate(words):
+        if i and words[i - 1] == "too" and word in TOO_WORDS:
+            found.add(TOO_WORDS[word])
+        elif word in CUE_WORDS:
+            found.add(CUE_WORDS[word])
+    return found
+
+
+def ngrams(text):
+    """Character n-grams of each word padded with spaces, plus direction cues, with counts."""
+    grams = collections.Counter()
+    for word in normalize(text).split():
+        padded = f" {word} "
+        for n in NGRAM_SIZES:
+            for i in range(len(padded) - n + 1):
+                grams[padded[i:i + n]] += 1
+    for cue in cues(text):
+        grams[f"<{cue}>"] += CUE_WEIGHT
+    return grams
+
+
+def _unit(vector):
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {k: w / norm for k, w in vector.items()} if norm else {}
+
+
+class Prediction:
+    def __init__(self, name, score, margin):
+        self.name = name
+        self.score = score
+        self.margin = margin
+
+    def __repr__(self):
+        return f"Prediction({self.name!r}, score={self.score:.2f}, margin={self.margin:.2f})"
+
+
+class IntentClassifier:
+    def __init__(self, examples, threshold=THRESHOLD, margin=MARGIN):
+        """examples: iterable of (intent, phrase)"""
+        self.threshold = threshold
+        self.margin = margin
+        examples = [(label, ngrams(phrase)) for label, phrase in examples]
+
+        doc_freq = collections.Counter()
+        for _, grams in examples:
+            doc_freq.update(grams.keys())
+        total = len(examples)
+        self.idf = {g: math.log((1 + total) / (1 + df)) + 1 for g, df in doc_freq.items()}
+
+        sums = collections.defaultdict(collections.Counter)
+        for label, grams in examples:
+            sums[label].update(self._vector(grams))
+        self.labels = sorted(sums)
+        # gram -> [(label, weight), ...]: scoring only touches the query's grams
+        self.index = collections.defaultdict(list)
+        for label in self.labels:
+            for gram, weight in _unit(sums[label]).items():
+                self.index[gram].append((label, weight))
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        examples = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if not line.strip() or line.startswith("#"):
+                    continue
+                label, phrase = line.split("\t", 1)
+                examples.append((label.strip(), phrase.strip()))
+        return cls(examples, **kwargs)
+
+    def _vector(self, grams):
+        return _unit({g: (1 + math.log(c)) * self.idf[g] for g, c in grams.items() if g in self.idf})
+
+    def scores(self, text):
+        """(intent, cosine score) for every intent, best first."""
+        totals = dict.fromkeys(self.labels, 0.0)
+        for gram, weight in self._vector(ngrams(text)).items():
+            for label, class_weight in self.index[gram]:
+                totals[label] += weight * class_weight
+        return sorted(totals.items(), key=lambda item: -item[1])
+
+    def predict(self, text):
+        """Confident command Prediction, or None (not a command, or unsure)."""
+        ranked = self.scores(text)
+        if not ranked:
+            return None
+        if len(ranked) < 2:
+            ranked.append((None, 0.0))
+        (best, score), runner_up = ranked[0], ranked[1][1]
+        if best == NONE_LABEL or score < self.threshold or score - runner_up < self.margin:
+            return None
+        if best in POLARITY and not self._direction_agrees(text, ranked):
+            return None
+        return Prediction(best, score, score - runner_up)
+
+    @staticmethod
+    def _direction_agrees(text, ranked):
+        """A POLARITY intent fires only if the query asks for its direction, clearly."""
+        (best, score), (second, runner_up) = ranked[0], ranked[1]
+        control, direction = POLARITY[best]
+        if POLARITY.get(second) == (control, OPPOSITE[direction]) and score - runner_up < OPPOSITE_MARGIN:
+            return False  # torn between the two directions of one control
+        if any(c.isdigit() for c in text):
+            return False  # "dim the screen to 20" sets a level; the step intents would ignore it
+        found = cues(text)
+        return direction in found and OPPOSITE[direction] not in found
@@ -0,0 +1,165 @@
+"""
+Declarative intent registry compiled into one matcher.
+
+Each intent lists trigger phrases and optional slot patterns. All phrases
+of a registry are compiled into one word-level trie, so a single pass over
+the words of a query finds every trigger at every position (Aho-Corasick
+style), however many intents are registered. Matching whole words means
+"time" no longer fires on "sometimes", "open" on "openai" or "mute" on
+"unmute". Candidates are ranked by priority (registry order, mirroring the
+old elif chain), then by phrase length in words, then by position. Slots
+are extracted for the winner only.
+"""
+import re
+
+WORD = re.compile(r"[a-z0-9']+")
+
+
+class Intent:
+    def __init__(self, name, phrases, slots=None):
+        """
+        phrases: trigger phrases, matched as whole words
+        slots: name -> pattern or list of patterns tried in order; the slot
+               value is group 1 of the first pattern that matches, stripped
+        """
+        self.name = name
+        self.phrases = list(phrases)
+        self.slots = {
+            slot: [re.compile(p) for p in (patterns if isinstance(patterns, list) else [patterns])]
+            for slot, patterns in (slots or {}).items()
+        }
+
+    def extract(self, query):
+        values = {}
+        for slot, patterns in self.slots.items():
+            for pattern in patterns:
+                m = pattern.search(query)
+                if m and m.group(1) and m.group(1).strip():
+                    values[slot] = m.group(1).strip()
+                    break
+        return values
+
+
+class IntentMatch:
+    def __init__(self, intent, phrase, start, length, priority):
+        self.intent = intent
+        self.name = intent.name
+        self.phrase = phrase
+        self.start = start      # word index
+        self.length = length    # in words
+        self.priority = priority
+        self.slots = {}
+
+    def rank_key(self):
+        return (self.priority, -self.length, self.start)
+
+    def __repr__(self):
+        return f"IntentMatch({self.name!r}, {self.phrase!r}, slots={self.slots!r})"
+
+
+class IntentMatcher:
+    def __init__(self, intents):
+        self.intents = list(intents)
+        self.by_name = {intent.name: intent for intent in self.intents}
+        self.trie = {}  # word -> [children, [(priority, intent, phrase), ...]]
+        for priority, intent in enumerate(self.intents):
+            for phrase in intent.phrases:
+                node = None
+                level = self.trie
+                for word in WORD.findall(phrase.lower()):
+                    node = level.setdefault(word, [{}, []])
+                    level = node[0]
+                node[1].append((priority, intent, phrase))
+
+    def candidates(self, query):
+        """Best match per intent, ranked best first (slots not extracted)."""
+        words = WORD.findall(query.lower())
+        best = {}
+        for i, word in enumerate(words):
+            node = self.trie.get(word)
+            j = i
+            while node is not None:
+                for priority, intent, phrase in node[1]:
+                    found = IntentMatch(intent, phrase, i, j - i + 1, priority)
+                    current = best.get(intent.name)
+                    if current is None or found.rank_key() < current.rank_key():
+                        best[intent.name] = found
+                j += 1
+                node = node[0].get(words[j]) if j < len(words) else None
+        return sorted(best.values(), key=IntentMatch.rank_key)
+
+    def match(self, query):
+        """The winning intent with its slots filled in, or None."""
+        ranked = self.candidates(query)
+        if not ranked:
+            return None
+        winner = ranked[0]
+        winner.slots = winner.intent.extract(query.lower())
+        return winner
+
+    def slots_for(self, name, query):
+        """Slots of a named intent chosen some other way (e.g. the classifier)."""
+        return self.by_name[name].extract(query.lower())
+
+
+# ---------- REGISTRIES ----------
+LEVEL = r"(\d+)"
+
+# Commands handled by the main loop, strongest first
+COMMANDS = IntentMatcher([
+    Intent("exit", ["good bye", "goodbye", "bye", "exit", "quit", "good night"]),
+    Intent("wikipedia", ["wikipedia"], {"topic": [
+        r"\bwikipedia\b\s+(?:for |about |on )?(.+)",
+        r"(.+?)\s+(?:on |from |in )?wikipedia\b",
+    ]}),
+    Intent("about", ["about"], {"topic": r"\babout\b\s+(.+)"}),
+    Intent("who_is", ["who is"], {"topic": r"\bwho is\b\s+(.+)"}),
+    Intent("search", ["search", "find"], {"query": r"\b(?:search|find)\b\s+(?:for\s+)?(.+)"}),
+    Intent("weather", ["weather"], {"city": [
+        r"\bweather\b(?:\s+(?:in|of|at|for))?\s+(.+)",
+        r"\b(?:in|at|for)\s+([a-z][a-z .'-]*?)(?:\s+(?:today|tomorrow|now|right now|tonight))?$",
+    ]}),
+    Intent("open", ["open"], {"app": r"\bopen\b\s+(.+)"}),
+    Intent("media_pause", ["pause music", "pause song"]),
+    Intent("media_resume", ["resume music", "play music"]),
+    Intent("media_next", ["next song", "next track"]),
+    Intent("media_previous", ["previous song", "previous track"]),
+    Intent("media_status", ["what is playing", "what's playing"]),
+    Intent("song", ["song", "songs"], {"song": r"(?:\bplay\s+)?(?:the\s+)?(?:\bsong\s+)?(.+)"}),
+    Intent("music", ["music"]),
+    Intent("time", ["time"]),
+    Intent("close", ["close"], {"app": r"\bclose\b\s+(.+)"}),
+    Intent("allow_screen", ["allow screen access"]),
+    Intent("stop_screen", ["stop screen access", "disable screen access"]),
+    Intent("camera", ["camera"]),
+    Intent("picture", ["picture"]),
+    Intent("pictures", ["pictures"]),
+    Intent("volume_up", ["volume up"]),
+    Intent("volume_down", ["volume down"]),
+    Intent("mute", ["mute volume", "mute"]),
+    Intent("unmute", ["unmute volume", "unmute"]),
+    Intent("volume", ["volume"], {"level": LEVEL}),
+    Intent("brightness_up", ["brightness up", "increase brightness"]),
+    Intent("brightness_down", ["brightness down", "decrease brightness"]),
+    Intent("brightness", ["brightness"], {"level": LEVEL}),
+    Intent("take_note", ["take a note", "write a note"]),
+    Intent("read_note", ["note", "notes"]),
+    Intent("reminder", ["reminder", "reminders"]),
+    Intent("joke", ["joke", "jokes"]),
+    Intent("provider_status", ["provider status", "ai status"]),
+    Intent("clear_memory", ["clear memory", "reset memory"]),
+])
+
+# Conversation handled locally by ask_neura before falling back to the LLM
+CONVERSATION = IntentMatcher([
+    Intent("how_are_you", ["how are you", "how do you do"]),
+    Intent("greeting", ["hello", "hi"]),
+    Intent("who_are_you", ["who are you"]),
+    Intent("capabilities", ["what can you do"]),
+    Intent("name", ["your name"]),
+    Intent("creator", ["rohit adak"]),
+    Intent("thanks", ["thank you", "thanks"]),
+    Intent("recall", ["what did i ask"], {"day": r"\b(yesterday|today)\b"}),
+    Intent("time", ["time"]),
+    Intent("preference", ["i like", "i prefer"], {"thing": r"\bi (?:like|prefer)\b\s+(.+)"}),
+])
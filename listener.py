@@ -0,0 +1,176 @@
+"""
+Always-on microphone capture with VAD endpointing.
+
+Listener opens the microphone once and keeps a capture thread reading
+it for the rest of the session, including while the assistant is
+thinking, so nothing said between commands is lost. Each chunk goes
+into a ring buffer with a sequence number and through a vad.Endpointer.
+When the endpointer sees the end of speech, the utterance (plus a little
+pre-roll) is sliced out of the ring and queued for listen(). That way
+recognition starts END_SILENCE after the user stops talking, not
+whenever speech_recognition's own listen() would have decided.
+
+The energy threshold is calibrated once per device: the value is saved
+in CALIBRATION_FILE and reused while it is younger than
+CALIBRATION_MAX_AGE. After that the endpointer adapts it on every
+non-speech frame, and the adapted value is saved again on exit.
+"""
+import atexit
+import collections
+import itertools
+import json
+import math
+import queue
+import threading
+import time
+
+import speech_recognition as sr
+
+import vad
+
+CALIBRATION_FILE = "neura_mic_calibration.json"
+CALIBRATION_MAX_AGE = 7 * 24 * 3600  # seconds
+CALIBRATION_SECONDS = 1.0
+RING_SECONDS = vad.MAX_PHRASE + vad.PRE_ROLL + 1.0
+
+
+class Listener:
+    def __init__(self, device_index=None, calibration_file=CALIBRATION_FILE, make_source=None,
+                 ignore_while=None):
+        """
+        make_source: callable returning an unopened sr.AudioSource (default: the microphone)
+        ignore_while: callable; speech that starts while it returns True is dropped
+        """
+        self.device_index = device_index
+        self.calibration_file = calibration_file
+        self.make_source = make_source or (lambda: sr.Microphone(device_index=device_index))
+        self.ignore_while = ignore_while
+        self.recognizer = sr.Recognizer()
+        self.mic = None
+        self.source = None
+        self.endpointer = None
+        self.ring = None
+        self.seq = itertools.count()
+        self.utterances = queue.Queue()   # (AudioData, monotonic time speech ended)
+        self.dropping = False
+        self.latency = None               # end of speech -> handed to recognition, last utterance
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+        self.capture = None
+        self.calibrated_from_cache = False
+        atexit.register(self.close)
+
+    # ---------- CALIBRATION ----------
+    def device_key(self):
+        return str(self.device_index)
+
+    def _load_calibration(self):
+        try:
+            with open(self.calibration_file, "r", encoding="utf-8") as f:
+                entry = json.load(f).get(self.device_key())
+        except (OSError, ValueError):
+            return None
+        if entry and time.time() - entry.get("saved", 0) < CALIBRATION_MAX_AGE:
+            return entry.get("energy_threshold")
+        return None
+
+    def save_calibration(self):
+        try:
+            with open(self.calibration_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data[self.device_key()] = {"energy_threshold": self.endpointer.threshold, "saved": time.time()}
+        try:
+            with open(self.calibration_file, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError as e:
+            print("Mic calibration save error:", e)
+
+    # ---------- SESSION ----------
+    def open(self):
+        """Open the microphone, calibrate (from the cache when possible) and start capturing. Idempotent."""
+        with self.lock:
+            if self.source is None:
+                self._open()
+
+    def _open(self):
+        self.mic = self.make_source()
+        self.source = self.mic.__enter__()
+        threshold = self._load_calibration()
+        if threshold:
+            self.calibrated_from_cache = True
+        else:
+            print("Calibrating microphone...")
+            self.recognizer.adjust_for_ambient_noise(self.source, duration=CALIBRATION_SECONDS)
+            threshold = self.recognizer.energy_threshold
+        self.endpointer = vad.Endpointer(self.source.SAMPLE_RATE, self.source.SAMPLE_WIDTH,
+                                         self.source.CHUNK, threshold=threshold)
+        if not self.calibrated_from_cache:
+            self.save_calibration()
+        self.ring = collections.deque(maxlen=math.ceil(RING_SECONDS / self.endpointer.frame_seconds))
+        self.capture = threading.Thread(target=self._capture_loop, name="neura-mic", daemon=True)
+        self.capture.start()
+
+    def _capture_loop(self):
+        """Read the device forever; hand finished utterances to listen()."""
+        while not self.closed.is_set():
+            try:
+                buffer = self.source.stream.read(self.source.CHUNK)
+            except Exception as e:
+                print("Mic read error:", e)
+                time.sleep(0.5)
+                continue
+            seq = next(self.seq)
+            self.ring.append((seq, time.monotonic(), buffer))
+            event = self.endpointer.feed(seq, buffer)
+            if event is None:
+                continue
+            kind, start, last_voiced = event
+            if kind == vad.START:
+                self.dropping = bool(self.ignore_while and self.ignore_while())
+            elif not self.dropping:
+                self._queue_utterance(start, last_voiced, seq)
+
+    def _queue_utterance(self, start, last_voiced, end):
+        first = start - self.endpointer.pre_roll_frames
+        frames, ended_at = [], None
+        for seq, captured_at, buffer in self.ring:
+            if first <= seq <= end:
+                frames.append(buffer)
+            if seq == last_voiced:
+                ended_at = captured_at
+        audio = sr.AudioData(b"".join(frames), self.source.SAMPLE_RATE, self.source.SAMPLE_WIDTH)
+        self.utterances.put((audio, ended_at or time.monotonic()))
+
+    def listen(self, timeout=None):
+        """
+        Next utterance as sr.AudioData, oldest first. Raises sr.WaitTimeoutError
+        if nobody starts speaking within timeout seconds.
+        """
+        self.open()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                audio, ended_at = self.utterances.get(timeout=wait)
+            except queue.Empty:
+                if self.endpointer.in_speech:
+                    deadline = time.monotonic() + 0.1  # still talking: wait for the end
+                    continue
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            self.latency = time.monotonic() - ended_at
+            return audio
+
+    def close(self):
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        with self.lock:
+            if self.source is None:
+                return
+            if self.capture is not None:
+                self.capture.join(timeout=1.0)
+            self.save_calibration()
+            self.mic.__exit__(None, None, None)
+            self.source = None
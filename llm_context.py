@@ -0,0 +1,74 @@
+"""
+Token-budgeted context window for chat_with_ai.
+
+Instead of sending the whole llm_history with every request, pick the most
+recent messages that fit a per-provider token budget, after reserving
+room for pinned items (saved preferences) and the new prompt.
+"""
+import functools
+import os
+
+# Budgets leave room for the instruction, the prompt and the reply.
+# llama3-70b-8192 rejects anything past 8192 tokens in total.
+PROVIDER_TOKEN_BUDGETS = {
+    "gemini": int(os.getenv("NEURA_GEMINI_CONTEXT_TOKENS", "8000")),
+    "groq": int(os.getenv("NEURA_GROQ_CONTEXT_TOKENS", "5000")),
+}
+DEFAULT_TOKEN_BUDGET = 4000
+
+# Never pull more than this many messages from the store to build a window
+CONTEXT_FETCH_LIMIT = int(os.getenv("NEURA_CONTEXT_FETCH_LIMIT", "200"))
+
+PER_MESSAGE_OVERHEAD = 4  # role markers and separators
+
+
+@functools.lru_cache(maxsize=4096)
+def count_tokens(text):
+    """
+    Cheap token estimate (about 4 characters per token for English), cached
+    per message text so history is never re-counted on later turns.
+    """
+    if not text:
+        return PER_MESSAGE_OVERHEAD
+    return PER_MESSAGE_OVERHEAD + (len(text) + 3) // 4
+
+
+def budget_for(provider):
+    return PROVIDER_TOKEN_BUDGETS.get(provider, DEFAULT_TOKEN_BUDGET)
+
+
+def select_recent(pairs, budget, pinned=(), reserve=0):
+    """
+    pairs: oldest-first list of (role, content)
+    pinned: (role, content) items that are always kept, placed first
+    reserve: tokens to keep free (the prompt being sent)
+    Returns pinned + the newest pairs that fit, in chronological order.
+    """
+    remaining = budget - reserve - sum(count_tokens(content) for _, content in pinned)
+
+    kept = []
+    for role, content in reversed(pairs):
+        cost = count_tokens(content)
+        if cost > remaining:
+            break
+        remaining -= cost
+        kept.append((role, content))
+    kept.reverse()
+
+    # Don't open the window on a dangling assistant reply
+    while kept and kept[0][0] != "user":
+        kept.pop(0)
+
+    return list(pinned) + kept
+
+
+def preferences_note(preferences):
+    """Pinned context line describing saved preferences, or None if there are none."""
+    if not preferences:
+        return None
+    parts = []
+    for key, value in preferences.items():
+        if isinstance(value, list):
+            value = ", ".join(str(v) for v in value)
+        parts.append(f"{key.replace('_', ' ')}: {value}")
+    return "For context, my saved preferences are - " + "; ".join(parts)
@@ -0,0 +1,95 @@
+"""
+Small TTL + LRU cache with optional JSON persistence.
+
+Used for lookups whose answers repeat (Wikipedia summaries, LLM replies,
+weather). A value of None is a negative entry: "we asked, there was
+nothing", which is cached too so known misses don't go back to the network.
+"""
+import atexit
+import collections
+import json
+import os
+import threading
+import time
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, path=None, max_entries=1000, default_ttl=3600.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.entries = collections.OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    def get(self, key, default=_MISSING):
+        """
+        Return the cached value (None for a negative entry), or `default`
+        if the key is absent or expired. Without a default, absent keys
+        raise KeyError so None can still mean "known miss".
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > time.time():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self.entries[key]
+            self.misses += 1
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def put(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self.lock:
+            self.entries[key] = (time.time() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    # ---------- PERSISTENCE ----------
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[Cache load error {self.path}]: {e}")
+            return
+        now = time.time()
+        for key, expires_at, value in data.get("entries", []):
+            if expires_at > now:
+                self.entries[key] = (expires_at, value)
+
+    def save(self):
+        """Write live entries to disk (temp file + rename, so a crash keeps the old file)."""
+        with self.lock:
+            now = time.time()
+            entries = [[k, exp, v] for k, (exp, v) in self.entries.items() if exp > now]
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[Cache save error {self.path}]: {e}")
@@ -0,0 +1,101 @@
+"""
+Compressed, append-only archive segments for old memory records.
+
+Records that age out of the live store are appended to one gzip'd JSON
+Lines segment per month (neura_archive/2026-09.jsonl.gz). Each append is
+a new gzip member, so a segment is never rewritten. Segments are only
+opened when a query's date range covers them, never at startup.
+"""
+import gzip
+import json
+import os
+
+ARCHIVE_DIR = "neura_archive"
+SEGMENT_SUFFIX = ".jsonl.gz"
+UNDATED = "undated"  # migrated LLM messages carry no timestamp
+
+
+def month_of(timestamp):
+    return timestamp[:7] if timestamp else UNDATED
+
+
+def record_key(record):
+    """Identity of an archived record, for spotting one that was appended twice."""
+    return json.dumps(record, sort_keys=True, ensure_ascii=False)
+
+
+class MemoryArchive:
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+
+    def segment_path(self, month):
+        return os.path.join(self.directory, month + SEGMENT_SUFFIX)
+
+    def months(self):
+        """Month keys that have a segment on disk, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name[:-len(SEGMENT_SUFFIX)]
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX)
+        )
+
+    def append(self, section, records, ts_field):
+        """Append records of one memory section to their monthly segments."""
+        by_month = {}
+        for record in records:
+            by_month.setdefault(month_of(record.get(ts_field)), []).append(record)
+
+        os.makedirs(self.directory, exist_ok=True)
+        for month, batch in by_month.items():
+            lines = "".join(
+                json.dumps({"section": section, **record}, ensure_ascii=False) + "\n"
+                for record in batch
+            )
+            with open(self.segment_path(month), "ab") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+                    gz.write(lines.encode("utf-8"))
+                raw.flush()
+                os.fsync(raw.fileno())
+
+    def keys(self, section, months):
+        """record_key() of every archived record of one section in the given months."""
+        found = set()
+        for month in set(months) & set(self.months()):
+            with gzip.open(self.segment_path(month), "rt", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record.pop("section", None) == section:
+                        found.add(record_key(record))
+        return found
+
+    def clear(self):
+        """Delete every segment."""
+        for month in self.months():
+            os.remove(self.segment_path(month))
+
+    def query(self, section, ts_field, start=None, end=None):
+        """
+        Archived records of one section with start <= timestamp < end,
+        reading only the segments whose month falls in that range.
+        """
+        results = []
+        for month in self.months():
+            if month == UNDATED:
+                if start is not None:
+                    continue
+            elif (start and month < start[:7]) or (end and month > end[:7]):
+                continue
+            with gzip.open(self.segment_path(month), "rt", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record.pop("section", None) != section:
+                        continue
+                    ts = record.get(ts_field)
+                    if start and (not ts or ts < start):
+                        continue
+                    if end and ts and ts >= end:
+                        continue
+                    results.append(record)
+        return results
@@ -0,0 +1,390 @@
+"""
+SQLite-backed memory for Neura.
+
+Every interaction, activity and LLM message is one row, so recording an
+event is a single INSERT instead of rewriting the whole memory document.
+Preferences are a small key/value table kept in RAM as well.
+
+Writes are write-behind: they are queued in RAM and a background flusher
+commits everything queued within FLUSH_INTERVAL as one transaction. The
+main loop also flushes at the end of every turn, and close() (registered
+with atexit) flushes on shutdown.
+
+Startup reads only the preferences and a small summary header (history
+length and last interaction) kept in the meta table. History sections are
+never loaded up front; they are queried when first needed.
+
+Only a hot window of history stays in the database. roll_over() moves
+older records into compressed monthly segments (see memory_archive), and
+range queries reach into those segments only when the range needs them.
+"""
+import atexit
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from memory_archive import ARCHIVE_DIR, MemoryArchive, month_of, record_key
+
+MEMORY_DB = "neura_memory.db"
+FLUSH_INTERVAL = float(os.getenv("NEURA_MEMORY_FLUSH_INTERVAL", "2.0"))  # seconds
+
+# Retention: anything older than HOT_DAYS, or beyond the newest HOT_ROWS
+# of a section, is rolled into the archive
+HOT_DAYS = int(os.getenv("NEURA_MEMORY_HOT_DAYS", "30"))
+HOT_ROWS = int(os.getenv("NEURA_MEMORY_HOT_ROWS", "5000"))
+
+# History tables and their timestamp column
+HISTORY_SECTIONS = {
+    "interaction_history": "timestamp",
+    "activity_log": "time",
+    "llm_history": "timestamp",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS preferences (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS interaction_history (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT,
+    user TEXT,
+    neura TEXT
+);
+CREATE TABLE IF NOT EXISTS activity_log (
+    id INTEGER PRIMARY KEY,
+    time TEXT,
+    action TEXT
+);
+CREATE TABLE IF NOT EXISTS llm_history (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT,
+    role TEXT,
+    content TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_interaction_ts ON interaction_history(timestamp);
+CREATE INDEX IF NOT EXISTS idx_activity_time ON activity_log(time);
+CREATE INDEX IF NOT EXISTS idx_llm_ts ON llm_history(timestamp);
+CREATE INDEX IF NOT EXISTS idx_llm_role ON llm_history(role);
+"""
+
+
+def now_stamp():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def day_range(day):
+    """Return [start, end) timestamp strings covering one calendar day."""
+    start = datetime.datetime.combine(day, datetime.time())
+    end = start + datetime.timedelta(days=1)
+    return start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class MemoryStore:
+    def __init__(self, path=MEMORY_DB, legacy_json=None, flush_interval=FLUSH_INTERVAL,
+                 hot_days=HOT_DAYS, hot_rows=HOT_ROWS):
+        self.path = path
+        self.hot_days = hot_days
+        self.hot_rows = hot_rows
+        self.archive = MemoryArchive(os.path.join(os.path.dirname(os.path.abspath(path)), ARCHIVE_DIR))
+        self.lock = threading.Lock()
+        # The reminder thread, the flusher and the main loop all touch the connection
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock:
+            # WAL keeps a crash mid-commit from touching already committed data
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+            self.conn.commit()
+
+        self.pending = []
+        self.flushes = 0  # committed write transactions, for diagnostics
+        self.closed = False
+        self.flush_interval = flush_interval
+        self.dirty = threading.Event()
+        self.flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
+
+        if legacy_json:
+            self.migrate_json(legacy_json)
+
+        with self.lock:
+            self.preferences = {
+                row["key"]: json.loads(row["value"])
+                for row in self.conn.execute("SELECT key, value FROM preferences")
+            }
+        self.summary = self._load_summary()
+
+    # ---------- SUMMARY HEADER ----------
+    def _load_summary(self):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'summary'").fetchone()
+            if row:
+                return json.loads(row["value"])
+
+            # First start on this database: build the header once
+            count = self.conn.execute("SELECT COUNT(*) FROM interaction_history").fetchone()[0]
+            last = self.conn.execute(
+                "SELECT timestamp, user, neura FROM interaction_history ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            summary = {"interaction_count": count, "last_interaction": dict(last) if last else None}
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta(key, value) VALUES ('summary', ?)",
+                    (json.dumps(summary, ensure_ascii=False),)
+                )
+            return summary
+
+    # ---------- MIGRATION ----------
+    def migrate_json(self, json_path):
+        """One-time import of the old neura_memory.json document."""
+        if not os.path.exists(json_path):
+            return
+        with self.lock:
+            done = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_from'"
+            ).fetchone()
+        if done:
+            return
+
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[Memory migration skipped]: {e}")
+            return
+
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO preferences(key, value) VALUES (?, ?)",
+                [(k, json.dumps(v, ensure_ascii=False)) for k, v in data.get("preferences", {}).items()]
+            )
+            self.conn.executemany(
+                "INSERT INTO interaction_history(timestamp, user, neura) VALUES (?, ?, ?)",
+                [(i.get("timestamp"), i.get("user"), i.get("neura")) for i in data.get("interaction_history", [])]
+            )
+            self.conn.executemany(
+                "INSERT INTO activity_log(time, action) VALUES (?, ?)",
+                [(a.get("time"), a.get("action")) for a in data.get("activity_log", [])]
+            )
+            # Old LLM messages carried no timestamp
+            self.conn.executemany(
+                "INSERT INTO llm_history(timestamp, role, content) VALUES (NULL, ?, ?)",
+                [(m.get("role", "user"), m.get("content", "")) for m in data.get("llm_history", [])]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('migrated_from', ?)",
+                (os.path.abspath(json_path),)
+            )
+            # Rebuilt from the imported rows on next load
+            self.conn.execute("DELETE FROM meta WHERE key = 'summary'")
+        print(f"🔁 Migrated memory from {json_path} to {self.path}")
+
+    # ---------- WRITE-BEHIND ----------
+    def _execute(self, sql, params=()):
+        """Queue a write; it reaches disk on the next flush."""
+        with self.lock:
+            self.pending.append((sql, params))
+        self.dirty.set()
+
+    def flush(self):
+        """Commit every queued write in one transaction. Returns True if anything was written."""
+        with self.lock:
+            if not self.pending or self.closed:
+                return False
+            batch, self.pending = self.pending, []
+            try:
+                with self.conn:
+                    for sql, params in batch:
+                        self.conn.execute(sql, params)
+            except sqlite3.Error as e:
+                # The transaction rolled back as a whole; retry the batch next time
+                print(f"[Memory save error]: {e}")
+                self.pending[:0] = batch
+                return False
+            self.flushes += 1
+            return True
+
+    def _flush_loop(self):
+        while not self.closed:
+            self.dirty.wait()
+            # Let the rest of the turn's writes pile up, then commit them together
+            time.sleep(self.flush_interval)
+            self.dirty.clear()
+            self.flush()
+
+    # ---------- WRITES ----------
+    def set_preference(self, key, value):
+        self.preferences[key] = value
+        self._execute(
+            "INSERT OR REPLACE INTO preferences(key, value) VALUES (?, ?)",
+            (key, json.dumps(value, ensure_ascii=False))
+        )
+
+    def add_interaction(self, user_input, neura_response):
+        record = {"timestamp": now_stamp(), "user": user_input, "neura": neura_response}
+        with self.lock:
+            self.summary["interaction_count"] += 1
+            self.summary["last_interaction"] = record
+            summary_json = json.dumps(self.summary, ensure_ascii=False)
+        self._execute(
+            "INSERT INTO interaction_history(timestamp, user, neura) VALUES (?, ?, ?)",
+            (record["timestamp"], user_input, neura_response)
+        )
+        self._execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('summary', ?)", (summary_json,))
+
+    def add_activity(self, action):
+        self._execute("INSERT INTO activity_log(time, action) VALUES (?, ?)", (now_stamp(), action))
+
+    def add_llm_message(self, role, content):
+        self._execute(
+            "INSERT INTO llm_history(timestamp, role, content) VALUES (?, ?, ?)",
+            (now_stamp(), role, content)
+        )
+
+    def clear(self):
+        """Forget everything, archived history included."""
+        self.preferences.clear()
+        with self.lock:
+            with self.conn:
+                self.pending.clear()
+                self.summary = {"interaction_count": 0, "last_interaction": None}
+                for table in ("preferences", "interaction_history", "activity_log", "llm_history"):
+                    self.conn.execute(f"DELETE FROM {table}")
+                self.conn.execute("DELETE FROM meta WHERE key LIKE 'archiving_through:%'")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta(key, value) VALUES ('summary', ?)",
+                    (json.dumps(self.summary),)
+                )
+            try:
+                self.archive.clear()
+            except OSError as e:
+                print(f"[Memory archive error]: {e}")
+
+    # ---------- RETENTION ----------
+    def hot_cutoff(self):
+        cutoff = datetime.datetime.now() - datetime.timedelta(days=self.hot_days)
+        return cutoff.strftime("%Y-%m-%d %H:%M:%S")
+
+    def roll_over(self):
+        """Move history outside the hot window into archive segments. Returns rows moved."""
+        self.flush()
+        cutoff = self.hot_cutoff()
+        moved = 0
+        for table, ts_field in HISTORY_SECTIONS.items():
+            with self.lock:
+                if self.closed:
+                    break
+                rows = [dict(row) for row in self.conn.execute(
+                    f"SELECT * FROM {table} WHERE {ts_field} < ? OR id <= "
+                    f"(SELECT id FROM {table} ORDER BY id DESC LIMIT 1 OFFSET ?) ORDER BY id",
+                    (cutoff, self.hot_rows)
+                )]
+                if not rows:
+                    continue
+                records = [{k: v for k, v in r.items() if k != "id"} for r in rows]
+                # Rows up to this id may already be in the archive: an earlier roll-over
+                # stopped after appending them but before its DELETE
+                marker = f"archiving_through:{table}"
+                row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (marker,)).fetchone()
+                through = int(row["value"]) if row else 0
+                if through:
+                    try:
+                        present = self.archive.keys(table, {month_of(r.get(ts_field)) for r in records})
+                    except OSError as e:
+                        print(f"[Memory archive error]: {e}")
+                        break
+                    records = [rec for r, rec in zip(rows, records)
+                               if r["id"] > through or record_key(rec) not in present]
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+                        (marker, str(max(through, rows[-1]["id"])))
+                    )
+                try:
+                    # Segments are fsync'd before the rows leave the database
+                    self.archive.append(table, records, ts_field)
+                except OSError as e:
+                    print(f"[Memory archive error]: {e}")
+                    break
+                with self.conn:
+                    self.conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(r["id"],) for r in rows])
+                    self.conn.execute("DELETE FROM meta WHERE key = ?", (marker,))
+                moved += len(rows)
+        if moved:
+            print(f"🗄️  Archived {moved} old memory records to {self.archive.directory}")
+        return moved
+
+    def _with_archive(self, table, start, end, live_rows):
+        """
+        Prepend archived rows when the range starts at or before the oldest
+        live row (rows are archived oldest first, by age or by HOT_ROWS).
+        """
+        ts_field = HISTORY_SECTIONS[table]
+        with self.lock:
+            oldest = self.conn.execute(f"SELECT MIN({ts_field}) FROM {table}").fetchone()[0]
+        if oldest is not None and start > oldest:
+            return live_rows
+        archived = self.archive.query(table, ts_field, start, end)
+        return archived + live_rows
+
+    # ---------- QUERIES ----------
+    def _query(self, sql, params=()):
+        self.flush()  # read your own queued writes
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def llm_history(self, limit=None):
+        """Oldest-first list of {"role", "content"}; the last `limit` messages if given."""
+        if limit is None:
+            return self._query("SELECT role, content FROM llm_history ORDER BY id")
+        rows = self._query("SELECT role, content FROM llm_history ORDER BY id DESC LIMIT ?", (limit,))
+        return rows[::-1]
+
+    def interactions_between(self, start, end, limit=None):
+        """Interactions with start <= timestamp < end (strings as 'YYYY-MM-DD HH:MM:SS')."""
+        rows = self._query(
+            "SELECT timestamp, user, neura FROM interaction_history "
+            "WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+            (start, end)
+        )
+        rows = self._with_archive("interaction_history", start, end, rows)
+        return rows if limit is None else rows[:limit]
+
+    def activities_between(self, start, end):
+        rows = self._query(
+            "SELECT time, action FROM activity_log WHERE time >= ? AND time < ? ORDER BY time",
+            (start, end)
+        )
+        return self._with_archive("activity_log", start, end, rows)
+
+    def llm_messages_by_role(self, role, limit=50):
+        return self._query(
+            "SELECT timestamp, role, content FROM llm_history WHERE role = ? ORDER BY id DESC LIMIT ?",
+            (role, limit)
+        )
+
+    def interaction_count(self):
+        """Total interactions ever recorded, archived ones included (from the header)."""
+        return self.summary["interaction_count"]
+
+    def last_interaction(self):
+        return self.summary["last_interaction"]
+
+    def close(self):
+        """Flush whatever is queued and close the database; safe to call twice."""
+        if self.closed:
+            return
+        self.flush()
+        with self.lock:
+            self.closed = True
+            self.conn.close()
+        self.dirty.set()
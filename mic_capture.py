@@ -0,0 +1,256 @@
+"""
+One microphone capture shared by the HUD and the backend.
+
+The frontend used to open its own PyAudio stream for the HUD amplitude
+while the backend opened sr.Microphone: two handles on one device, two
+copies of every sample, and on some drivers the two fight over the
+device. Now CaptureService (in the frontend process) is the only reader
+of the device. It publishes each chunk into a shared-memory ring and
+every consumer subscribes with a RingReader.
+
+Ring layout (multiprocessing.shared_memory):
+
+  header  magic, sample rate, sample width, chunk samples, slots,
+          time of the last publish, write_seq
+  slots   [seq, chunk bytes] x slots; chunk n lives in slot n % slots
+
+The writer marks a slot empty, copies the chunk in, stamps the slot
+with its sequence number and only then bumps write_seq. A reader checks
+the slot's stamp before and after copying, so a chunk overwritten
+mid-copy is detected rather than returned torn. A reader that falls more
+than a ring behind skips ahead and counts what it dropped. A reader that
+is caught up sleeps until the next chunk is due (the last publish time
+plus one chunk), so waiting costs about one wake-up per chunk.
+
+The backend is handed the ring's name in RING_ENV (as chat_bridge does
+for its channel) and records from RingSource instead of sr.Microphone.
+"""
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+import speech_recognition as sr
+
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+RING_ENV = "NEURA_MIC_RING"   # set by the frontend on the backend's environment
+
+RATE = 44100
+CHUNK = 1024
+SAMPLE_WIDTH = 2
+SLOTS = 128                   # ~3 s at 44.1 kHz / 1024
+READ_TIMEOUT = 2.0            # no new chunk for this long: capture has stopped
+
+MAGIC = b"NEURAMIC"
+HEADER = struct.Struct("<8sIIIIdQ")
+SEQ = struct.Struct("<Q")
+STAMP = struct.Struct("<d")
+WRITE_SEQ_OFFSET = HEADER.size - SEQ.size
+STAMP_OFFSET = WRITE_SEQ_OFFSET - STAMP.size
+EMPTY = 2 ** 64 - 1
+
+
+def _attach(name):
+    """Open an existing segment without letting this process's resource tracker unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+
+class MicRing:
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.buf = shm.buf
+        magic, self.rate, self.width, self.chunk, self.slots, _, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{shm.name} is not a microphone ring")
+        self.frame_bytes = self.chunk * self.width
+        self.chunk_seconds = self.chunk / float(self.rate)
+        self.slot_bytes = SEQ.size + self.frame_bytes
+
+    @classmethod
+    def create(cls, rate=RATE, width=SAMPLE_WIDTH, chunk=CHUNK, slots=SLOTS):
+        shm = shared_memory.SharedMemory(create=True, size=HEADER.size + slots * (SEQ.size + chunk * width))
+        HEADER.pack_into(shm.buf, 0, MAGIC, rate, width, chunk, slots, 0.0, 0)
+        for i in range(slots):
+            SEQ.pack_into(shm.buf, HEADER.size + i * (SEQ.size + chunk * width), EMPTY)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(_attach(name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write_seq(self):
+        """Sequence number the next chunk will get (= chunks published so far)."""
+        return SEQ.unpack_from(self.buf, WRITE_SEQ_OFFSET)[0]
+
+    def published_at(self):
+        """time.monotonic() of the last publish (the clock is system-wide)."""
+        return STAMP.unpack_from(self.buf, STAMP_OFFSET)[0]
+
+    def _offset(self, seq):
+        return HEADER.size + (seq % self.slots) * self.slot_bytes
+
+    def publish(self, data):
+        """Writer only. Append one chunk; returns its sequence number."""
+        if len(data) != self.frame_bytes:
+            raise ValueError(f"chunk is {len(data)} bytes, ring expects {self.frame_bytes}")
+        seq = self.write_seq()
+        offset = self._offset(seq)
+        SEQ.pack_into(self.buf, offset, EMPTY)
+        self.buf[offset + SEQ.size:offset + self.slot_bytes] = data
+        SEQ.pack_into(self.buf, offset, seq)
+        STAMP.pack_into(self.buf, STAMP_OFFSET, time.monotonic())
+        SEQ.pack_into(self.buf, WRITE_SEQ_OFFSET, seq + 1)
+        return seq
+
+    def get(self, seq):
+        """Chunk seq, or None if it has been overwritten."""
+        offset = self._offset(seq)
+        if SEQ.unpack_from(self.buf, offset)[0] != seq:
+            return None
+        data = bytes(self.buf[offset + SEQ.size:offset + self.slot_bytes])
+        if SEQ.unpack_from(self.buf, offset)[0] != seq:
+            return None
+        return data
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingReader:
+    """One subscriber's position in the ring. Starts at the newest chunk."""
+
+    def __init__(self, ring):
+        self.ring = ring
+        self.next_seq = ring.write_seq()
+        self.dropped = 0
+        self.poll = 0.002  # once the next chunk is due but hasn't landed yet
+
+    def _catch_up(self, head):
+        oldest = head - self.ring.slots + 1  # keep one slot of headroom for the writer
+        if self.next_seq < oldest:
+            self.dropped += oldest - self.next_seq
+            self.next_seq = oldest
+
+    def read(self, size=None, timeout=READ_TIMEOUT):
+        """
+        Next chunk in order, waiting for it if needed (size is ignored: chunks
+        come as captured). Raises OSError if nothing arrives within timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            head = self.ring.write_seq()
+            if self.next_seq < head:
+                self._catch_up(head)
+                data = self.ring.get(self.next_seq)
+                if data is not None:
+                    self.next_seq += 1
+                    return data
+                continue  # overwritten while we looked: catch up again
+            now = time.monotonic()
+            if now > deadline:
+                raise OSError("microphone capture stopped")
+            due = self.ring.published_at() + self.ring.chunk_seconds
+            time.sleep(max(self.poll, min(due - now, deadline - now)))
+
+    def latest(self):
+        """Newest chunk without waiting (None if nothing new); older ones are skipped."""
+        head = self.ring.write_seq()
+        if head <= self.next_seq:
+            return None
+        data = self.ring.get(head - 1)
+        self.next_seq = head
+        return data
+
+
+class CaptureService:
+    """The only reader of the device: a thread that publishes every chunk to the ring."""
+
+    def __init__(self, device_index=None, rate=RATE, chunk=CHUNK, slots=SLOTS):
+        self.chunk = chunk
+        self.pa = pyaudio.PyAudio()
+        self.stream = self.pa.open(format=pyaudio.paInt16, channels=1, rate=rate, input=True,
+                                   frames_per_buffer=chunk, input_device_index=device_index)
+        self.ring = MicRing.create(rate, SAMPLE_WIDTH, chunk, slots)
+        self.closed = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="neura-mic-capture", daemon=True)
+        self.thread.start()
+
+    def child_env(self):
+        """Environment variables that make a backend process record from this ring."""
+        return {RING_ENV: self.ring.name}
+
+    def subscribe(self):
+        return RingReader(self.ring)
+
+    def _run(self):
+        while not self.closed.is_set():
+            try:
+                data = self.stream.read(self.chunk, exception_on_overflow=False)
+            except Exception as e:
+                if self.closed.is_set():
+                    break  # close() stopped the stream under us
+                print("Mic capture error:", e)
+                time.sleep(0.5)
+                continue
+            if self.closed.is_set():
+                break
+            self.ring.publish(data)
+
+    def close(self):
+        """
+        Stop capturing and free the device and the ring. Close consumers in
+        other processes first: their readers fail once the ring is gone.
+        """
+        self.closed.set()
+        self.stream.stop_stream()  # makes a read in progress return
+        self.thread.join(timeout=2.0)
+        self.stream.close()
+        self.pa.terminate()
+        if self.thread.is_alive():
+            # Still inside the driver: leave the ring mapped rather than pull it
+            # out from under the thread (the resource tracker unlinks it at exit)
+            print("Mic capture thread did not stop; leaving the ring to exit cleanup")
+            return
+        self.ring.close()
+
+
+class RingSource(sr.AudioSource):
+    """speech_recognition source that records from the shared ring instead of the device."""
+
+    def __init__(self, name):
+        self.name = name
+        self.ring = None
+        self.stream = None
+
+    def __enter__(self):
+        self.ring = MicRing.attach(self.name)
+        self.SAMPLE_RATE = self.ring.rate
+        self.SAMPLE_WIDTH = self.ring.width
+        self.CHUNK = self.ring.chunk
+        self.stream = RingReader(self.ring)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+        self.ring.close()
@@ -15,87 +15,113 @@ from ctypes import cast, POINTER
 from comtypes import CLSCTX_ALL
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 import re
-import threading
 import time
+import asyncio
+import functools
 import keyboard
 import pyautogui
-import requests
 import json
+import http_client
 import pyjokes
 from art import text2art
+import chat_bridge
+from memory_store import MemoryStore, day_range
+import llm_context
+import speech_stream
+import hedging
+from circuit_breaker import CircuitBreaker
+from response_cache import ResponseCache, fingerprint
+from lookup_cache import TTLCache
+from gemini_session import GeminiSession
+import intents
+from intent_classifier import IntentClassifier
+import tts_worker
+from tts_worker import SpeechWorker
+import phrase_cache
+from phrase_cache import PhraseCache
+from listener import Listener
+import mic_capture
+from asr import RecognizerChain
+import async_core
+from async_core import to_io, spawn, schedule
 
-CHAT_BRIDGE_FILE = "chat_bridge.json"
 load_dotenv()
 groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
 genai.configure(api_key = os.getenv("GEMINI_API_KEY"))
 model = genai.GenerativeModel('gemini-2.0-flash')
 
-engine = pyttsx3.init('sapi5')
-voices = engine.getProperty('voices')
-engine.setProperty('voice', voices[1].id)
-engine.setProperty('rate', 180)
-
-MEMORY_FILE = "neura_memory.json"
+def init_engine():
+    """Runs on the TTS worker thread: the engine is created and used only there."""
+    engine = pyttsx3.init('sapi5')
+    voices = engine.getProperty('voices')
+    engine.setProperty('voice', voices[1].id)
+    engine.setProperty('rate', 180)
+    return engine
+
+# Phrases said often enough to keep as recordings (rendered in the background)
+FREQUENT_PHRASES = [
+    "Hello Sir!", "Good Morning!", "Good Afternoon!", "Good Evening!", "Good Night!",
+    "I am Neura. Please tell, how may I help you?", "Goodbye Sir!",
+    "Let me think...", "Sure sir!", "Sir! ", "Sure sir! Please let me find!",
+    "Searching Wikipedia....", "According to Wikipedia", "Sorry, I couldn't find any information.",
+    "Volume increased", "Volume decreased", "Volume muted", "Volume unmuted",
+    "Brightness increased", "Brightness decreased", "Please give me a number between 0 and 100.",
+    "Media playback toggled.", "Playing next track.", "Playing previous track.",
+    "Sorry, I didn't catch that.", "Sorry Sir! Can you please repeat again?",
+    "What would you like me to write down, Sir?", "Where should I save this note?",
+    "What should be the file name?", "What reminder should I set, Sir?", "When should I remind you? sir!",
+    "Would you like me to detect your location or do you want to tell the city?",
+    "Sure Sir, accessing camera..", "Sure Sir, opening the image..",
+    "I am fine. How can I assist you?", "Hello Sir! It's good to hear from you.", "You're welcome, Sir!",
+]
+PHRASE_TEMPLATES = [
+    ("Volume set to {} percent", range(0, 101, 10)),
+    ("Brightness set to {} percent", range(0, 101, 10)),
+]
+PHRASE_CACHE_DIR = "neura_tts_cache"
+
+# One worker owns the TTS engine; everything else queues utterances on it
+tts = SpeechWorker(
+    init_engine,
+    phrases=PhraseCache(PHRASE_CACHE_DIR) if os.getenv("NEURA_PHRASE_CACHE", "1") == "1" else None,
+)
+
+# Barge-in: listen while still speaking and cut speech off when the user talks.
+# Off by default, since on open speakers the mic also hears the assistant.
+BARGE_IN = os.getenv("NEURA_BARGE_IN", "0") == "1"
+
+SCREEN_ACCESS_ALLOWED = False
+
+MEMORY_DB = "neura_memory.db"
+MEMORY_FILE = "neura_memory.json"  # legacy format, migrated into MEMORY_DB once
+
+chat_writer = chat_bridge.open_writer()
+
+# Wikipedia summaries rarely change; "no such page" is remembered for a day
+WIKI_CACHE_FILE = "neura_wiki_cache.json"
+WIKI_TTL = 30 * 24 * 3600
+WIKI_MISS_TTL = 24 * 3600
+wiki_cache = TTLCache(WIKI_CACHE_FILE, max_entries=1000, default_ttl=WIKI_TTL)
+
+# Weather per city for a few minutes; IP location once per session
+WEATHER_CACHE_MINUTES = float(os.getenv("NEURA_WEATHER_CACHE_MINUTES", "10"))
+weather_cache = TTLCache(max_entries=50, default_ttl=WEATHER_CACHE_MINUTES * 60)
+DETECTED_CITY = None
 
 def send_to_frontend(role, message):
-    payload = {
-        "time": datetime.datetime.now().strftime("%H:%M:%S"),
-        "role": role,
-        "message": message
-    }
+    payload = chat_bridge.make_record(role, message)
 
     try:
-        if os.path.exists(CHAT_BRIDGE_FILE):
-            with open(CHAT_BRIDGE_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        else:
-            data = []
-
-        data.append(payload)
-
-        with open(CHAT_BRIDGE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
+        chat_writer.send(payload)
     except Exception as e:
         print("Chat bridge error:", e)
 
-def load_memory():
-    """Load or initialize memory structure."""
-    if os.path.exists(MEMORY_FILE):
-        try:
-            with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # Ensure required keys exist
-                data.setdefault("preferences", {})
-                data.setdefault("interaction_history", [])
-                data.setdefault("activity_log", [])
-                data.setdefault("llm_history", [])
-                return data
-        except json.JSONDecodeError:
-            # If file corrupted, reset
-            pass
-    # default structure
-    return {
-        "preferences": {},
-        "interaction_history": [],
-        "activity_log": [],
-        "llm_history": []
-    }
-
-def save_memory(mem):
-    """Write memory dict to disk."""
-    try:
-        with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(mem, f, indent=4, ensure_ascii=False)
-    except Exception as e:
-        print(f"[Memory save error]: {e}")
-
-memory = load_memory()
+memory = MemoryStore(MEMORY_DB, legacy_json=MEMORY_FILE)
 
-def llm_history_to_pairs():
+def llm_history_to_pairs(limit=None):
     pairs = []
-    for msg in memory.get("llm_history", []):
+    for msg in memory.llm_history(limit):
         role = msg.get("role", "user")
         content = msg.get("content", "")
         if role == "user":
@@ -104,81 +130,233 @@ def llm_history_to_pairs():
             pairs.append(("bot", content))
     return pairs
 
+def pinned_context():
+    """Items every LLM request carries regardless of the token budget."""
+    note = llm_context.preferences_note(memory.preferences)
+    if not note:
+        return []
+    return [("user", note), ("bot", "Noted.")]
+
+def build_context(provider, prompt, chat_history_pairs=None):
+    """Recent history for one provider, trimmed to its token budget."""
+    if chat_history_pairs is None:
+        chat_history_pairs = llm_history_to_pairs(llm_context.CONTEXT_FETCH_LIMIT)
+    return llm_context.select_recent(
+        chat_history_pairs,
+        llm_context.budget_for(provider),
+        pinned=pinned_context(),
+        reserve=llm_context.count_tokens(prompt),
+    )
+
 def append_llm_history(role, content):
-    memory["llm_history"].append({"role": role, "content": content})
-    save_memory(memory)
+    memory.add_llm_message(role, content)
 def remember_interaction(user_input, neura_response):
-    memory["interaction_history"].append({
-        "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "user": user_input,
-        "neura": neura_response
-    })
-    save_memory(memory)
+    memory.add_interaction(user_input, neura_response)
 
 def update_preference(key, value):
     # If value is list-like or multiple preferences, store as list
-    prev = memory["preferences"].get(key)
+    prev = memory.preferences.get(key)
     if prev:
         # Avoid duplicates for simple strings
         if isinstance(prev, list):
             if value not in prev:
                 prev.append(value)
-                memory["preferences"][key] = prev
+                memory.set_preference(key, prev)
         else:
             if prev != value:
-                memory["preferences"][key] = value
+                memory.set_preference(key, value)
     else:
         # If key likely to be multiple (like song_preferences), prefer list
         if key.endswith("_preferences") or key.endswith("songs"):
-            memory["preferences"][key] = [value]
+            memory.set_preference(key, [value])
         else:
-            memory["preferences"][key] = value
-    save_memory(memory)
+            memory.set_preference(key, value)
 
 def log_activity(action):
-    memory["activity_log"].append({
-        "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "action": action
-    })
-    save_memory(memory)
+    memory.add_activity(action)
 
 def recall_preference(key, default=None):
-    return memory["preferences"].get(key, default)
+    return memory.preferences.get(key, default)
+
+def recall_interactions(day):
+    """Everything asked on a given date, oldest first (indexed range query)."""
+    start, end = day_range(day)
+    return memory.interactions_between(start, end)
 
 def analyze_memory_on_start():
     """Run light analysis on startup and optionally speak summary."""
-    prefs = memory.get("preferences", {})
-    interactions = memory.get("interaction_history", [])
+    prefs = memory.preferences
+    count = memory.interaction_count()
     if prefs:
         print("🔁 Loaded preferences:")
         for k, v in prefs.items():
             print(f"  - {k}: {v}")
-    if interactions:
-        print(f"🗂️  Interaction history length: {len(interactions)}")
-        last = interactions[-1]
+    if count:
+        print(f"🗂️  Interaction history length: {count}")
+        last = memory.last_interaction()
         print(f"  Last: {last.get('timestamp')} | user: {last.get('user')}")
 
 
-def speak(audio):
+def say(audio):
+    """Queue speech without posting to the chat bridge (streamed sentences); returns a future."""
+    return tts.say(audio)
+
+def announce(audio, priority=tts_worker.NORMAL):
+    """Post and queue speech without waiting for it; returns a future."""
     send_to_frontend("neura", audio)
-    engine.say(audio)
-    engine.runAndWait()
+    return tts.say(audio, priority)
+
+def speak(audio):
+    """Blocking speech for code running off the event loop (worker threads)."""
+    announce(audio).result()
 
+async def aspeak(audio, priority=tts_worker.NORMAL):
+    await asyncio.wrap_future(announce(audio, priority))
 
-def wishMe():
-    speak('Hello Sir!')
 
-def wishtime():
+async def wishMe():
+    await aspeak('Hello Sir!')
+
+async def wishtime():
     hour = datetime.datetime.now().hour
     if 0 <= hour < 12:
-        speak("Good Morning!")
+        await aspeak("Good Morning!")
     elif 12 <= hour < 18:
-        speak("Good Afternoon!")
+        await aspeak("Good Afternoon!")
     elif 18 <= hour < 20:
-        speak("Good Evening!")
+        await aspeak("Good Evening!")
     else:
-        speak("Good Night!")
-    speak("I am Neura. Please tell, how may I help you?")
+        await aspeak("Good Night!")
+    await aspeak("I am Neura. Please tell, how may I help you?")
+
+CONTROL_INSTRUCTION = (
+    "Answer clearly and concisely based only on the question asked. "
+    "Avoid any extra explanation or details not explicitly requested. "
+    "If clarification is needed, ask the user."
+)
+GROQ_MODEL = "llama3-70b-8192"
+STREAM_REPLIES = os.getenv("NEURA_STREAM_REPLIES", "1") == "1"
+
+# Hedged mode: start Groq too if Gemini hasn't answered (or, streamed, produced
+# its first text) within the delay (Gemini's recent p95 once enough calls have
+# been timed, at most HEDGE_DELAY)
+HEDGE_REQUESTS = os.getenv("NEURA_HEDGE_REQUESTS", "1") == "1"
+HEDGE_DELAY = float(os.getenv("NEURA_HEDGE_DELAY", "1.5"))
+
+# One breaker per provider; failing providers are skipped and probed in the background
+BREAKERS = {"Gemini": CircuitBreaker("Gemini"), "Groq": CircuitBreaker("Groq")}
+PROBE_INTERVAL = 10  # seconds
+
+# Repeated, self-contained questions are answered from the cache
+RESPONSE_CACHE_FILE = "neura_response_cache.json"
+response_cache = ResponseCache(
+    RESPONSE_CACHE_FILE if os.getenv("NEURA_PERSIST_RESPONSE_CACHE", "1") == "1" else None,
+    max_entries=int(os.getenv("NEURA_RESPONSE_CACHE_SIZE", "500")),
+)
+PROVIDER_PROBES = {
+    "Gemini": lambda: model.generate_content("Reply with OK.").text,
+    "Groq": lambda: groq_client.chat.completions.create(
+        model=GROQ_MODEL, messages=[{"role": "user", "content": "Reply with OK."}], max_tokens=1
+    ),
+}
+
+# Built once from memory, then extended turn by turn (rebuilt after "clear memory")
+gemini_session = GeminiSession(
+    model,
+    load_pairs=lambda: llm_history_to_pairs(llm_context.CONTEXT_FETCH_LIMIT),
+    pinned=pinned_context,
+    budget=llm_context.budget_for("gemini"),
+)
+
+def gemini_prompt(prompt):
+    return f"{CONTROL_INSTRUCTION}\n\nUser: {prompt}"
+
+def groq_messages(prompt, chat_history_pairs):
+    messages = []
+    for role, content in build_context("groq", prompt, chat_history_pairs):
+        messages.append({
+            "role": "user" if role == "user" else "assistant",
+            "content": content
+        })
+
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+def ask_gemini(prompt, chat_history_pairs):
+    # Gemini keeps its own long-lived session; chat_history_pairs is for Groq
+    response = gemini_session.send(gemini_prompt(prompt))
+
+    # Check if Gemini gave a valid response
+    if not response.text or response.text.strip() == "" or "error" in response.text.lower():
+        raise ValueError("Gemini response invalid")
+    return response.text
+
+def ask_groq(prompt, chat_history_pairs):
+    response = groq_client.chat.completions.create(
+        model=GROQ_MODEL,
+        messages=groq_messages(prompt, chat_history_pairs),
+        temperature=0.7,
+    )
+    return response.choices[0].message.content
+
+PROVIDERS = {"Gemini": ask_gemini, "Groq": ask_groq}
+
+def provider_order():
+    """
+    Providers to use for this turn, preferred first. Open breakers are
+    skipped; if every breaker is open, try them all anyway.
+    """
+    healthy = [name for name in PROVIDERS if BREAKERS[name].allow_request()]
+    return healthy or list(PROVIDERS)
+
+def ask_providers(prompt, chat_history_pairs):
+    """Reply text from the healthy providers in order; hedged when HEDGE_REQUESTS is on."""
+    order = provider_order()
+    calls = [
+        (name, lambda name=name: BREAKERS[name].call(lambda: PROVIDERS[name](prompt, chat_history_pairs)))
+        for name in order
+    ]
+
+    if HEDGE_REQUESTS and len(calls) > 1:
+        reply, _ = hedging.hedged_call(
+            calls[0], calls[1],
+            delay=hedging.hedge_delay(BREAKERS[order[0]].latency, HEDGE_DELAY),
+        )
+        return reply
+
+    last_error = None
+    for name, call in calls:
+        try:
+            return call()
+        except Exception as e:
+            print(f"[{name} failed: {e}] ⚡ Trying the next provider...")
+            last_error = e
+    raise last_error
+
+async def probe_provider(name, breaker):
+    try:
+        await to_io(breaker.call, PROVIDER_PROBES[name])
+        print(f"[{name} probe succeeded]")
+    except Exception as e:
+        print(f"[{name} probe failed: {e}]")
+
+async def probe_providers():
+    """Background health check (scheduled): probe open breakers once their cooldown is over."""
+    await asyncio.gather(*(
+        probe_provider(name, breaker)
+        for name, breaker in BREAKERS.items()
+        if breaker.ready_for_probe()
+    ))
+
+def provider_status():
+    parts = [breaker.describe() for breaker in BREAKERS.values()]
+    parts.append(response_cache.describe())
+    parts.append(recognizer_chain.describe())
+    return ". ".join(parts)
+
+def cache_context():
+    """Fingerprint of everything besides the prompt that shapes an answer."""
+    return fingerprint(CONTROL_INSTRUCTION, llm_context.preferences_note(memory.preferences))
 
 def chat_with_ai(prompt, chat_history_pairs=None):
     """
@@ -187,128 +365,223 @@ def chat_with_ai(prompt, chat_history_pairs=None):
     Returns: (reply_text, updated_chat_history_pairs)
     """
     if chat_history_pairs is None:
-        chat_history_pairs = llm_history_to_pairs()
+        chat_history_pairs = gemini_session.history_pairs()
 
+    context = cache_context()
+    reply = response_cache.lookup(prompt, context)
+    if reply is None:
+        try:
+            reply = ask_providers(prompt, list(chat_history_pairs))
+        except Exception as e2:
+            return f"Both Gemini and Groq failed: {e2}", chat_history_pairs
+        response_cache.store(prompt, reply, context)
+    else:
+        print(f"[Cache hit] {response_cache.describe()}")
+
+    chat_history_pairs.append(("user", prompt))
+    chat_history_pairs.append(("bot", reply))
+    append_llm_history("user", prompt)
+    append_llm_history("assistant", reply)
+    gemini_session.commit(prompt, reply)
+    return reply, chat_history_pairs
+
+
+def gemini_stream(prompt, chat_history_pairs):
+    for chunk in gemini_session.send(gemini_prompt(prompt), stream=True):
+        if chunk.text:
+            yield chunk.text
+
+def groq_stream(prompt, chat_history_pairs):
+    stream = groq_client.chat.completions.create(
+        model=GROQ_MODEL,
+        messages=groq_messages(prompt, chat_history_pairs),
+        temperature=0.7,
+        stream=True,
+    )
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+PROVIDER_STREAMS = {"Gemini": gemini_stream, "Groq": groq_stream}
+
+def provider_stream(name, prompt, chat_history_pairs):
+    """One provider's stream, with its time to first text (or failure) recorded on its breaker."""
+    breaker = BREAKERS[name]
+    start = time.perf_counter()
+    produced = False
     try:
-        # ✅ Try Gemini first
-        control_instruction = (
-            "Answer clearly and concisely based only on the question asked. "
-            "Avoid any extra explanation or details not explicitly requested. "
-            "If clarification is needed, ask the user."
-        )
-        full_prompt = f"{control_instruction}\n\nUser: {prompt}"
+        for piece in PROVIDER_STREAMS[name](prompt, chat_history_pairs):
+            if not produced:
+                produced = True
+                breaker.record_success(time.perf_counter() - start)
+            yield piece
+    except Exception:
+        if not produced:
+            breaker.record_failure(time.perf_counter() - start)
+        raise
+    if not produced:
+        breaker.record_failure(time.perf_counter() - start)
+        raise ValueError(f"{name} stream was empty")
+
+def first_stream(streams):
+    """Pieces from the first of streams that produces anything (no hedging)."""
+    last_error = None
+    for name, open_stream in streams:
+        produced = False
+        try:
+            for piece in open_stream():
+                produced = True
+                yield piece
+            return
+        except Exception as e:
+            if produced:
+                raise
+            last_error = e
+            print(f"[{name} failed: {e}] ⚡ Trying the next provider...")
+    raise last_error
 
-        # Ensure chat history works for Gemini
-        chat = model.start_chat(history=chat_history_pairs)
-        response = chat.send_message(full_prompt)
+def stream_reply_tokens(prompt, chat_history_pairs):
+    """
+    Yield reply text as it is generated from the healthiest provider. With
+    HEDGE_REQUESTS the next provider is started too if no text has arrived
+    within the hedge delay, and the first to produce text is streamed;
+    otherwise the next one is tried only if the first fails before
+    producing anything. A failure after text has arrived is raised.
+    """
+    order = provider_order()
+    streams = [
+        (name, functools.partial(provider_stream, name, prompt, chat_history_pairs))
+        for name in order
+    ]
+    if HEDGE_REQUESTS and len(streams) > 1:
+        return hedging.hedged_stream(
+            streams[0], streams[1],
+            delay=hedging.hedge_delay(BREAKERS[order[0]].latency, HEDGE_DELAY),
+        )
+    return first_stream(streams)
 
-        # Check if Gemini gave a valid response
-        if not response.text or response.text.strip() == "" or "error" in response.text.lower():
-            raise ValueError("Gemini response invalid")
 
-        chat_history_pairs.append(("user", prompt))
-        chat_history_pairs.append(("bot", response.text))
+def chat_with_ai_stream(prompt, say_sentence):
+    """
+    Streaming variant of chat_with_ai: each sentence is passed to
+    say_sentence as soon as it is complete. The full reply is stored in
+    llm_history at the end. Returns the reply text (already spoken).
+    A reply cut off mid-stream is returned as far as it got, but is not
+    cached, stored in llm_history or added to the Gemini session.
+    """
+    context = cache_context()
+    reply = response_cache.lookup(prompt, context)
+    if reply is not None:
+        print(f"[Cache hit] {response_cache.describe()}")
+        say_sentence(reply)
         append_llm_history("user", prompt)
-        append_llm_history("assistant", response.text)
-        return response.text, chat_history_pairs
+        append_llm_history("assistant", reply)
+        gemini_session.commit(prompt, reply)
+        return reply
 
+    chat_history_pairs = gemini_session.history_pairs()
+    try:
+        reply = speech_stream.stream_to_speech(stream_reply_tokens(prompt, chat_history_pairs), say_sentence)
+    except speech_stream.StreamInterrupted as e:
+        print(f"[Stream interrupted: {e.error}]")
+        return e.partial
     except Exception as e:
-        print(f"[Gemini failed: {e}] ⚡ Switching to Groq...")
-
-        # ✅ Fallback to Groq
-        try:
-            messages = []
-            for role, content in chat_history_pairs:
-                messages.append({
-                    "role": "user" if role == "user" else "assistant",
-                    "content": content
-                })
-
-            messages.append({"role": "user", "content": prompt})
-
-            response = groq_client.chat.completions.create(
-                model="llama3-70b-8192",
-                messages=messages,
-                temperature=0.7,
-            )
-
-            reply = response.choices[0].message.content
-
-            chat_history_pairs.append(("user", prompt))
-            chat_history_pairs.append(("bot", reply))
-            append_llm_history("user", prompt)
-            append_llm_history("assistant", reply)
-
-            return reply, chat_history_pairs
-
-        except Exception as e2:
-            return f"Both Gemini and Groq failed: {e2}", chat_history_pairs
-
-
-def ask_neura(user_message):
+        reply = f"Both Gemini and Groq failed: {e}"
+        say_sentence(reply)
+        return reply
+
+    response_cache.store(prompt, reply, context)
+
+    append_llm_history("user", prompt)
+    append_llm_history("assistant", reply)
+    gemini_session.commit(prompt, reply)
+    return reply
+
+
+# Conversation intents (intents.CONVERSATION) answered with a fixed reply
+CANNED_REPLIES = {
+    "how_are_you": "I am fine. How can I assist you?",
+    "greeting": "Hello Sir! It's good to hear from you.",
+    "who_are_you": "I am Neura, your personal AI assistant.",
+    "capabilities": "I can help you with various tasks like answering questions, managing files, setting reminders, and more.",
+    "name": "My name is Neura. I was created to help you.",
+    "creator": "He is my creator! a brilliant mind who brought me to life! I am lucky to assist him.",
+    "thanks": "You're welcome, Sir!",
+}
+
+async def ask_neura(user_message):
     """
     Handles conversational queries and memory updates.
     """
 
     user_message = user_message.lower()
+    spoken = False
 
     if not user_message:
         return
-    
-     # Greeting and wellbeing
-    if any(phrase in user_message for phrase in ["how are you", "how do you do"]):
-        response = "I am fine. How can I assist you?"
-    elif any(greet in user_message.split() for greet in ["hello", "hi"]):
-        response = "Hello Sir! It's good to hear from you."
-    elif "who are you" in user_message:
-        response = "I am Neura, your personal AI assistant."
-    elif "what can you do" in user_message:
-        response = "I can help you with various tasks like answering questions, managing files, setting reminders, and more."
-    elif "your name" in user_message:
-        response = "My name is Neura. I was created to help you."
-    elif "rohit adak" in user_message:
-        response = "He is my creator! a brilliant mind who brought me to life! I am lucky to assist him."
-    elif "thank you" in user_message or "thanks" in user_message:
-        response = "You're welcome, Sir!"
-    elif "time" in user_message:
+
+    match = intents.CONVERSATION.match(user_message)
+    intent = match.name if match else None
+
+    if intent in CANNED_REPLIES:
+        response = CANNED_REPLIES[intent]
+    elif intent == "recall":
+        day = datetime.date.today()
+        when = match.slots.get("day", "today")
+        if when == "yesterday":
+            day -= datetime.timedelta(days=1)
+        asked = [i["user"] for i in await to_io(recall_interactions, day) if i.get("user")]
+        if asked:
+            response = f"You asked {len(asked)} things {when}. The last ones were: " + "; ".join(asked[-3:])
+        else:
+            response = "I don't have any questions recorded for that day."
+    elif intent == "time":
         current_time = datetime.datetime.now().strftime("%H:%M:%S")
         response = f"The time is {current_time}"
-    elif re.search(r"\bi like\b", user_message) or re.search(r"\bi prefer\b", user_message):
-        m = re.search(r"i like (.+)", user_message) or re.search(r"i prefer (.+)", user_message)
-        if m:
-            pref_text = m.group(1).strip()
+    elif intent == "preference":
+        pref_text = match.slots.get("thing")
+        if pref_text:
             if any(word in pref_text for word in ["music", "song", "songs", "genre", "rock", "lofi", "pop", "romantic", "classical"]):
-                existing = memory["preferences"].get("song_preferences", [])
+                existing = memory.preferences.get("song_preferences", [])
                 if isinstance(existing, list):
                     if pref_text not in existing:
                         existing.append(pref_text)
-                        memory["preferences"]["song_preferences"] = existing
+                        memory.set_preference("song_preferences", existing)
                 else:
-                    memory["preferences"]["song_preferences"] = [existing, pref_text] if existing else [pref_text]
-                save_memory(memory)
+                    memory.set_preference("song_preferences", [existing, pref_text] if existing else [pref_text])
                 response = f"Got it — I've noted you like {pref_text} music."
             else:
                 update_preference_key = "general_likes"
-                existing = memory["preferences"].get(update_preference_key, [])
+                existing = memory.preferences.get(update_preference_key, [])
                 if isinstance(existing, list):
                     if pref_text not in existing:
                         existing.append(pref_text)
-                        memory["preferences"][update_preference_key] = existing
+                        memory.set_preference(update_preference_key, existing)
                 else:
-                    memory["preferences"][update_preference_key] = [pref_text]
-                save_memory(memory)
+                    memory.set_preference(update_preference_key, [pref_text])
                 response = f"Noted that you like {pref_text}."
         else:
             response = "Tell me what you like, Sir."
     else:
-        speak("Let me think...")
-        response, _ = chat_with_ai(user_message)
+        # The request is already in flight while "Let me think..." is spoken
+        announce("Let me think...")
+        if STREAM_REPLIES:
+            # Sentences are queued for speech while the rest is still generating
+            response = await to_io(chat_with_ai_stream, user_message, say)
+            spoken = True
+        else:
+            response, _ = await to_io(chat_with_ai, user_message)
         print("Nura:", response)
 
     remember_interaction(user_message, response)
     log_activity(f"Handled query: {user_message}")
 
-    speak(response)
+    if spoken:
+        # Full text goes to the HUD once the stream has finished
+        send_to_frontend("neura", response)
+    else:
+        await aspeak(response)
     return response
 
 def close_outlook():
@@ -354,27 +627,41 @@ def find_and_close_app(spoken_name):
         speak(f"Sorry, I don't know how to close {spoken_name}. The app may not be in my list.")
 
 
+# Opened and calibrated once, then captures continuously for every command and follow-up.
+# Under the HUD the device is read once by the frontend and shared through a ring.
+# Without barge-in, whatever the mic picks up while we are speaking is our own voice.
+MIC_RING = os.getenv(mic_capture.RING_ENV)
+listener = Listener(device_index=int(os.getenv("NEURA_MIC_INDEX", "1")),
+                    make_source=(lambda: mic_capture.RingSource(MIC_RING)) if MIC_RING else None,
+                    ignore_while=None if BARGE_IN else tts.busy)
+
+# Speech backends in fallback order, e.g. NEURA_ASR=whisper,google (see asr.py)
+recognizer_chain = RecognizerChain.from_names(
+    os.getenv("NEURA_ASR", "google").split(","),
+    language="en-in",
+    whisper_model=os.getenv("NEURA_ASR_MODEL", "base.en"),
+    replay_file=os.getenv("NEURA_ASR_REPLAY"),
+)
+
 def takeCommand():
-    r = sr.Recognizer()
-    with sr.Microphone(device_index=1) as source:
+    try:
         print("Listening...")
-        r.adjust_for_ambient_noise(source)
-        try:
-            audio = r.listen(source, timeout=4)
-            print("Recognizing...")
-            query = r.recognize_google(audio, language='en-in')
-            print(f"User said: {query}")
-            send_to_frontend("user", query)
-            return query.lower()
-        except sr.UnknownValueError:
-            print("Sorry, I couldn't understand what you said. Please try again.")
-            return ""
-        except sr.RequestError as e:
-            print(f"Could not request results; {e}")
-            return ""
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            return ""
+        audio = listener.listen(timeout=4)
+        print("Recognizing...")
+        start = time.perf_counter()
+        query, backend = recognizer_chain.recognize(audio)
+        print(f"User said: {query}  [{backend}, {time.perf_counter() - start:.2f}s]")
+        send_to_frontend("user", query)
+        return query.lower()
+    except sr.UnknownValueError:
+        print("Sorry, I couldn't understand what you said. Please try again.")
+        return ""
+    except sr.RequestError as e:
+        print(f"Could not request results; {e}")
+        return ""
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return ""
 
 def resolve_folder(folder_input, base_path=None):
     """
@@ -673,31 +960,37 @@ def set_reminder():
         speak(f"Sorry Sir, I could not set the reminder. Error: {e}")
 
 
-def check_reminders():
+REMINDER_INTERVAL = 30  # seconds
+
+def due_reminders():
+    """Take the reminders whose time has come out of the file and return their text."""
     filename = "Nura_Reminders.txt"
-    while True:
-        if os.path.exists(filename):
-            now = datetime.datetime.now()
-            reminders_to_keep = []
+    due = []
+    if os.path.exists(filename):
+        now = datetime.datetime.now()
+        reminders_to_keep = []
 
-            with open(filename, "r") as f:
-                lines = f.readlines()
+        with open(filename, "r") as f:
+            lines = f.readlines()
 
-            for line in lines:
-                try:
-                    dt_str, reminder_text = line.strip().split(": ", 1)
-                    reminder_time = datetime.datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
-                    
-                    if now >= reminder_time:
-                        speak(f"Sir, this is your reminder: {reminder_text}")
-                    else:
-                        reminders_to_keep.append(line)
-                except:
-                    continue
-            with open(filename, "w") as f:
-                f.writelines(reminders_to_keep)
+        for line in lines:
+            try:
+                dt_str, reminder_text = line.strip().split(": ", 1)
+                reminder_time = datetime.datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
+                
+                if now >= reminder_time:
+                    due.append(reminder_text)
+                else:
+                    reminders_to_keep.append(line)
+            except:
+                continue
+        with open(filename, "w") as f:
+            f.writelines(reminders_to_keep)
+    return due
 
-        time.sleep(30)
+async def check_reminders():
+    for reminder_text in await to_io(due_reminders):
+        await aspeak(f"Sir, this is your reminder: {reminder_text}", tts_worker.URGENT)
 
 def find_and_open(name):
     """
@@ -768,16 +1061,66 @@ def open_app_with_windows_search(app_name):
         return False
 
 
+def normalize_topic(topic):
+    """'The Eiffel Tower?' and 'eiffel  tower' share one cache entry."""
+    text = re.sub(r"[^\w\s'-]", " ", topic.lower())
+    text = re.sub(r"\s+", " ", text).strip()
+    return re.sub(r"^(the|a|an) ", "", text)
+
+def wikipedia_summary(topic):
+    """
+    Three-sentence Wikipedia summary, or None when there is no page.
+    Answers and misses are both cached on disk, so a repeated question
+    makes no network call.
+    """
+    key = normalize_topic(topic)
+    if not key:
+        return None
+    try:
+        return wiki_cache.get(key)
+    except KeyError:
+        pass
+
+    try:
+        summary = wikipedia.summary(key, sentences=3)
+    except (wikipedia.exceptions.PageError, wikipedia.exceptions.DisambiguationError) as e:
+        print(f"No Wikipedia page for '{key}': {e}")
+        wiki_cache.put(key, None, WIKI_MISS_TTL)
+        return None
+    wiki_cache.put(key, summary)
+    return summary
+
+def lookup_wikipedia(topic):
+    """Shared by the 'wikipedia', 'about' and 'who is' commands; None on any failure."""
+    try:
+        return wikipedia_summary(topic)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+
+def detect_city():
+    """City from IP geolocation, looked up once per session."""
+    global DETECTED_CITY
+    if DETECTED_CITY is None:
+        ipinfo = http_client.get_json("https://ipinfo.io/json")
+        DETECTED_CITY = ipinfo.get("city", "")
+    return DETECTED_CITY
+
 def get_weather(city):
     API_KEY = os.getenv("WEATHER_API")
     if not API_KEY:
         return "Weather API key is missing in your environment file."
 
-    BASE_URL = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={API_KEY}&units=metric"
+    cache_key = normalize_topic(city)
+    cached = weather_cache.get(cache_key, None)
+    if cached:
+        return cached
+
+    BASE_URL = "http://api.openweathermap.org/data/2.5/weather"
 
     try:
-        response = requests.get(BASE_URL, timeout=5)
-        data = response.json()
+        data = http_client.get_json(BASE_URL, params={"q": city, "appid": API_KEY, "units": "metric"})
 
         if data.get("cod") != 200:
             return f"Sorry, I couldn't find weather information for {city}."
@@ -789,11 +1132,13 @@ def get_weather(city):
         wind_speed = data["wind"]["speed"]
         country = data["sys"]["country"]
 
-        return (
+        report = (
             f"The weather in {city.capitalize()}, {country} is {weather}. "
             f"The temperature is {temp}°C, feels like {feels_like}°C, "
             f"with humidity at {humidity} percent and wind speed {wind_speed} meters per second."
         )
+        weather_cache.put(cache_key, report)
+        return report
 
     except Exception as e:
         print(f"Weather error: {e}")
@@ -829,371 +1174,435 @@ def detect_media_activity():
 
 
 
-if __name__ == "__main__":
+async def listen():
+    """Next spoken command, recognized on the microphone thread."""
+    return await async_core.run_in(async_core.mic_pool, takeCommand)
 
-    # ---------- RESET CHAT SESSION ----------
-    with open(CHAT_BRIDGE_FILE, "w", encoding="utf-8") as f:
-        json.dump([], f)
 
-    # Print startup banner once
-    art = text2art("Neura", font='block', chr_ignore=True)
-    print("\n" + art + "\n")
-    wishMe()
-    wishtime()
-    analyze_memory_on_start()
+# ---------- COMMAND HANDLERS ----------
+# One coroutine per intent in intents.COMMANDS: (query, slots) -> None,
+# or False to end the session.
 
-    pref_city = recall_preference("weather_city")
-    pref_songs = memory["preferences"].get("song_preferences")
-    if pref_city:
-        speak(f"I remember your preferred weather city is {pref_city}.")
-    if pref_songs:
-        if isinstance(pref_songs, list):
-            speak(f"You've told me you like {', '.join(pref_songs[:3])}.")
-        else:
-            speak(f"You've told me you like {pref_songs} music.")
+async def cmd_exit(query, slots):
+    await aspeak("Goodbye Sir!")
+    return False
+
+async def cmd_wikipedia(query, slots):
+    query = slots.get("topic", "")
+    # Fetch while the acknowledgement is being spoken
+    announce('Searching Wikipedia....')
+    results = await to_io(lookup_wikipedia, query)
+    if results:
+        await aspeak("According to Wikipedia")
+        print(results)
+        await aspeak(results)
+        remember_interaction(query, results)
+        log_activity(f"Wikipedia search: {query}")
+    else:
+        await aspeak("Sorry, I couldn't find any information.")
+        remember_interaction(query, "wikipedia search failed")
+
+async def cmd_about(query, slots):
+    announce("Sure sir! Please let me find!")
+    results = await to_io(lookup_wikipedia, slots.get("topic", ""))
+    if results:
+        print(results)
+        await aspeak(results)
+        remember_interaction(query, results)
+    else:
+        await aspeak("Sorry, I couldn't find any information.")
+        remember_interaction(query, "about search failed")
+
+async def cmd_who_is(query, slots):
+    announce("Sir! ")
+    results = await to_io(lookup_wikipedia, slots.get("topic", ""))
+    if results:
+        print(results)
+        await aspeak(results)
+        remember_interaction(query, results)
+    else:
+        await aspeak("Sorry, I couldn't find any information.")
+        remember_interaction(query, "who is search failed")
+
+async def cmd_search(query, slots):
+    search_query = slots.get("query")
+    await aspeak("Sure sir!")
+    if search_query:
+        search_url = "https://www.google.com/search?q=" + '+'.join(search_query.split())
+        await aspeak("Here are the search results for " + search_query)
+        await to_io(webbrowser.open, search_url)
+        remember_interaction(query, f"Opened google search for {search_query}")
+        log_activity(f"Search: {search_query}")
+    else:
+        await aspeak("Sorry, I didn't catch the search query.")
 
-    reminder_thread = threading.Thread(target=check_reminders, daemon=True)
-    reminder_thread.start()
+async def cmd_weather(query, slots):
+    city = slots.get("city", "")
 
-    while True:
-        query = takeCommand()
+    if not city:
+        await aspeak("Would you like me to detect your location or do you want to tell the city?")
+        choice = (await listen()).lower()
 
-        if 'good bye' in query or 'goodbye' in query or 'exit' in query or 'bye' in query or "quit" in query or "good night" in query:
-            speak("Goodbye Sir!")
-            break
-        
-        elif 'wikipedia' in query:
-            speak('Searching Wikipedia....')
-            query = query.replace("wikipedia", "").strip()
-            try:
-                results = wikipedia.summary(query, sentences=3)
-                speak("According to Wikipedia")
-                print(results)
-                speak(results)
-                remember_interaction(query, results)
-                log_activity(f"Wikipedia search: {query}")
-            except wikipedia.exceptions.WikipediaException as e:
-                speak("Sorry, I couldn't find any information.")
-                print(f"An error occurred: {e}")
-                remember_interaction(query, "wikipedia search failed")
-
-        elif 'about' in query:
-            search_query = query.split('about', 1)[1].strip()
-            speak("Sure sir! Please let me find!")
-            try:
-                results = wikipedia.summary(search_query, sentences=3)
-                print(results)
-                speak(results)
-                remember_interaction(query, results)
-            except wikipedia.exceptions.WikipediaException as e:
-                speak("Sorry, I couldn't find any information.")
-                print(f"An error occurred: {e}")
-                remember_interaction(query, "about search failed")
-
-        elif 'who is' in query:
-            search_query = query.split('who is', 1)[1].strip()
-            speak("Sir! ")
+        if any(word in choice for word in ["detect", "auto", "current", "yes"]):
             try:
-                results = wikipedia.summary(search_query, sentences=3)
-                print(results)
-                speak(results)
-                remember_interaction(query, results)
-            except wikipedia.exceptions.WikipediaException as e:
-                speak("Sorry, I couldn't find any information.")
-                print(f"An error occurred: {e}")
-                remember_interaction(query, "who is search failed")
-
-        elif 'search' in query or 'find' in query:
-            search_query = query.split('search', 1)[1].strip() if 'search' in query else query.split('find', 1)[1].strip()
-            speak("Sure sir!")
-            if search_query:
-                search_url = "https://www.google.com/search?q=" + '+'.join(search_query)
-                speak("Here are the search results for " + search_query)
-                webbrowser.open(search_url)
-                remember_interaction(query, f"Opened google search for {search_query}")
-                log_activity(f"Search: {search_query}")
-            else:
-                speak("Sorry, I didn't catch the search query.")
-
-        elif 'weather' in query:
-            city = ""
-            match = re.search(r'weather (in|of|at)?\s*(.*)', query)
-            if match and match.group(2):
-                city = match.group(2).strip()
+                city = await to_io(detect_city)
+                if city:
+                    await aspeak(f"Detected your location as {city}.")
+                else:
+                    await aspeak("Sorry, I couldn’t detect your location. Please tell me the city name.")
+                    city = (await listen()).lower()
+            except Exception as e:
+                await aspeak("Sorry, I couldn’t detect your location. Please tell me the city name.")
+                city = (await listen()).lower()
+        else:
+            await aspeak("Please tell me the location you want.")
+            city = (await listen()).lower()
+
+    if city:
+        announce(f"Detecting weather information for {city}, please wait...")
+        weather_info = await to_io(get_weather, city)
+        print(weather_info)
+        await aspeak(weather_info)
+        remember_interaction(query, weather_info)
+    else:
+        await aspeak("Sorry, I couldn't understand the location you mentioned.")
 
-            if not city:
-                speak("Would you like me to detect your location or do you want to tell the city?")
-                choice = takeCommand().lower()
+async def cmd_open(query, slots):
+    app_name = slots.get("app")
 
-                if any(word in choice for word in ["detect", "auto", "current", "yes"]):
-                    try:
-                        ipinfo = requests.get("https://ipinfo.io").json()
-                        city = ipinfo.get("city", "")
-                        if city:
-                            speak(f"Detected your location as {city}.")
-                        else:
-                            speak("Sorry, I couldn’t detect your location. Please tell me the city name.")
-                            city = takeCommand().lower()
-                    except Exception as e:
-                        speak("Sorry, I couldn’t detect your location. Please tell me the city name.")
-                        city = takeCommand().lower()
-                else:
-                    speak("Please tell me the location you want.")
-                    city = takeCommand().lower()
-
-            
-            if city:
-                speak(f"Detecting weather information for {city}, please wait...")
-                weather_info = get_weather(city)
-                print(weather_info)
-                speak(weather_info)
-                remember_interaction(query, weather_info)
-            else:
-                speak("Sorry, I couldn't understand the location you mentioned.")
+    if app_name:
+        await aspeak(f"Sure Sir, I will try to open {app_name}.")
 
+        was_opened = await to_io(find_and_open, app_name)
 
-        elif 'open' in query:
-            app_name = query.split('open', 1)[1].strip()
+        if not was_opened:
+            await aspeak(f"Sorry sir! I couldn't find '{app_name}' on your system. I am trying another way...")
+            success = await to_io(open_app_with_windows_search, app_name)
 
-            if app_name:
-                speak(f"Sure Sir, I will try to open {app_name}.")
-                
-                was_opened = find_and_open(app_name)
-                
-                if not was_opened:
-                    speak(f"Sorry sir! I couldn't find '{app_name}' on your system. I am trying another way...")
-                    success = open_app_with_windows_search(app_name)
-                    
-                    if not success:
-                        try:
-                            search_url = f"https://www.{app_name.replace(' ', '')}.com"
-                            webbrowser.open(search_url)
-                            speak(f"Opening {app_name}")
-                            remember_interaction(query, f"Opened website for {app_name}")
-                        except Exception as e:
-                            speak(f"Sorry, I couldn't find the application named {app_name}.")
+            if not success:
+                try:
+                    search_url = f"https://www.{app_name.replace(' ', '')}.com"
+                    await to_io(webbrowser.open, search_url)
+                    await aspeak(f"Opening {app_name}")
+                    remember_interaction(query, f"Opened website for {app_name}")
+                except Exception as e:
+                    await aspeak(f"Sorry, I couldn't find the application named {app_name}.")
+    else:
+        await aspeak("Please specify the application you want to open.")
+
+async def cmd_media_toggle(query, slots):
+    await to_io(pause_or_resume_media)
+
+async def cmd_media_next(query, slots):
+    await to_io(next_media)
+
+async def cmd_media_previous(query, slots):
+    await to_io(previous_media)
+
+async def cmd_media_status(query, slots):
+    status = await to_io(detect_media_activity)
+    await aspeak(status)
+
+async def cmd_song(query, slots):
+    song = slots.get("song")
+    if song:
+        await aspeak(f"Playing {song}")
+        await to_io(pywhatkit.playonyt, song)
+        update_preference("last_played_song", song)
+        if any(x in song for x in ["lofi", "romantic", "classical", "rock", "pop", "jazz"]):
+            update_preference("song_preferences", song)
+        remember_interaction(query, f"Played {song}")
+        log_activity(f"Played song: {song}")
+    else:
+        await aspeak("Sorry Sir! Can you please repeat again?")
+
+async def cmd_music(query, slots):
+    await aspeak("Sure! From where do you want to play music? I can use YouTube, your local files, or open Spotify.")
+    source = (await listen()).lower()
+
+    if not source:
+        await aspeak("I didn't catch that. I'll use YouTube by default.")
+        source = 'youtube'
+
+    if 'youtube' in source:
+        await aspeak("What would you like me to play on YouTube?")
+        yt_name = (await listen()).lower().strip()
+        if "previous" in yt_name:
+            last = recall_preference("last_played_song")
+            if last:
+                await aspeak(f"Sure sir! Playing your last song: {last}.")
+                try:
+                    await to_io(pywhatkit.playonyt, last)
+                    log_activity(f"Played last preference on YouTube: {last}")
+                except Exception as e:
+                    await aspeak("Sorry, I couldn't play your last song on YouTube.")
+                    print(f"YouTube play error (fallback): {e}")
             else:
-                speak("Please specify the application you want to open.")
-
-        elif "pause music" in query or "pause song" in query:
-            pause_or_resume_media()
-
-        elif "resume music" in query or "play music" in query:
-            pause_or_resume_media()
-
-        elif "next song" in query or "next track" in query:
-            next_media()
-
-        elif "previous song" in query or "previous track" in query:
-            previous_media()
-
-        elif "what is playing" in query or "what's playing" in query:
-            status = detect_media_activity()
-            speak(status)
-
-        elif 'song' in query:
-            song = query.replace('play', '').strip()
-            if song:
-                speak(f"Playing {song}")
-                pywhatkit.playonyt(song)
-                update_preference("last_played_song", song)
-                if any(x in song for x in ["lofi", "romantic", "classical", "rock", "pop", "jazz"]):
-                    update_preference("song_preferences", song)
-                remember_interaction(query, f"Played {song}")
-                log_activity(f"Played song: {song}")
+                await aspeak("I don't have a record of your last song. Please tell me what to play.")
+        elif yt_name:
+            await aspeak(f"Playing {yt_name} on YouTube.")
+            try:
+                await to_io(pywhatkit.playonyt, yt_name)
+                update_preference("last_played_song", yt_name)
+                remember_interaction(query, f"Played {yt_name} on YouTube")
+                log_activity(f"Played on YouTube: {yt_name}")
+            except Exception as e:
+                await aspeak("Sorry, I couldn't play that on YouTube.")
+                print(f"YouTube play error: {e}")
+        else:
+            last = recall_preference("last_played_song")
+            if last:
+                await aspeak(f"I couldn't hear the name. Playing your last song: {last}.")
+                try:
+                    await to_io(pywhatkit.playonyt, last)
+                    log_activity(f"Played last preference on YouTube: {last}")
+                except Exception as e:
+                    await aspeak("Sorry, I couldn't play your last song on YouTube.")
+                    print(f"YouTube play error (fallback): {e}")
             else:
-                speak("Sorry Sir! Can you please repeat again?")
-
-        elif 'music' in query:
-            speak("Sure! From where do you want to play music? I can use YouTube, your local files, or open Spotify.")
-            source = takeCommand().lower()
-
-            if not source:
-                speak("I didn't catch that. I'll use YouTube by default.")
-                source = 'youtube'
-
-            if 'youtube' in source:
-                speak("What would you like me to play on YouTube?")
-                yt_name = takeCommand().lower().strip()
-                if "previous" in yt_name:
-                    last = recall_preference("last_played_song")
-                    if last:
-                        speak(f"Sure sir! Playing your last song: {last}.")
-                        try:
-                            pywhatkit.playonyt(last)
-                            log_activity(f"Played last preference on YouTube: {last}")
-                        except Exception as e:
-                            speak("Sorry, I couldn't play your last song on YouTube.")
-                            print(f"YouTube play error (fallback): {e}")
-                    else:
-                        speak("I don't have a record of your last song. Please tell me what to play.")
-                elif yt_name:
-                    speak(f"Playing {yt_name} on YouTube.")
-                    try:
-                        pywhatkit.playonyt(yt_name)
-                        update_preference("last_played_song", yt_name)
-                        remember_interaction(query, f"Played {yt_name} on YouTube")
-                        log_activity(f"Played on YouTube: {yt_name}")
-                    except Exception as e:
-                        speak("Sorry, I couldn't play that on YouTube.")
-                        print(f"YouTube play error: {e}")
-                else:
-                    last = recall_preference("last_played_song")
-                    if last:
-                        speak(f"I couldn't hear the name. Playing your last song: {last}.")
-                        try:
-                            pywhatkit.playonyt(last)
-                            log_activity(f"Played last preference on YouTube: {last}")
-                        except Exception as e:
-                            speak("Sorry, I couldn't play your last song on YouTube.")
-                            print(f"YouTube play error (fallback): {e}")
-                    else:
-                        speak("I don't have a record of your last song. Please tell me what to play.")
-
-            elif any(x in source for x in ['desktop', 'local', 'computer', 'file', 'folder']):
-                speak("Looking for music on your computer. Please tell me the folder name or say 'music' to use your Music folder.")
-                folder_input = takeCommand()
-                base = os.path.expanduser("~")
-                folder_path = resolve_folder(folder_input or 'music', base)
-
-                if not os.path.exists(folder_path):
-                    speak(f"Folder '{folder_path}' not found.")
-                else:
-                    songs = [f for f in os.listdir(folder_path) if f.lower().endswith(('.mp3', '.wav', '.m4a', '.flac'))]
-                    if songs:
-                        speak(f"Found {len(songs)} songs. Playing the first one.")
-                        try:
-                            os.startfile(os.path.join(folder_path, songs[0]))
-                            update_preference("last_played_song", songs[0])
-                            remember_interaction(query, f"Played local song {songs[0]}")
-                            log_activity(f"Played local song: {songs[0]}")
-                        except Exception as e:
-                            speak("Sorry, I couldn't play that file.")
-                            print(f"Local play error: {e}")
-                    else:
-                        speak("No audio files found in that folder.")
-
-            elif 'spotify' in source:
-                speak("I can't control Spotify directly yet. I can open Spotify for you.")
-                find_and_open('spotify')
+                await aspeak("I don't have a record of your last song. Please tell me what to play.")
+
+    elif any(x in source for x in ['desktop', 'local', 'computer', 'file', 'folder']):
+        await aspeak("Looking for music on your computer. Please tell me the folder name or say 'music' to use your Music folder.")
+        folder_input = await listen()
+        base = os.path.expanduser("~")
+        folder_path = await to_io(resolve_folder, folder_input or 'music', base)
 
+        if not os.path.exists(folder_path):
+            await aspeak(f"Folder '{folder_path}' not found.")
+        else:
+            songs = [f for f in os.listdir(folder_path) if f.lower().endswith(('.mp3', '.wav', '.m4a', '.flac'))]
+            if songs:
+                await aspeak(f"Found {len(songs)} songs. Playing the first one.")
+                try:
+                    await to_io(os.startfile, os.path.join(folder_path, songs[0]))
+                    update_preference("last_played_song", songs[0])
+                    remember_interaction(query, f"Played local song {songs[0]}")
+                    log_activity(f"Played local song: {songs[0]}")
+                except Exception as e:
+                    await aspeak("Sorry, I couldn't play that file.")
+                    print(f"Local play error: {e}")
             else:
-                speak("Sorry, I couldn't understand the source. Try saying 'YouTube', 'desktop', or 'Spotify'.")
+                await aspeak("No audio files found in that folder.")
 
-        elif 'time' in query:
-            strTime = datetime.datetime.now().strftime("%H:%M:%S")
-            speak(f"Sir, the time is {strTime}")
-            remember_interaction(query, strTime)
+    elif 'spotify' in source:
+        await aspeak("I can't control Spotify directly yet. I can open Spotify for you.")
+        await to_io(find_and_open, 'spotify')
 
-        elif 'close' in query:
-            close_app = query.split('close', 1)[1].strip()
-            
-            if not app_name:
-                speak("Please specify which application you would like to close.")
+    else:
+        await aspeak("Sorry, I couldn't understand the source. Try saying 'YouTube', 'desktop', or 'Spotify'.")
 
-            elif 'outlook' in close_app:
-                speak("Sure Sir, closing Outlook.")
-                close_outlook()
+async def cmd_time(query, slots):
+    strTime = datetime.datetime.now().strftime("%H:%M:%S")
+    await aspeak(f"Sir, the time is {strTime}")
+    remember_interaction(query, strTime)
 
-            else:
-                find_and_close_app(close_app)
+async def cmd_close(query, slots):
+    close_app = slots.get("app")
 
-        elif "allow screen access" in query:
-            global SCREEN_ACCESS_ALLOWED
-            SCREEN_ACCESS_ALLOWED = True
-            speak("Screen access permission granted.")
+    if not close_app:
+        await aspeak("Please specify which application you would like to close.")
 
-        elif "stop screen access" in query or "disable screen access" in query:
-            SCREEN_ACCESS_ALLOWED = False
-            speak("Screen access permission revoked.")
+    elif 'outlook' in close_app:
+        await aspeak("Sure Sir, closing Outlook.")
+        await to_io(close_outlook)
 
-        elif 'camera' in query:
-            speak("Sure Sir, accessing camera..")
-            access_camera()
+    else:
+        await to_io(find_and_close_app, close_app)
 
-        elif 'picture' in query:
-            speak ("Sure Sir, opening the image..")
-            photo_dir1 = 'Libraries\\Camera Roll'
-            try:
-                photos = os.listdir(photo_dir1)
-                os.startfile(os.path.join(photo_dir1, photos[0]))
-                remember_interaction(query, f"Opened image {photos[0]}")
-            except Exception:
-                speak("Could not access pictures folder.")
-
-        elif 'pictures' in query:
-            speak ("Sure Sir, opening the image..")
-            photo_dir = 'D:\\Pictures\\Photos'
-            try:
-                photos = os.listdir(photo_dir)
-                os.startfile(os.path.join(photo_dir, photos[0]))
-                remember_interaction(query, f"Opened image {photos[0]}")
-            except Exception:
-                speak("Could not access pictures folder.")
+async def cmd_allow_screen(query, slots):
+    global SCREEN_ACCESS_ALLOWED
+    SCREEN_ACCESS_ALLOWED = True
+    await aspeak("Screen access permission granted.")
 
-        elif 'volume up' in query:
-            change_volume("up")
+async def cmd_stop_screen(query, slots):
+    global SCREEN_ACCESS_ALLOWED
+    SCREEN_ACCESS_ALLOWED = False
+    await aspeak("Screen access permission revoked.")
 
-        elif 'volume down' in query:
-            change_volume("down")
+async def cmd_camera(query, slots):
+    await aspeak("Sure Sir, accessing camera..")
+    await to_io(access_camera)
 
-        elif 'mute volume' in query or 'mute' in query:
-            change_volume("mute")
+async def open_first_photo(query, photo_dir):
+    await aspeak("Sure Sir, opening the image..")
+    try:
+        photos = await to_io(os.listdir, photo_dir)
+        await to_io(os.startfile, os.path.join(photo_dir, photos[0]))
+        remember_interaction(query, f"Opened image {photos[0]}")
+    except Exception:
+        await aspeak("Could not access pictures folder.")
 
-        elif 'unmute volume' in query or 'unmute' in query:
-            change_volume("unmute")
+async def cmd_picture(query, slots):
+    await open_first_photo(query, 'Libraries\\Camera Roll')
 
-        elif 'volume' in query:
-            numbers = re.findall(r'\d+', query)
-            if numbers:
-                level = int(numbers[0])
-                if 0 <= level <= 100:
-                    set_volume(level)
-                else:
-                    speak("Please give me a number between 0 and 100.")
-            else:
-                speak("Can you please repeat with volume percentage?")
-        
-        elif 'brightness up' in query or 'increase brightness' in query:
-            change_brightness("up")
-        elif 'brightness down' in query or 'decrease brightness' in query:
-            change_brightness("down")
-        elif 'brightness' in query or 'brightness' in query:
-            numbers = re.findall(r'\d+', query)
-            if numbers:
-                level = int(numbers[0])
-                if 0 <= level <= 100:
-                    set_brightness(level)
-                else:
-                    speak("Please give me a number between 0 and 100.")
-            else:
-                speak("Can you please repeat with brightness percentage?")
-        
-        elif 'take a note' in query or 'write a note' in query:
-            take_note()
-        
-        elif 'note' in query:
-            read_note_from_folder()
+async def cmd_pictures(query, slots):
+    await open_first_photo(query, 'D:\\Pictures\\Photos')
 
-        elif 'reminder' in query:
-            set_reminder()
+async def cmd_volume_step(query, slots, action):
+    await to_io(change_volume, action)
 
-        elif 'joke' in query or 'jokes' in query:
-            joke = pyjokes.get_joke()
-            speak(joke)
-            remember_interaction(query, joke)
-        
-        elif 'clear memory' in query or 'reset memory' in query:
-            memory.clear()
-            memory.update({
-                "preferences": {},
-                "interaction_history": [],
-                "activity_log": [],
-                "llm_history": []
-            })
-            save_memory(memory)
-            speak("All stored memories have been cleared, Sir.")
-            log_activity("Cleared memory by user command")
-        
+async def cmd_volume(query, slots):
+    if "level" in slots:
+        level = int(slots["level"])
+        if 0 <= level <= 100:
+            await to_io(set_volume, level)
+        else:
+            await aspeak("Please give me a number between 0 and 100.")
+    else:
+        await aspeak("Can you please repeat with volume percentage?")
+
+async def cmd_brightness_step(query, slots, action):
+    await to_io(change_brightness, action)
+
+async def cmd_brightness(query, slots):
+    if "level" in slots:
+        level = int(slots["level"])
+        if 0 <= level <= 100:
+            await to_io(set_brightness, level)
         else:
-            ask_neura(query)
+            await aspeak("Please give me a number between 0 and 100.")
+    else:
+        await aspeak("Can you please repeat with brightness percentage?")
+
+async def cmd_take_note(query, slots):
+    await to_io(take_note)
+
+async def cmd_read_note(query, slots):
+    await to_io(read_note_from_folder)
+
+async def cmd_reminder(query, slots):
+    await to_io(set_reminder)
+
+async def cmd_joke(query, slots):
+    joke = await to_io(pyjokes.get_joke)
+    await aspeak(joke)
+    remember_interaction(query, joke)
+
+async def cmd_provider_status(query, slots):
+    status = provider_status()
+    print(status)
+    await aspeak(status)
+
+async def cmd_clear_memory(query, slots):
+    await to_io(memory.clear)
+    response_cache.clear()
+    gemini_session.reset()
+    await aspeak("All stored memories have been cleared, Sir.")
+    log_activity("Cleared memory by user command")
+
+INTENT_PHRASES_FILE = "intent_phrases.tsv"
+try:
+    command_classifier = IntentClassifier.from_file(INTENT_PHRASES_FILE)
+except OSError as e:
+    print("Intent classifier disabled:", e)
+    command_classifier = None
+
+COMMAND_HANDLERS = {
+    "exit": cmd_exit,
+    "wikipedia": cmd_wikipedia,
+    "about": cmd_about,
+    "who_is": cmd_who_is,
+    "search": cmd_search,
+    "weather": cmd_weather,
+    "open": cmd_open,
+    "media_pause": cmd_media_toggle,
+    "media_resume": cmd_media_toggle,
+    "media_next": cmd_media_next,
+    "media_previous": cmd_media_previous,
+    "media_status": cmd_media_status,
+    "song": cmd_song,
+    "music": cmd_music,
+    "time": cmd_time,
+    "close": cmd_close,
+    "allow_screen": cmd_allow_screen,
+    "stop_screen": cmd_stop_screen,
+    "camera": cmd_camera,
+    "picture": cmd_picture,
+    "pictures": cmd_pictures,
+    "volume_up": functools.partial(cmd_volume_step, action="up"),
+    "volume_down": functools.partial(cmd_volume_step, action="down"),
+    "mute": functools.partial(cmd_volume_step, action="mute"),
+    "unmute": functools.partial(cmd_volume_step, action="unmute"),
+    "volume": cmd_volume,
+    "brightness_up": functools.partial(cmd_brightness_step, action="up"),
+    "brightness_down": functools.partial(cmd_brightness_step, action="down"),
+    "brightness": cmd_brightness,
+    "take_note": cmd_take_note,
+    "read_note": cmd_read_note,
+    "reminder": cmd_reminder,
+    "joke": cmd_joke,
+    "provider_status": cmd_provider_status,
+    "clear_memory": cmd_clear_memory,
+}
+
+
+async def handle_query(query):
+    """Run one command. Returns False when the user ends the session."""
+    match = intents.COMMANDS.match(query)
+    if match is None and query and not intents.CONVERSATION.match(query):
+        # Near-miss phrasings ("crank up the sound") run the command instead of an LLM call
+        guess = command_classifier.predict(query) if command_classifier else None
+        if guess is not None:
+            print(f"[Intent classifier] {guess}")
+            return await COMMAND_HANDLERS[guess.name](query, intents.COMMANDS.slots_for(guess.name, query)) is not False
+    if match is None:
+        await ask_neura(query)
+        return True
+    return await COMMAND_HANDLERS[match.name](query, match.slots) is not False
+
+
+async def main():
+    # ---------- RESET CHAT SESSION ----------
+    chat_writer.start_session()
+
+    # ---------- WARM THE TTS PHRASE CACHE (background) ----------
+    tts.prerender(phrase_cache.expand(FREQUENT_PHRASES, PHRASE_TEMPLATES))
+
+    # ---------- ROLL OLD MEMORY INTO THE ARCHIVE (background) ----------
+    spawn(to_io(memory.roll_over), name="memory_roll_over")
+
+    # ---------- LOAD OFFLINE SPEECH MODELS (background) ----------
+    spawn(to_io(recognizer_chain.warm_up), name="asr_warm_up")
+
+    # Print startup banner once
+    art = text2art("Neura", font='block', chr_ignore=True)
+    print("\n" + art + "\n")
+    await wishMe()
+    await wishtime()
+    analyze_memory_on_start()
+
+    pref_city = recall_preference("weather_city")
+    pref_songs = memory.preferences.get("song_preferences")
+    if pref_city:
+        await aspeak(f"I remember your preferred weather city is {pref_city}.")
+    if pref_songs:
+        if isinstance(pref_songs, list):
+            await aspeak(f"You've told me you like {', '.join(pref_songs[:3])}.")
+        else:
+            await aspeak(f"You've told me you like {pref_songs} music.")
+
+    schedule(REMINDER_INTERVAL, check_reminders)
+    schedule(PROBE_INTERVAL, probe_providers)
+
+    try:
+        while True:
+            if not BARGE_IN:
+                # Don't listen over our own voice
+                await to_io(tts.wait_idle)
+            # One memory commit per turn, written while listening for the next command
+            _, query = await asyncio.gather(to_io(memory.flush), listen())
+            if BARGE_IN and query:
+                if tts.is_echo(query):
+                    continue
+                # The user talked over the assistant: stop and handle the new command
+                tts.interrupt()
+            if not await handle_query(query):
+                break
+    finally:
+        tts.close()
+        await async_core.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""
+Pre-rendered audio for phrases the assistant says over and over.
+
+Fixed phrases ("Let me think...", the greetings, "Volume increased") and
+templated ones with a small set of values ("Volume set to 40 percent")
+are rendered to WAV once, with the same engine, voice and rate, and then
+played straight from disk instead of being synthesized again. Files are
+keyed by voice, rate and text, so a voice change never plays a stale
+recording. Any other phrase is rendered once it has been spoken live
+REPEAT_THRESHOLD times.
+
+Rendering is done by the TTS worker when it has nothing to say (see
+tts_worker.SpeechWorker.prerender). Playback uses winsound, which only
+exists on Windows; elsewhere the cache stays empty and everything is
+synthesized live.
+"""
+import collections
+import hashlib
+import os
+import threading
+import wave
+
+try:
+    import winsound
+except ImportError:
+    winsound = None
+
+CACHE_DIR = "neura_tts_cache"
+REPEAT_THRESHOLD = 2
+MAX_PHRASE_CHARS = 120  # long answers are never worth a file
+
+
+def expand(phrases=(), templates=()):
+    """Fixed phrases plus every (template, values) expansion, without duplicates."""
+    texts = list(phrases)
+    for template, values in templates:
+        texts.extend(template.format(v) for v in values)
+    return list(dict.fromkeys(texts))
+
+
+def wav_duration(path):
+    with wave.open(path, "rb") as w:
+        return w.getnframes() / float(w.getframerate())
+
+
+def play_wav(path, interrupted):
+    """Play a WAV file; stop early if `interrupted` (an Event) is set. True if played in full."""
+    duration = wav_duration(path)
+    winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+    if interrupted.wait(duration):
+        winsound.PlaySound(None, winsound.SND_PURGE)
+        return False
+    return True
+
+
+class PhraseCache:
+    def __init__(self, directory=CACHE_DIR, player=None):
+        """player: function(path, interrupted_event) -> bool; defaults to winsound playback."""
+        self.directory = directory
+        self.player = player or (play_wav if winsound else None)
+        self.voice_key = ""
+        self.ready = set()
+        self.live_counts = collections.Counter()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.player is not None
+
+    def set_voice(self, voice, rate):
+        """Called once the engine exists; recordings are only valid for this voice and rate."""
+        self.voice_key = f"{voice}|{rate}"
+        with self.lock:
+            self.ready.clear()
+
+    def path_for(self, text):
+        digest = hashlib.sha1(f"{self.voice_key}\x1f{text}".encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.directory, digest + ".wav")
+
+    def lookup(self, text):
+        """Path of the rendered recording of text, or None."""
+        if not self.enabled:
+            return None
+        with self.lock:
+            if text in self.ready:
+                self.hits += 1
+                return self.path_for(text)
+        path = self.path_for(text)
+        if os.path.exists(path):  # rendered in an earlier session
+            with self.lock:
+                self.ready.add(text)
+                self.hits += 1
+            return path
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def should_render(self, text):
+        """Count a live utterance; True once it has been heard often enough to keep."""
+        if not self.enabled or len(text) > MAX_PHRASE_CHARS:
+            return False
+        with self.lock:
+            self.live_counts[text] += 1
+            return self.live_counts[text] == REPEAT_THRESHOLD and text not in self.ready
+
+    def render(self, engine, text, stopped=None):
+        """
+        Render text to its file with the engine (on the engine's own thread).
+        Nothing is kept if the stopped event was set while rendering.
+        """
+        path = self.path_for(text)
+        if os.path.exists(path):
+            with self.lock:
+                self.ready.add(text)
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = path + ".tmp.wav"
+        engine.save_to_file(text, tmp)
+        engine.runAndWait()
+        complete = stopped is None or not stopped.is_set()
+        if complete and os.path.exists(tmp) and os.path.getsize(tmp) > 44:  # more than a bare WAV header
+            os.replace(tmp, path)
+            with self.lock:
+                self.ready.add(text)
+        elif os.path.exists(tmp):
+            os.remove(tmp)
+
+    def stats(self):
+        with self.lock:
+            return {"phrases": len(self.ready), "hits": self.hits, "misses": self.misses}
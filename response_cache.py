@@ -0,0 +1,83 @@
+"""
+Response cache in front of chat_with_ai.
+
+Keys are the normalized prompt plus a fingerprint of the context that can
+change the answer (instruction, saved preferences). Entries carry their own
+TTL, the cache is an LRU bounded by entry count, and it can be persisted
+to disk between sessions. Prompts that refer back to the conversation
+("explain that again", "what did he do next") are never cached.
+"""
+import hashlib
+import re
+
+from lookup_cache import TTLCache
+
+DEFAULT_TTL = 7 * 24 * 3600    # stable facts, definitions, conversions
+VOLATILE_TTL = 10 * 60         # anything about "now"
+MAX_ENTRIES = 500
+
+FILLER = re.compile(
+    r"^(hey |hi |ok |okay )?(neura |nura )?(please |can you |could you |tell me |do you know )*"
+)
+PUNCTUATION = re.compile(r"[^\w\s%°.-]|(?<!\d)\.|\.(?!\d)")
+# The answer depends on earlier turns
+CONTEXT_DEPENDENT = re.compile(
+    r"\b(it|its|that|this|those|these|he|she|him|her|they|them|his|their|again|more|"
+    r"previous|earlier|above|before|last one|you said|continue|elaborate)\b"
+)
+VOLATILE = re.compile(r"\b(today|now|current|currently|latest|news|price|score|weather|tonight|tomorrow)\b")
+
+
+def normalize(prompt):
+    text = prompt.lower().strip()
+    text = PUNCTUATION.sub(" ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return FILLER.sub("", text).strip()
+
+
+def fingerprint(*parts):
+    return hashlib.sha1("\x1f".join(p or "" for p in parts).encode("utf-8")).hexdigest()[:16]
+
+
+class ResponseCache:
+    def __init__(self, path=None, max_entries=MAX_ENTRIES):
+        self.cache = TTLCache(path, max_entries=max_entries, default_ttl=DEFAULT_TTL)
+        self.skips = 0
+
+    def cacheable(self, prompt):
+        return not CONTEXT_DEPENDENT.search(prompt.lower())
+
+    def key(self, prompt, context=""):
+        return f"{context}:{normalize(prompt)}"
+
+    def ttl_for(self, prompt):
+        return VOLATILE_TTL if VOLATILE.search(prompt.lower()) else DEFAULT_TTL
+
+    def lookup(self, prompt, context=""):
+        """Cached reply or None. Conversation-dependent prompts always miss."""
+        if not self.cacheable(prompt):
+            self.skips += 1
+            return None
+        return self.cache.get(self.key(prompt, context), None)
+
+    def store(self, prompt, reply, context=""):
+        if not reply or not self.cacheable(prompt):
+            return
+        self.cache.put(self.key(prompt, context), reply, self.ttl_for(prompt))
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        return {
+            "entries": len(self.cache),
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+            "skipped": self.skips,
+            "hit_rate": self.cache.hit_rate(),
+        }
+
+    def describe(self):
+        s = self.stats()
+        return (f"Response cache has {s['entries']} entries, {s['hits']} hits and "
+                f"{s['misses']} misses, hit rate {s['hit_rate'] * 100:.0f} percent")
@@ -0,0 +1,98 @@
+"""
+Sentence-chunked speech for streamed LLM replies.
+
+Tokens from a streaming provider are cut into sentences. A reader thread
+keeps pulling tokens while the caller's thread speaks the sentences that
+are already complete, so audio starts after the first sentence instead of
+after the whole reply.
+"""
+import queue
+import re
+import threading
+
+# A sentence ends at . ! or ? followed by whitespace, or at a line break
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+# Don't split after these ("Dr. Kalam", "e.g. this"); whole words only, so "highest." still ends a sentence
+ABBREVIATION = re.compile(r"\b(?:mr|mrs|ms|dr|st|vs|etc|e\.g|i\.e)\.$", re.IGNORECASE)
+MIN_SENTENCE_CHARS = 12  # glue very short fragments onto the next sentence
+
+_DONE = object()
+
+
+class StreamInterrupted(Exception):
+    """The stream failed after some text had arrived. partial is the text received (and spoken)."""
+
+    def __init__(self, error, partial):
+        super().__init__(str(error))
+        self.error = error
+        self.partial = partial
+
+
+class SentenceChunker:
+    def __init__(self, min_chars=MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, text):
+        """Add streamed text; return the sentences completed by it."""
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END.finditer(self.buffer):
+            candidate = self.buffer[start:match.start()].strip()
+            if len(candidate) < self.min_chars or ABBREVIATION.search(candidate):
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self):
+        """Whatever is left once the stream has ended."""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return [rest] if rest else []
+
+
+def stream_to_speech(tokens, say, chunker=None):
+    """
+    tokens: iterable of text pieces (a provider stream)
+    say: function that speaks (or queues for speech) one sentence
+    Returns the complete text. If the stream raises, the sentences already
+    received are still spoken and the exception is re-raised afterwards,
+    as StreamInterrupted (carrying the partial text) if any text had arrived.
+    """
+    chunker = chunker or SentenceChunker()
+    sentences = queue.Queue()
+    parts = []
+    failure = []
+
+    def read():
+        try:
+            for piece in tokens:
+                parts.append(piece)
+                for sentence in chunker.feed(piece):
+                    sentences.put(sentence)
+            for sentence in chunker.flush():
+                sentences.put(sentence)
+        except Exception as e:
+            failure.append(e)
+        finally:
+            sentences.put(_DONE)
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+
+    while True:
+        sentence = sentences.get()
+        if sentence is _DONE:
+            break
+        say(sentence)
+    reader.join()
+
+    text = "".join(parts).strip()
+    if failure:
+        if text:
+            raise StreamInterrupted(failure[0], text)
+        raise failure[0]
+    return text
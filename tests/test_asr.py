@@ -0,0 +1,73 @@
+import speech_recognition as sr
+
+import asr
+import circuit_breaker
+
+
+class FlakyBackend:
+    def __init__(self, name):
+        self.name = name
+        self.online = True
+        self.calls = 0
+
+    def load(self):
+        pass
+
+    def recognize(self, audio):
+        self.calls += 1
+        if not self.online:
+            raise sr.RequestError(f"{self.name} is offline")
+        return f"heard by {self.name}"
+
+
+def make_chain(*names):
+    backends = [FlakyBackend(name) for name in names]
+    chain = asr.RecognizerChain(backends)
+    for breaker in chain.breakers.values():
+        breaker.cooldown = 0.0
+    return chain, backends
+
+
+def open_breaker(chain, backend):
+    """Take backend offline and fail it until its breaker opens."""
+    backend.online = False
+    breaker = chain.breakers[backend.name]
+    while breaker.state != circuit_breaker.OPEN:
+        breaker.call(lambda: None)  # a healthy call keeps the window honest...
+        for _ in range(breaker.min_calls):
+            breaker.record_failure(0.0)
+
+
+def test_open_backend_recovers_after_cooldown():
+    chain, (google,) = make_chain("google")
+    open_breaker(chain, google)
+
+    google.online = True
+    assert chain.recognize(b"audio") == ("heard by google", "google")
+    assert chain.breakers["google"].state == circuit_breaker.CLOSED
+
+
+def test_failed_trial_opens_the_breaker_again():
+    chain, (google, whisper) = make_chain("google", "whisper")
+    open_breaker(chain, google)
+
+    assert chain.recognize(b"audio") == ("heard by whisper", "whisper")  # google's trial failed
+    assert chain.breakers["google"].state == circuit_breaker.OPEN
+
+    google.online = True
+    assert chain.recognize(b"audio") == ("heard by google", "google")
+    assert chain.breakers["google"].state == circuit_breaker.CLOSED
+
+
+def test_trial_not_reached_is_kept_for_a_later_utterance():
+    chain, (google, whisper) = make_chain("google", "whisper")
+    open_breaker(chain, whisper)
+    whisper.online = True
+
+    # google answers first, so whisper's trial is never made this time
+    assert chain.recognize(b"audio") == ("heard by google", "google")
+    assert chain.breakers["whisper"].state == circuit_breaker.OPEN
+
+    google.online = False
+    assert chain.recognize(b"audio") == ("heard by whisper", "whisper")
+    assert chain.breakers["whisper"].state == circuit_breaker.CLOSED
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import async_core
+import tts_worker
+
+
+class FakeEngine:
+    """Speaks one word every 10 ms through the started-word callback, like pyttsx3."""
+
+    def __init__(self):
+        self.on_word = None
+        self.stopped = False
+        self.text = ""
+        self.spoken = []
+
+    def connect(self, name, callback):
+        self.on_word = callback
+
+    def getProperty(self, name):
+        return None
+
+    def say(self, text):
+        self.text = text
+
+    def stop(self):
+        self.stopped = True
+
+    def runAndWait(self):
+        self.stopped = False
+        for word in self.text.split():
+            self.on_word("started-word", 0, len(word))
+            if self.stopped:
+                return
+            time.sleep(0.01)
+        self.spoken.append(self.text)
+
+
+def test_interrupt_resolves_queued_speech_to_false():
+    worker = tts_worker.SpeechWorker(FakeEngine)
+    try:
+        current = worker.say("one two three four five six seven eight")
+        queued = worker.say("never said")
+        time.sleep(0.03)
+        worker.interrupt()
+        assert current.result(timeout=2) is False
+        assert queued.result(timeout=2) is False
+        assert not queued.cancelled()
+        assert worker.wait_idle(timeout=2)
+    finally:
+        worker.close()
+
+
+def test_barge_in_during_reminder_keeps_reminder_loop_running():
+    engine = FakeEngine()
+    worker = tts_worker.SpeechWorker(lambda: engine)
+    runs = []
+
+    async def aspeak(text, priority=tts_worker.NORMAL):
+        # as neura.aspeak
+        await asyncio.wrap_future(worker.say(text, priority))
+
+    async def check_reminders():
+        runs.append(time.monotonic())
+        await aspeak("Sir, this is your reminder: stretch your legs and drink some water", tts_worker.URGENT)
+
+    async def scenario():
+        # Something already being said, so the reminder waits in the queue when the user barges in
+        worker.say("a long answer that is still being spoken when the user talks")
+        task = asyncio.ensure_future(async_core.every(0.05, check_reminders))
+        await asyncio.sleep(0.03)
+        worker.interrupt()
+        await asyncio.sleep(0.3)
+        try:
+            assert not task.done()
+            assert len(runs) >= 2
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        worker.close()
@@ -0,0 +1,189 @@
+"""
+Text-to-speech worker.
+
+One thread owns the pyttsx3 engine (SAPI is apartment-threaded, and
+pyttsx3 is not safe to drive from two threads) and speaks utterances
+from a priority queue: lower numbers first, FIFO within a priority.
+say() returns a concurrent.futures.Future right away, so callers only
+wait when they need speech to have finished; it resolves to True when
+the utterance was spoken in full and False when it was interrupted.
+
+interrupt() is the barge-in hook: the current utterance is stopped at
+the next word boundary (engine.stop() is called from the engine's own
+word callback, on the worker thread) and everything still queued is
+dropped. Dropped futures resolve to False like an interrupted one; they
+are not cancelled, so a caller awaiting its speech carries on instead
+of getting CancelledError.
+
+With a phrase_cache.PhraseCache, utterances that have a pre-rendered
+recording are played from disk instead of synthesized, and the worker
+renders new recordings (prerender(), and phrases that keep recurring)
+whenever nothing is waiting to be said.
+"""
+import collections
+import difflib
+import itertools
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+
+URGENT = 0    # reminders: jump ahead of queued speech
+NORMAL = 1
+
+ECHO_WINDOW = 5.0  # seconds after an utterance during which the mic may hear it
+ECHO_MIN_WORDS = 3  # a shorter fragment of a reply could just as well be a command
+ECHO_SIMILARITY = 0.8  # or the whole reply heard back, allowing for misrecognition
+
+# Control items in place of text (never compared: sequence numbers are unique)
+_WAKE = object()
+_STOP = object()
+
+
+def _words(text):
+    return " ".join(re.findall(r"[a-z0-9']+", text.lower()))
+
+
+def _echoes(heard, spoken):
+    """True if heard is a long enough run of whole words of spoken, or nearly all of it (word by word)."""
+    heard_words, spoken_words = heard.split(), spoken.split()
+    if difflib.SequenceMatcher(None, heard_words, spoken_words).ratio() >= ECHO_SIMILARITY:
+        return True
+    return len(heard_words) >= ECHO_MIN_WORDS and f" {heard} " in f" {spoken} "
+
+
+class SpeechWorker:
+    def __init__(self, make_engine, phrases=None):
+        """
+        make_engine: callable run on the worker thread, returning the pyttsx3 engine
+        phrases: optional PhraseCache of pre-rendered recordings
+        """
+        self.make_engine = make_engine
+        self.phrases = phrases
+        self.renders = collections.deque()
+        self.queue = queue.PriorityQueue()
+        self.counter = itertools.count()
+        self.interrupted = threading.Event()
+        self.idle = threading.Event()
+        self.idle.set()
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.recent = collections.deque(maxlen=8)  # (finished_at, words)
+        self.thread = threading.Thread(target=self._run, name="neura-tts", daemon=True)
+        self.thread.start()
+
+    def say(self, text, priority=NORMAL):
+        future = Future()
+        with self.lock:
+            self.pending += 1
+            self.idle.clear()
+        self.queue.put((priority, next(self.counter), text, future))
+        return future
+
+    def busy(self):
+        return not self.idle.is_set()
+
+    def wait_idle(self, timeout=None):
+        """Block until nothing is queued or being spoken."""
+        return self.idle.wait(timeout)
+
+    def prerender(self, texts):
+        """Render recordings for texts in the background, while nothing is being said."""
+        if self.phrases is None or not self.phrases.enabled:
+            return
+        self.renders.extend(texts)
+        self.queue.put((NORMAL, next(self.counter), _WAKE, None))
+
+    def interrupt(self):
+        """Barge-in: stop the current utterance and drop everything queued."""
+        self.interrupted.set()
+        while True:
+            try:
+                _, _, _, future = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if future is not None:
+                if future.set_running_or_notify_cancel():  # unless the caller cancelled it
+                    future.set_result(False)
+                self._done()
+
+    def is_echo(self, heard):
+        """True if the mic most likely picked up our own recent speech."""
+        heard = _words(heard)
+        if not heard:
+            return False
+        cutoff = time.monotonic() - ECHO_WINDOW
+        return any(_echoes(heard, words) for finished, words in list(self.recent)
+                   if finished is None or finished >= cutoff)
+
+    def close(self):
+        self.interrupt()
+        self.queue.put((-1, next(self.counter), _STOP, None))
+
+    # ---------- WORKER THREAD ----------
+    def _done(self):
+        with self.lock:
+            self.pending -= 1
+            if self.pending <= 0:
+                self.pending = 0
+                self.idle.set()
+
+    def _on_word(self, name, location, length):
+        if self.interrupted.is_set():
+            self.engine.stop()
+
+    def _render_next(self):
+        text = self.renders.popleft()
+        # A barge-in left over from the last utterance must not stop this render;
+        # one that arrives during it does, and the cut-short recording is dropped
+        self.interrupted.clear()
+        try:
+            self.phrases.render(self.engine, text, stopped=self.interrupted)
+        except Exception as e:
+            print("TTS render error:", e)
+
+    def _speak(self, text):
+        """Say text, from a recording when there is one. True if not interrupted."""
+        path = self.phrases.lookup(text) if self.phrases else None
+        if path:
+            try:
+                return self.phrases.player(path, self.interrupted)
+            except Exception as e:
+                print("TTS playback error:", e)
+        self.engine.say(text)
+        self.engine.runAndWait()
+        if self.phrases and self.phrases.should_render(text):
+            self.renders.append(text)
+        return not self.interrupted.is_set()
+
+    def _run(self):
+        self.engine = self.make_engine()
+        self.engine.connect('started-word', self._on_word)
+        if self.phrases:
+            self.phrases.set_voice(self.engine.getProperty('voice'), self.engine.getProperty('rate'))
+        while True:
+            try:
+                # Render in the gaps: only when no speech has arrived for a moment
+                _, _, text, future = self.queue.get(timeout=0.2 if self.renders else None)
+            except queue.Empty:
+                self._render_next()
+                continue
+            if text is _STOP:
+                return
+            if future is None:
+                continue  # _WAKE
+            if not future.set_running_or_notify_cancel():
+                self._done()  # cancelled by the caller while queued
+                continue
+            self.interrupted.clear()
+            entry = [None, _words(text)]
+            self.recent.append(entry)
+            try:
+                future.set_result(self._speak(text))
+            except Exception as e:
+                print("TTS error:", e)
+                future.set_exception(e)
+            finally:
+                entry[0] = time.monotonic()
+                self._done()
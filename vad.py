@@ -0,0 +1,82 @@
+"""
+Frame-level voice activity detection and endpointing.
+
+The Endpointer is fed one captured chunk at a time (with its sequence
+number) and decides where an utterance starts and ends:
+
+  - a frame is voiced when its RMS energy is above the threshold;
+  - speech starts after START_SECONDS of consecutive voiced frames, so a
+    click or a cough doesn't open an utterance;
+  - speech ends after END_SILENCE of unvoiced frames (short pauses
+    between words don't split a command), or after MAX_PHRASE seconds.
+
+While nobody is speaking, the threshold follows the room with the same
+damped update speech_recognition uses for its dynamic threshold. The
+Endpointer does no I/O and keeps no audio; callers slice the audio out
+of their own ring buffer by sequence number.
+"""
+import audioop
+import math
+
+START = "start"
+END = "end"
+
+START_SECONDS = 0.06
+END_SILENCE = 0.5     # speech_recognition's pause_threshold is 0.8
+MAX_PHRASE = 15.0
+PRE_ROLL = 0.3        # audio kept before the detected start (soft onsets)
+DAMPING = 0.15        # fraction of the old threshold left after one second
+RATIO = 1.5           # threshold = RATIO x background energy
+
+
+class Endpointer:
+    def __init__(self, sample_rate, sample_width, frame_samples, threshold=300,
+                 end_silence=END_SILENCE, max_phrase=MAX_PHRASE):
+        self.sample_width = sample_width
+        self.frame_seconds = frame_samples / float(sample_rate)
+        self.start_frames = max(1, math.ceil(START_SECONDS / self.frame_seconds))
+        self.end_frames = max(1, math.ceil(end_silence / self.frame_seconds))
+        self.max_frames = max(1, math.ceil(max_phrase / self.frame_seconds))
+        self.pre_roll_frames = math.ceil(PRE_ROLL / self.frame_seconds)
+        self.damping = DAMPING ** self.frame_seconds
+        self.threshold = threshold
+        self.in_speech = False
+        self.voiced_run = 0
+        self.silent_run = 0
+        self.start_seq = None
+        self.last_voiced = None
+
+    def _adapt(self, energy):
+        self.threshold = self.threshold * self.damping + energy * RATIO * (1 - self.damping)
+
+    def feed(self, seq, buffer):
+        """
+        Process one frame. Returns None, (START, start_seq, None) or
+        (END, start_seq, last_voiced_seq).
+        """
+        energy = audioop.rms(buffer, self.sample_width)
+        voiced = energy > self.threshold
+        if not self.in_speech:
+            if not voiced:
+                self.voiced_run = 0
+                self._adapt(energy)
+                return None
+            self.voiced_run += 1
+            if self.voiced_run < self.start_frames:
+                return None
+            self.in_speech = True
+            self.start_seq = seq - self.voiced_run + 1
+            self.last_voiced = seq
+            self.silent_run = 0
+            return START, self.start_seq, None
+
+        if voiced:
+            self.last_voiced = seq
+            self.silent_run = 0
+        else:
+            self.silent_run += 1
+        if self.silent_run >= self.end_frames or seq - self.start_seq + 1 >= self.max_frames:
+            self.in_speech = False
+            self.voiced_run = 0
+            return END, self.start_seq, self.last_voiced
+        return None